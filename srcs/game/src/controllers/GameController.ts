@@ -12,6 +12,7 @@ import { TournamentRepository } from '../repositories/TournamentRepository.js';
 import { UserRepository } from '../repositories/UserRepository.js';
 import { createSession } from '../usecases/CreateSession.js';
 import { startGameLoop } from '../usecases/GameLoop.js';
+import { rlStep } from '../usecases/RlStep.js';
 import { handleWsConnection } from '../websocket/WsConnectionManager.js';
 
 type StatsHistoryQuery = {
@@ -391,30 +392,85 @@ export function createGameController(
         sessionId?: string;
         action?: 'up' | 'down' | 'stop';
         paddle?: 'left' | 'right';
+        leftAction?: 'up' | 'down' | 'stop';
+        ticks?: number;
       };
-      const { sessionId, action, paddle = 'right' } = body;
+      const { sessionId, action, paddle = 'right', leftAction } = body;
       if (!sessionId || !action) {
         return reply
           .code(400)
           .send({ status: 'failure', message: 'sessionId and action are required' });
       }
 
+      let ticks: number | undefined;
+      if (body.ticks !== undefined) {
+        const parsed = parsePositiveInt(body.ticks);
+        if (parsed == null)
+          return reply
+            .code(400)
+            .send({ status: 'failure', message: 'ticks must be a positive integer' });
+        ticks = parsed;
+      }
+
       const session = sessionStore.get(sessionId);
       if (!session)
         return reply
           .code(404)
           .send({ status: 'failure', message: `Session ${sessionId} not found` });
 
-      session.game.setPaddleDirection(paddle, action);
-      session.game.update();
+      const result = rlStep(session.game, { action, paddle, leftAction, ticks });
+      return { status: 'success', ...result };
+    },
 
-      let reward = 0;
-      let done = false;
-      if (session.game.isFinished()) {
-        done = true;
-        reward = session.game.scores.right > session.game.scores.left ? 1 : -1;
-      }
-      return { status: 'success', state: session.game.getState(), reward, done };
+    /**
+     * Persistent RL channel for one training session: commands
+     * `{ id, type: 'reset' }` and `{ id, type: 'step', action, leftAction?, ticks? }`
+     * are answered in order with the same payloads as /ai/reset and /ai/step,
+     * tagged with the command id so clients can pipeline requests.
+     */
+    rlWebSocket(socket: WebSocket, req: FastifyRequest) {
+      const { sessionId } = req.params as { sessionId: string };
+      const send = (payload: object) => socket.send(JSON.stringify(payload));
+
+      socket.on('message', (raw) => {
+        let msg: {
+          id?: number;
+          type?: string;
+          action?: 'up' | 'down' | 'stop';
+          paddle?: 'left' | 'right';
+          leftAction?: 'up' | 'down' | 'stop';
+          ticks?: number;
+        };
+        try {
+          msg = JSON.parse(raw.toString());
+        } catch {
+          return send({ status: 'failure', message: 'Invalid JSON' });
+        }
+        const id = msg.id;
+
+        const session = sessionStore.get(sessionId);
+        if (!session)
+          return send({ id, status: 'failure', message: `Session ${sessionId} not found` });
+
+        if (msg.type === 'reset') {
+          session.game.reset();
+          return send({ id, status: 'success', state: session.game.getState() });
+        }
+        if (msg.type === 'step') {
+          if (!msg.action) return send({ id, status: 'failure', message: 'action is required' });
+          const ticks = msg.ticks === undefined ? undefined : parsePositiveInt(msg.ticks);
+          if (ticks === null)
+            return send({ id, status: 'failure', message: 'ticks must be a positive integer' });
+          const result = rlStep(session.game, {
+            action: msg.action,
+            paddle: msg.paddle,
+            leftAction: msg.leftAction,
+            ticks,
+          });
+          return send({ id, status: 'success', ...result });
+        }
+        return send({ id, status: 'failure', message: `Unknown message type: ${msg.type}` });
+      });
     },
 
     async getGameState(req: FastifyRequest, reply: FastifyReply) {
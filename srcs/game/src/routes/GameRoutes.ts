@@ -72,4 +72,5 @@ export async function gameRoutes(
   app.post('/ai/reset', ctrl.resetGame);
   app.post('/ai/step', ctrl.stepGame);
   app.get('/ai/state', ctrl.getGameState);
+  app.get('/ai/ws/:sessionId', { websocket: true }, ctrl.rlWebSocket);
 }
@@ -0,0 +1,54 @@
+// ============================================================================
+// RlStep — Advance a game for the RL training API
+// Runs one or several engine ticks with fixed paddle actions and reports the
+// accumulated reward, so a client can skip frames in a single round-trip.
+// ============================================================================
+
+import { PongGame } from '../core/engine/PongGame.js';
+import { GameState, PaddleDirection, PaddleSide } from '../types/game.types.js';
+
+/** Upper bound on ticks per request, so one call cannot hog the event loop */
+export const RL_MAX_TICKS = 32;
+
+export interface RlStepParams {
+  action: PaddleDirection;
+  paddle?: PaddleSide;
+  /** Optional action for the left paddle (self-play opponent) */
+  leftAction?: PaddleDirection;
+  /** Ticks to advance; undefined keeps the legacy single-tick response */
+  ticks?: number;
+}
+
+export interface RlStepResult {
+  state: GameState;
+  reward: number;
+  done: boolean;
+  /** Ticks actually run — only set for multi-tick requests */
+  ticks?: number;
+}
+
+export function rlStep(game: PongGame, params: RlStepParams): RlStepResult {
+  const { action, paddle = 'right', leftAction, ticks } = params;
+  const count = ticks === undefined ? 1 : Math.min(ticks, RL_MAX_TICKS);
+
+  let reward = 0;
+  let done = false;
+  let ran = 0;
+  while (ran < count && !done) {
+    game.setPaddleDirection(paddle, action);
+    if (leftAction) game.setPaddleDirection('left', leftAction);
+    game.update();
+    ran++;
+
+    if (game.isFinished()) {
+      done = true;
+      reward += game.scores.right > game.scores.left ? 1 : -1;
+    }
+  }
+
+  if (ticks === undefined) {
+    return { state: game.getState(), reward, done };
+  }
+  // Multi-tick callers only read the final state: skip the background grid
+  return { state: { ...game.getState(), cosmicBackground: null }, reward, done, ticks: ran };
+}
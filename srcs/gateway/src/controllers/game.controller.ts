@@ -74,6 +74,19 @@ export function registerGameRoutes(app: FastifyInstance) {
     webSocketProxyRequest(app, socket, request, `/ws/${sessionId}`);
   });
 
+  // RL training socket (pong-ai PongEnv transport="ws") → game-service /ai/ws/:sessionId.
+  // Public like /api/game/rl/reset and /rl/step: PUBLIC_ROUTES only matches exact URLs,
+  // so the session-scoped path is marked public on the route itself.
+  app.get(
+    '/ai/ws/:sessionId',
+    { websocket: true, config: { isPublic: true } },
+    (connection: any, request: FastifyRequest) => {
+      const { sessionId } = request.params as { sessionId: string };
+      const socket = connection.socket ?? connection;
+      webSocketProxyRequest(app, socket, request, `/ai/ws/${sessionId}`);
+    },
+  );
+
   app.all('/*', async (request, reply) => {
     const rawPath = (request.params as any)['*'];
     const cleanPath = rawPath.replace(/^api\/game\//, ''); // 🔥 FIX
@@ -47,6 +47,7 @@ export const GATEWAY_CONFIG = {
     '/api/block/health',
     '/api/game/rl/reset',
     '/api/game/rl/step',
+    // + /api/game/ai/ws/:sessionId (RL socket, marked isPublic on its route)
     '/api/auth/oauth/google/callback',
     '/api/auth/oauth/school42/callback',
   ],
@@ -0,0 +1,94 @@
+"""Action repeat for AIPlayer, matching the training FRAME_SKIP.
+
+The policy was trained in pong_env.py with FRAME_SKIP=4: each action is
+held for 4 game ticks (~66 ms). AIPlayer receives a state frame every tick,
+so deciding on every frame costs 4x the inference the policy was trained
+for. ActionRepeat makes a new decision only once `interval` frames have
+been received since the previous one (frames dropped as stale count too,
+so the hold time stays in game ticks). In between, the last action stays
+in effect: the game service keeps a paddle direction until it is
+overridden, so nothing needs to be re-sent.
+
+The interval widens under load. server_load tracks the number of playing
+sessions and the event-loop lag (how late a periodic sleep wakes up, as an
+EWMA). When either goes past its threshold the interval is scaled by the
+overload ratio, up to MAX_FRAME_SKIP, and shrinks back once load drops:
+games get slightly coarser control instead of every session lagging.
+"""
+
+import asyncio
+import math
+import os
+import time
+
+# Same value as pong_env.FRAME_SKIP (not imported: pong_env pulls in gymnasium)
+FRAME_SKIP = int(os.getenv("PONG_AI_FRAME_SKIP", "4"))
+MAX_FRAME_SKIP = int(os.getenv("PONG_AI_MAX_FRAME_SKIP", "12"))
+LAG_THRESHOLD_MS = float(os.getenv("PONG_AI_LAG_THRESHOLD_MS", "10"))
+SESSION_THRESHOLD = int(os.getenv("PONG_AI_SESSION_THRESHOLD", "32"))
+
+
+class ServerLoad:
+    """Process-wide load signals: playing sessions and event-loop lag (seconds)."""
+
+    def __init__(self, period=0.1, smoothing=0.2):
+        self.period = period
+        self.smoothing = smoothing
+        self.sessions = 0
+        self.lag = 0.0
+        self._task = None
+
+    def pressure(self, lag_threshold=LAG_THRESHOLD_MS / 1000, session_threshold=SESSION_THRESHOLD):
+        """How far past its threshold the busiest signal is (<= 1 means not overloaded)."""
+        return max(self.lag / lag_threshold, self.sessions / session_threshold)
+
+    async def _monitor(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.period)
+            late = max(0.0, time.perf_counter() - start - self.period)
+            self.lag += self.smoothing * (late - self.lag)
+
+    def start(self):
+        """Run the lag monitor on the current event loop (no-op if already running)."""
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self.lag = 0.0
+            self._task = loop.create_task(self._monitor())
+
+
+server_load = ServerLoad()
+
+
+class ActionRepeat:
+    """Decides which frames of a session get a fresh policy decision."""
+
+    def __init__(self, frame_skip=FRAME_SKIP, max_frame_skip=MAX_FRAME_SKIP, load=server_load):
+        self.frame_skip = frame_skip
+        self.max_frame_skip = max(frame_skip, max_frame_skip)
+        self.load = load
+        self._last = None  # frame number of the last decision
+        self._interval = frame_skip
+        self.decisions = 0
+        self.repeats = 0
+
+    def interval(self):
+        """Frames per decision at the current load."""
+        pressure = self.load.pressure()
+        if pressure <= 1:
+            return self.frame_skip
+        return min(self.max_frame_skip, math.ceil(self.frame_skip * pressure))
+
+    def should_decide(self, frame):
+        """True when state frame number `frame` needs a new decision, False to keep the last action."""
+        if self._last is not None and frame - self._last < self._interval:
+            self.repeats += 1
+            return False
+        self._last = frame
+        self._interval = self.interval()
+        self.decisions += 1
+        return True
+
+    def reset(self):
+        """Decide on the next frame (game not running in between)."""
+        self._last = None
@@ -1,17 +1,72 @@
 import asyncio
+import collections
 import json
 import time
 import numpy as np
 import os
 import ssl
-from stable_baselines3 import PPO
+from functools import lru_cache
 import websockets
 from typing import Optional
+from model_registry import get_model
+from inference_pool import DelayStats, get_executor, timed
+from frame_decoder import decode_message
+from action_repeat import ActionRepeat, server_load
+from heuristic_policy import InterceptPolicy
+
+ACTION_MAP = {0: "stop", 1: "up", 2: "down"}
+DEFAULT_OBSERVATION = np.array([400, 300, 0, 0, 300, 300], dtype=np.float32)
+
+# Outgoing messages never change: serialized once, sent as-is (the game
+# service JSON.parse()s text and binary frames alike)
+PADDLE_MESSAGES = {
+    (paddle, direction): json.dumps({"type": "paddle", "paddle": paddle, "direction": direction}).encode()
+    for paddle in ("left", "right")
+    for direction in ACTION_MAP.values()
+}
+PING_MESSAGE = json.dumps({"type": "ping"}).encode()
+READY_MESSAGE = json.dumps({"type": "ready"}).encode()
+
+# State frames received / dropped as stale by all sessions of the process
+frame_counters = {"received": 0, "dropped": 0}
+# First state frame received → first action sent, per session: cold-start regressions
+first_decision_delay = DelayStats(size=256)
+
+
+@lru_cache(maxsize=None)
+def _unverified_ssl_context() -> ssl.SSLContext:
+    """Shared client context for the internal wss:// link (loading CA certs takes ~20 ms)."""
+    context = ssl.create_default_context()
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    return context
 
 
 class AIPlayer:
-    def __init__(self, model_path: str, game_service_url: str = None):
-        self.model = PPO.load(model_path)
+    def __init__(self, model_path: Optional[str], game_service_url: str = None, scheduler=None,
+                 action_repeat: Optional[ActionRepeat] = None, heuristic: Optional[InterceptPolicy] = None,
+                 reloader=None, model=None):
+        # Plays with the analytic intercept policy instead of a model when set
+        self.heuristic = heuristic
+        # Optional ModelReloader: plays its current model, moving to newer
+        # versions at a safe point when its switch policy is "point"
+        self.reloader = reloader
+        # Score when a newer model was noticed mid-rally (switch once it changes)
+        self._switch_score = None
+        # The model the caller already resolved (and built its scheduler for),
+        # else borrowed from the process-wide registry: loaded once, shared by all sessions
+        if model is not None:
+            self.model = model
+        elif reloader is not None:
+            self.model = reloader.model
+        else:
+            self.model = get_model(model_path) if heuristic is None else None
+        # NumpyPolicy (PONG_AI_BACKEND=numpy) has an allocation-free greedy path
+        self._act = getattr(self.model, "act", None)
+        # Optional BatchInferenceScheduler shared by all sessions of the server
+        self.scheduler = scheduler
+        # Holds each action for FRAME_SKIP frames like in training, more under load
+        self.action_repeat = action_repeat or ActionRepeat()
 
         if game_service_url is None:
             host = os.getenv("GAME_SERVICE_NAME", "game-service")
@@ -22,13 +77,33 @@ class AIPlayer:
 
         self.ssl_context: ssl.SSLContext | None = None
         if self.game_service_url.startswith("wss://"):
-            self.ssl_context = ssl.create_default_context()
-            self.ssl_context.check_hostname = False
-            self.ssl_context.verify_mode = ssl.CERT_NONE
+            self.ssl_context = _unverified_ssl_context()
 
         self.websocket: Optional[websockets.WebSocketClientProtocol] = None
         self.playing = False
         self.paddle = "right"
+        # Last direction sent: a repeated "stop" is not re-sent
+        self._last_sent_action = "stop"
+        # Reused for every frame's observation (see _extract_observation)
+        self._obs = np.zeros(6, dtype=np.float32)
+        self._handlers = {
+            "connected": self._on_connected,
+            "ready_check": self._on_ready_check,
+            "state": self._on_state,
+            "gameOver": self._on_game_over,
+            "pong": self._on_pong,
+            "error": self._on_error,
+        }
+
+        # Messages read by _receive() and not yet handled: (received_at, message)
+        self._inbox = collections.deque()
+        self._inbox_ready = asyncio.Event()
+        self._receive_error: Optional[BaseException] = None
+        self._receive_done = False
+        self.frames_received = 0
+        self.frames_dropped = 0
+        # Latency of the session's first decision, seconds (None until made)
+        self.first_decision_latency: Optional[float] = None
 
         self.max_retries = 2
         self.initial_delay = 1.0
@@ -54,38 +129,178 @@ class AIPlayer:
             print("AI disconnected")
 
     def _extract_observation(self, game_state: dict) -> np.ndarray:
+        """Observation for a state frame, written into the session's reused buffer.
+
+        The buffer is only read by the decision for this frame, which play()
+        awaits before handling the next message.
+        """
+        obs = self._obs
         try:
             ball = game_state["ball"]
             paddles = game_state["paddles"]
-            left_paddle_y  = paddles["left"]["y"]  + paddles["left"]["height"]  / 2
-            right_paddle_y = paddles["right"]["y"] + paddles["right"]["height"] / 2
-            return np.array([
-                ball["x"],
-                ball["y"],
-                ball.get("vx", 0),
-                ball.get("vy", 0),
-                left_paddle_y,
-                right_paddle_y
-            ], dtype=np.float32)
+            left = paddles["left"]
+            right = paddles["right"]
+            obs[0] = ball["x"]
+            obs[1] = ball["y"]
+            obs[2] = ball.get("vx", 0)
+            obs[3] = ball.get("vy", 0)
+            obs[4] = left["y"] + left["height"] / 2
+            obs[5] = right["y"] + right["height"] / 2
         except (KeyError, TypeError) as e:
             print(f"Error extracting observation: {e}", flush=True)
-            return np.array([400, 300, 0, 0, 300, 300], dtype=np.float32)
+            obs[:] = DEFAULT_OBSERVATION
+        return obs
 
     def _get_action(self, observation: np.ndarray) -> str:
-        action, _ = self.model.predict(observation, deterministic=True)
-        action_map = {0: "stop", 1: "up", 2: "down"}
-        return action_map[int(action)]
+        if self._act is not None:
+            action = self._act(observation)
+        else:
+            action, _ = self.model.predict(observation, deterministic=True)
+        return ACTION_MAP[int(action)]
+
+    async def _decide(self, observation: np.ndarray, received_at: Optional[float] = None) -> str:
+        """Action for a frame, computed off the event loop.
+
+        Batched with the other sessions when a scheduler is set, otherwise
+        run alone on the inference thread pool. received_at (perf_counter)
+        is when the frame arrived, for the queue-delay measurement.
+        """
+        if received_at is None:
+            received_at = time.perf_counter()
+        if self.scheduler is not None:
+            return ACTION_MAP[await self.scheduler.predict(observation, received_at)]
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_executor(), timed, self._get_action, received_at, observation)
+
+    async def _receive(self):
+        """Reader task: queue every message, keeping only the newest state frame.
+
+        Runs alongside play() so the socket is drained while a decision is
+        being computed. A state frame replaces any state frame still waiting,
+        so play() never acts on an old ball position; control messages keep
+        their order.
+        """
+        try:
+            async for raw in self.websocket:
+                received_at = time.perf_counter()
+                message = decode_message(raw)
+                if message.get("type") == "state":
+                    stale = [entry for entry in self._inbox if entry[1].get("type") == "state"]
+                    for entry in stale:
+                        self._inbox.remove(entry)
+                    self.frames_received += 1
+                    self.frames_dropped += len(stale)
+                    frame_counters["received"] += 1
+                    frame_counters["dropped"] += len(stale)
+                self._inbox.append((received_at, message))
+                self._inbox_ready.set()
+        except Exception as e:
+            self._receive_error = e
+        finally:
+            self._receive_done = True
+            self._inbox_ready.set()
+
+    async def _next_message(self):
+        """Oldest pending message as (received_at, message), or None once the socket closed."""
+        while not self._inbox:
+            if self._receive_error is not None:
+                raise self._receive_error
+            if self._receive_done:
+                return None
+            self._inbox_ready.clear()
+            await self._inbox_ready.wait()
+        return self._inbox.popleft()
 
     def _is_connected(self) -> bool:
         return self.websocket is not None and self.websocket.state.name == "OPEN"
 
     async def send_paddle_action(self, direction: str):
         if self._is_connected():
-            await self.websocket.send(json.dumps({
-                "type": "paddle",
-                "paddle": self.paddle,
-                "direction": direction
-            }))
+            await self.websocket.send(PADDLE_MESSAGES[self.paddle, direction])
+
+    # ---- Message handlers (dispatched on message["type"] by play()) ----
+
+    async def _on_connected(self, message: dict, received_at: float):
+        # Detect assigned role and derive the controlled paddle side
+        role = message.get("player", {}).get("role", "B")
+        self.paddle = "right" if role == "B" else "left"
+        print(f"AI assigned role={role}, controlling paddle='{self.paddle}'", flush=True)
+
+    async def _on_ready_check(self, message: dict, received_at: float):
+        # Acknowledge ready — game will start once the human clicks Ready too
+        await self.websocket.send(READY_MESSAGE)
+        print("AI sent ready", flush=True)
+
+    async def _on_state(self, message: dict, received_at: float):
+        game_state = message.get("data", {})
+        status = game_state.get("status")
+
+        if status == "playing":
+            if self.reloader is not None and self.reloader.model is not self.model:
+                self._switch_at_point(game_state)
+            # Keep the last action until the frame-skip interval is over
+            if not self.action_repeat.should_decide(self.frames_received):
+                return
+            obs = self._extract_observation(game_state)
+            if self.heuristic is not None:
+                # A few microseconds: run inline, no pool or batching
+                new_action = ACTION_MAP[self.heuristic.act(obs, self.paddle)]
+            else:
+                new_action = await self._decide(obs, received_at)
+
+            # Always send the action — the server's paddle direction
+            # is persistent, so if we only send on change the paddle
+            # keeps drifting in whatever direction was last set.
+            # Exception: suppress duplicate "stop" to avoid noise.
+            if new_action != "stop" or self._last_sent_action != "stop":
+                await self.send_paddle_action(new_action)
+                self._last_sent_action = new_action
+            if self.first_decision_latency is None:
+                self._record_first_decision(received_at)
+            return
+
+        self.action_repeat.reset()
+        if self.reloader is not None and self.reloader.model is not self.model and self.reloader.switch == "point":
+            self._switch_model()  # between rallies
+        if status == "finished":
+            scores = game_state.get("scores", {})
+            print(f"Game finished! Score: {scores.get('left', 0)} - {scores.get('right', 0)}", flush=True)
+            self.playing = False
+
+    def _record_first_decision(self, received_at: float):
+        self.first_decision_latency = time.perf_counter() - received_at
+        first_decision_delay.record(self.first_decision_latency)
+        print(f"AI first decision {self.first_decision_latency * 1e3:.1f} ms after its frame", flush=True)
+
+    def _switch_at_point(self, game_state: dict):
+        """Move to the reloader's newer model once the rally in progress ends."""
+        if self.reloader.switch != "point":
+            return
+        scores = game_state.get("scores") or {}
+        score = scores.get("left", 0) + scores.get("right", 0)
+        if self._switch_score is None:
+            self._switch_score = score
+        elif score != self._switch_score:
+            self._switch_model()
+
+    def _switch_model(self):
+        self.model = self.reloader.model
+        self._act = getattr(self.model, "act", None)
+        if self.scheduler is not None and self.reloader.scheduler is not None:
+            self.scheduler = self.reloader.scheduler
+        self._switch_score = None
+        print(f"AI switched to model version {self.reloader.version}", flush=True)
+
+    async def _on_game_over(self, message: dict, received_at: float):
+        print("Game over", flush=True)
+        self.playing = False
+
+    async def _on_pong(self, message: dict, received_at: float):
+        pass  # keepalive ack, nothing to do
+
+    async def _on_error(self, message: dict, received_at: float):
+        print(f"Server error: {message.get('message')}", flush=True)
+        self.playing = False
 
     async def play(self, session_id: str):
         print(f"AI play() called for session: {session_id}", flush=True)
@@ -95,70 +310,36 @@ class AIPlayer:
             return
 
         self.playing = True
-        # Track last sent action so we can always send "stop" when transitioning
-        # but don't suppress "up"/"down" — server needs them every frame to keep
-        # moving (setPaddleDirection is stateful: it persists until overridden).
-        last_sent_action = "stop"
+        self._last_sent_action = "stop"
+        self._inbox.clear()
+        self._receive_error = None
+        self._receive_done = False
+        receiver = asyncio.create_task(self._receive())
+        server_load.start()
+        server_load.sessions += 1
 
         try:
-            await self.websocket.send(json.dumps({"type": "ping"}))
+            await self.websocket.send(PING_MESSAGE)
             print("AI player connected, waiting for ready_check...", flush=True)
 
             while self.playing and self._is_connected():
                 try:
-                    message_str = await asyncio.wait_for(
-                        self.websocket.recv(),
+                    pending = await asyncio.wait_for(
+                        self._next_message(),
                         timeout=5.0
                     )
-                    message = json.loads(message_str)
-
-                    if message.get("type") == "connected":
-                        # Detect assigned role and derive the controlled paddle side
-                        role = message.get("player", {}).get("role", "B")
-                        self.paddle = "right" if role == "B" else "left"
-                        print(f"AI assigned role={role}, controlling paddle='{self.paddle}'", flush=True)
-
-                    elif message.get("type") == "ready_check":
-                        # Acknowledge ready — game will start once the human clicks Ready too
-                        await self.websocket.send(json.dumps({"type": "ready"}))
-                        print("AI sent ready", flush=True)
-
-                    elif message.get("type") == "state":
-                        game_state = message.get("data", {})
-                        status = game_state.get("status")
-
-                        if status == "playing":
-                            obs        = self._extract_observation(game_state)
-                            new_action = self._get_action(obs)
-
-                            # Always send the action — the server's paddle direction
-                            # is persistent, so if we only send on change the paddle
-                            # keeps drifting in whatever direction was last set.
-                            # Exception: suppress duplicate "stop" to avoid noise.
-                            if new_action != "stop" or last_sent_action != "stop":
-                                await self.send_paddle_action(new_action)
-                                last_sent_action = new_action
-
-                        elif status == "finished":
-                            scores = game_state.get("scores", {})
-                            print(f"Game finished! Score: {scores.get('left', 0)} - {scores.get('right', 0)}", flush=True)
-                            self.playing = False
-
-                    elif message.get("type") == "gameOver":
-                        print("Game over", flush=True)
-                        self.playing = False
-
-                    elif message.get("type") == "pong":
-                        pass  # keepalive ack, nothing to do
-
-                    elif message.get("type") == "error":
-                        print(f"Server error: {message.get('message')}", flush=True)
-                        self.playing = False
+                    if pending is None:
+                        break
+                    received_at, message = pending
+
+                    handler = self._handlers.get(message.get("type"))
+                    if handler is not None:
+                        await handler(message, received_at)
 
                 except asyncio.TimeoutError:
                     # 5s without a frame — send ping to keep connection alive
                     if self._is_connected():
-                        await self.websocket.send(json.dumps({"type": "ping"}))
+                        await self.websocket.send(PING_MESSAGE)
 
                 except Exception as e:
                     print(f"Error in game loop: {e}", flush=True)
@@ -167,7 +348,11 @@ class AIPlayer:
                     break
 
         finally:
+            server_load.sessions -= 1
+            receiver.cancel()
             await self.disconnect()
+            if self.frames_dropped:
+                print(f"AI dropped {self.frames_dropped}/{self.frames_received} stale state frames", flush=True)
             print("AI player stopped")
 
     def stop(self):
@@ -0,0 +1,181 @@
+"""Asyncio pool of game-service sessions exposed as one SB3 VecEnv.
+
+DummyVecEnv over HTTP-backed PongEnvs serializes the round-trip latency:
+K envs cost K sequential requests per step. AsyncRemoteVecEnv instead owns
+K sessions created through /create-session and issues all K /rl/step
+requests concurrently on a shared httpx connection pool, so a vectorized
+step costs about one round-trip until the game service saturates.
+
+Concurrency is capped at max_in_flight requests (PONG_ENV_MAX_IN_FLIGHT,
+default 4), not K: the game service and this process's event loop
+saturate quickly, and with an uncapped pool K=16 or 64 ran below K=1 on
+bench_transport.py. K helps while the round-trip latency dominates (a
+remote or TLS-terminated game service); on a local service K=1 is as fast.
+
+Self-play works as in PongVecEnv: the agent drives the RIGHT paddles and
+the LEFT paddles are driven by one batched opponent predict() per step.
+"""
+
+import asyncio
+import os
+
+import httpx
+import numpy as np
+from gymnasium import spaces
+from stable_baselines3.common.vec_env import VecEnv
+
+from pong_env import FRAME_SKIP, PongEnv
+from self_play_env import opponent_actions, opponent_episodes_end
+
+ACTION_NAMES = ("stop", "up", "down")
+MAX_IN_FLIGHT = int(os.getenv("PONG_ENV_MAX_IN_FLIGHT", "4"))
+
+
+class AsyncRemoteVecEnv(VecEnv):
+    metadata = {"render_modes": [], "render_fps": 60}
+    render_mode = None
+
+    def __init__(self, num_envs=16, base_url=None, verify_ssl=None, opponent_model=None, seed=None,
+                 max_in_flight=MAX_IN_FLIGHT, transport=None):
+        if base_url is None:
+            base_url = os.getenv("GAME_SERVICE_URL", "http://localhost:8080/api/game")
+        if verify_ssl is None:
+            verify_ssl = os.getenv("GAME_SERVICE_VERIFY_SSL", "").lower() in ("1", "true", "yes")
+        if "localhost" in base_url or "127.0.0.1" in base_url:
+            verify_ssl = False
+
+        self.width = 800
+        self.height = 600
+        # Same spaces as PongEnv
+        observation_space = spaces.Box(
+            low=np.array([0, 0, -20, -20, 0, 0], dtype=np.float32),
+            high=np.array([self.width, self.height, 20, 20, self.height, self.height], dtype=np.float32),
+            dtype=np.float32,
+        )
+        super().__init__(num_envs, observation_space, spaces.Discrete(3))
+
+        self.base_url = base_url
+        self.opponent_model = opponent_model  # None → random opponent
+        self._rng = np.random.default_rng(seed)
+        self._actions = np.zeros(num_envs, dtype=np.int64)
+        self._obs = np.zeros((num_envs, 6), dtype=np.float32)
+        # Whether the game service supports multi-tick /rl/step (see PongEnv)
+        self._multi_tick = None
+
+        self.max_in_flight = max(1, min(max_in_flight, num_envs))
+        self._loop = asyncio.new_event_loop()
+        self._in_flight = asyncio.Semaphore(self.max_in_flight)
+        self._client = httpx.AsyncClient(
+            verify=verify_ssl,
+            timeout=5,
+            limits=httpx.Limits(max_connections=self.max_in_flight, max_keepalive_connections=self.max_in_flight),
+            transport=transport,
+        )
+        self.session_ids = self._run([self._create_session() for _ in range(num_envs)])
+        print(f"[AsyncRemoteVecEnv] {num_envs} sessions created at {base_url} "
+              f"(max {self.max_in_flight} requests in flight)")
+
+    def set_opponent(self, model):
+        """Replace the frozen opponent policy (called by UpdateOpponentCallback)."""
+        self.opponent_model = model
+
+    # ---- HTTP ----
+
+    def _run(self, coros):
+        """Run coroutines concurrently on the env's loop, results in order."""
+        async def gather():
+            return await asyncio.gather(*coros)
+        return self._loop.run_until_complete(gather())
+
+    async def _post(self, path, payload=None):
+        async with self._in_flight:
+            resp = await self._client.post(f"{self.base_url}{path}", json=payload)
+        resp.raise_for_status()
+        return resp.json()
+
+    async def _create_session(self):
+        return (await self._post("/create-session"))["sessionId"]
+
+    async def _reset_one(self, i):
+        data = await self._post("/rl/reset", {"sessionId": self.session_ids[i]})
+        self._obs[i] = PongEnv._convert_state(data["state"])
+
+    async def _step_one(self, i, right_action, left_action):
+        """FRAME_SKIP ticks for env i — same protocol and fallback as PongEnv."""
+        payload = {
+            "sessionId": self.session_ids[i],
+            "action": ACTION_NAMES[right_action],
+            "paddle": "right",
+            "leftAction": ACTION_NAMES[left_action],
+        }
+        reward = 0
+        done = False
+        remaining = FRAME_SKIP
+        if self._multi_tick is not False:
+            data = await self._post("/rl/step", {**payload, "ticks": FRAME_SKIP})
+            reward += data.get("reward", 0)
+            done = data.get("done", False)
+            if "ticks" in data:
+                self._multi_tick = True
+                remaining = 0
+            else:
+                self._multi_tick = False
+                remaining -= 1
+        while remaining > 0 and not done:
+            data = await self._post("/rl/step", payload)
+            reward += data.get("reward", 0)
+            done = data.get("done", False)
+            remaining -= 1
+        return PongEnv._convert_state(data["state"]), reward, done
+
+    # ---- VecEnv API ----
+
+    def reset(self):
+        self._reset_seeds()
+        self._reset_options()
+        self._run([self._reset_one(i) for i in range(self.num_envs)])
+        return self._obs.copy()
+
+    def step_async(self, actions):
+        self._actions = np.asarray(actions, dtype=np.int64).reshape(self.num_envs)
+
+    def step_wait(self):
+        left_actions = opponent_actions(self.opponent_model, self._obs, self._rng, self.width)
+        results = self._run([
+            self._step_one(i, int(self._actions[i]), int(left_actions[i]))
+            for i in range(self.num_envs)
+        ])
+
+        rewards = np.zeros(self.num_envs, dtype=np.float32)
+        dones = np.zeros(self.num_envs, dtype=bool)
+        infos = [{} for _ in range(self.num_envs)]
+        for i, (obs, reward, done) in enumerate(results):
+            self._obs[i] = obs
+            rewards[i] = reward
+            dones[i] = done
+            if done:
+                infos[i]["terminal_observation"] = obs
+                infos[i]["TimeLimit.truncated"] = False
+
+        done_idx = np.flatnonzero(dones)
+        opponent_episodes_end(self.opponent_model, done_idx, rewards[done_idx])
+        if len(done_idx):
+            self._run([self._reset_one(i) for i in done_idx])
+        return self._obs.copy(), rewards, dones, infos
+
+    def close(self):
+        self._run([self._client.aclose()])
+        self._loop.close()
+
+    def get_attr(self, attr_name, indices=None):
+        return [getattr(self, attr_name) for _ in self._get_indices(indices)]
+
+    def set_attr(self, attr_name, value, indices=None):
+        setattr(self, attr_name, value)
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        method = getattr(self, method_name)
+        return [method(*method_args, **method_kwargs) for _ in self._get_indices(indices)]
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False for _ in self._get_indices(indices)]
@@ -0,0 +1,71 @@
+"""Benchmark decoding of game-service "state" frames.
+
+Compares json.loads() on the full frame with frame_decoder.decode_message(),
+which skips the cosmicBackground grid, and checks both give the same fields.
+
+Frames are read from a capture file (one raw WebSocket message per line, as
+received by AIPlayer.play()) when one is given. Otherwise they are generated
+by PongSim, whose get_state() has the same shape, key order and grid size as
+PongGame.getState(), serialized like JSON.stringify().
+
+Usage:
+    python3 bench_decoder.py [frames.jsonl] [repeats]
+"""
+
+import json
+import sys
+import time
+
+import numpy as np
+
+from frame_decoder import decode_message
+from pong_sim import PongSim
+
+
+def synthetic_frames(count=200, seed=0):
+    sim = PongSim(seed=seed)
+    sim.status = "playing"
+    frames = []
+    rng = np.random.default_rng(seed)
+    for _ in range(count):
+        for _ in range(4):
+            sim.rl_step(("stop", "up", "down")[rng.integers(3)], ("stop", "up", "down")[rng.integers(3)])
+        frames.append(json.dumps({"type": "state", "data": sim.get_state()}, separators=(",", ":")))
+    return frames
+
+
+def load_frames(path):
+    with open(path) as f:
+        return [line.rstrip("\n") for line in f if line.strip()]
+
+
+def _time(decode, frames, repeats):
+    start = time.process_time()
+    for _ in range(repeats):
+        for frame in frames:
+            decode(frame)
+    return (time.process_time() - start) / (repeats * len(frames))
+
+
+def main():
+    frames = load_frames(sys.argv[1]) if len(sys.argv) > 1 else synthetic_frames()
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    for frame in frames:
+        full, fast = json.loads(frame), decode_message(frame)
+        if "cosmicBackground" in full.get("data", {}):
+            full["data"]["cosmicBackground"] = None
+        assert full == fast, "decoded frames differ"
+
+    size = sum(map(len, frames)) / len(frames)
+    full = _time(json.loads, frames, repeats)
+    fast = _time(decode_message, frames, repeats)
+    print(f"{len(frames)} frames, {size / 1024:.1f} KiB average")
+    print(f"{'decoder':<16} {'us/frame':>10}")
+    print(f"{'json.loads':<16} {full * 1e6:>10.1f}")
+    print(f"{'decode_message':<16} {fast * 1e6:>10.1f}")
+    print(f"speed-up: {full / fast:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
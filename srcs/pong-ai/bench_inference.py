@@ -0,0 +1,95 @@
+"""Benchmark per-frame inference cost of the AI server.
+
+Simulates S concurrent AI sessions, each deciding on a state frame every
+16 ms like AIPlayer.play(), on one asyncio loop. Reports CPU time per
+decision, decision latency and queue delay (frame → forward pass start)
+for per-session predict() calls on the loop ("direct") or on the inference
+thread pool ("pool"), and for the cross-session BatchInferenceScheduler
+inline ("batched") or on the pool ("batched+pool", the server setup).
+
+Usage:
+    python3 bench_inference.py [sessions] [seconds] [model_path]
+"""
+
+import asyncio
+import sys
+import time
+
+import numpy as np
+
+from inference_pool import get_executor, queue_delay
+from inference_scheduler import BatchInferenceScheduler
+
+FRAME_INTERVAL = 1 / 62
+
+
+async def _session(decide, seconds, rng, latencies):
+    end = time.perf_counter() + seconds
+    next_frame = time.perf_counter()
+    obs = np.array([400, 300, 5, 0, 300, 300], dtype=np.float32)
+    while next_frame < end:
+        obs[:2] = rng.uniform((0, 0), (800, 600))
+        start = time.perf_counter()
+        await decide(obs)
+        latencies.append(time.perf_counter() - start)
+        next_frame += FRAME_INTERVAL
+        await asyncio.sleep(max(0.0, next_frame - time.perf_counter()))
+
+
+MODES = ("direct", "pool", "batched", "batched+pool")
+
+
+async def _run(model, sessions, seconds, mode):
+    executor = get_executor() if mode.endswith("pool") else None
+    scheduler = BatchInferenceScheduler(model, executor=executor) if mode.startswith("batched") else None
+    queue_delay.reset()
+    loop = asyncio.get_running_loop()
+
+    def predict(received_at, obs):
+        queue_delay.record(time.perf_counter() - received_at)
+        return int(model.predict(obs, deterministic=True)[0])
+
+    async def decide(obs):
+        received_at = time.perf_counter()
+        if scheduler is not None:
+            return await scheduler.predict(obs, received_at)
+        if executor is not None:
+            return await loop.run_in_executor(executor, predict, received_at, obs)
+        return predict(received_at, obs)
+
+    latencies = []
+    rng = np.random.default_rng(0)
+    cpu = time.process_time()
+    await asyncio.gather(*(_session(decide, seconds, rng, latencies) for _ in range(sessions)))
+    cpu = time.process_time() - cpu
+    return cpu / len(latencies), np.percentile(latencies, [50, 99]), len(latencies), queue_delay.summary()
+
+
+def bench(model, sessions, seconds):
+    return {mode: asyncio.run(_run(model, sessions, seconds, mode)) for mode in MODES}
+
+
+def main():
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 3
+    model_path = sys.argv[3] if len(sys.argv) > 3 else "models/best_model"
+
+    from stable_baselines3 import PPO
+
+    from numpy_policy import NumpyPolicy
+
+    backends = {
+        "sb3": PPO.load(model_path, device="cpu"),
+        "numpy": NumpyPolicy.from_zip(model_path),
+    }
+    print(f"{sessions} sessions, {seconds:.0f} s")
+    print(f"{'backend':<8} {'mode':<13} {'decisions':>10} {'CPU us/decision':>16} "
+          f"{'p50 ms':>8} {'p99 ms':>8} {'queue p99 ms':>13}")
+    for name, model in backends.items():
+        for mode, (cpu, (p50, p99), count, delay) in bench(model, sessions, seconds).items():
+            print(f"{name:<8} {mode:<13} {count:>10} {cpu * 1e6:>16.1f} "
+                  f"{p50 * 1e3:>8.2f} {p99 * 1e3:>8.2f} {delay['p99_ms']:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
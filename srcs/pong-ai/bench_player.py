@@ -0,0 +1,122 @@
+"""Benchmark the per-frame Python overhead of AIPlayer.play().
+
+Times the handling of one decoded "playing" state frame: observation
+extraction, message dispatch and sending the paddle message, with the
+decision stubbed out (see bench_inference.py for the forward pass) and a
+socket whose send() does nothing. Action repeat is disabled so every frame
+takes the full path.
+
+"before" replays the previous per-frame code (an if/elif chain on the
+message type, a new observation array and a json.dumps() per frame);
+"after" is AIPlayer's dispatch table, reused observation buffer and
+pre-encoded paddle messages.
+
+Usage:
+    python3 bench_player.py [frames]
+"""
+
+import asyncio
+import json
+import sys
+import time
+import tracemalloc
+from unittest.mock import patch
+
+import numpy as np
+
+from action_repeat import ActionRepeat
+from ai_player import AIPlayer
+from pong_sim import PongSim
+
+
+class NullSocket:
+    class state:
+        name = "OPEN"
+
+    async def send(self, message):
+        pass
+
+
+def _frame():
+    sim = PongSim(seed=0)
+    sim.status = "playing"
+    state = sim.get_state()
+    state["cosmicBackground"] = None  # dropped by frame_decoder before play() sees it
+    return {"type": "state", "data": state}
+
+
+# ---- Previous per-frame path ----
+
+def _legacy_observation(game_state):
+    ball = game_state["ball"]
+    paddles = game_state["paddles"]
+    left_paddle_y = paddles["left"]["y"] + paddles["left"]["height"] / 2
+    right_paddle_y = paddles["right"]["y"] + paddles["right"]["height"] / 2
+    return np.array([
+        ball["x"], ball["y"], ball.get("vx", 0), ball.get("vy", 0), left_paddle_y, right_paddle_y
+    ], dtype=np.float32)
+
+
+async def _legacy_frame(player, message, received_at):
+    if message.get("type") == "connected":
+        pass
+    elif message.get("type") == "ready_check":
+        pass
+    elif message.get("type") == "state":
+        game_state = message.get("data", {})
+        status = game_state.get("status")
+        if status == "playing":
+            obs = _legacy_observation(game_state)
+            new_action = await player._decide(obs, received_at)
+            await player.websocket.send(json.dumps({
+                "type": "paddle",
+                "paddle": player.paddle,
+                "direction": new_action
+            }))
+
+
+async def _current_frame(player, message, received_at):
+    handler = player._handlers.get(message.get("type"))
+    if handler is not None:
+        await handler(message, received_at)
+
+
+# ---- Harness ----
+
+async def _time(handle, player, message, frames):
+    start = time.perf_counter()
+    for _ in range(frames):
+        await handle(player, message, start)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    for _ in range(1000):
+        await handle(player, message, start)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed / frames, peak
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    with patch("ai_player.get_model"):
+        player = AIPlayer("models/best_model", game_service_url="ws://localhost",
+                          action_repeat=ActionRepeat(frame_skip=1))
+    player.websocket = NullSocket()
+
+    async def decide(obs, received_at):
+        return "up"
+
+    player._decide = decide
+    message = _frame()
+
+    print(f"{frames} state frames, decision stubbed")
+    print(f"{'path':<8} {'us/frame':>10} {'peak B/1k frames':>18}")
+    for name, handle in (("before", _legacy_frame), ("after", _current_frame)):
+        per_frame, peak = asyncio.run(_time(handle, player, message, frames))
+        print(f"{name:<8} {per_frame * 1e6:>10.2f} {peak:>18}")
+
+
+if __name__ == "__main__":
+    main()
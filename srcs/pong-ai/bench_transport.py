@@ -0,0 +1,157 @@
+"""Benchmark PongEnv steps per second over the HTTP and WebSocket transports.
+
+Starts a local stand-in for the game service RL API (FastAPI + uvicorn,
+backed by PongSim) that speaks the same protocol as the real endpoints:
+POST /create-session, /rl/reset, /rl/step (with multi-tick "ticks") and the
+/ai/ws/<sessionId> socket (rl_transport.RL_WS_PATH, the game service route). Then runs the same PongEnv loop over each
+transport and prints the throughput side by side, followed by the
+AsyncRemoteVecEnv pool at several pool sizes K.
+
+latency_ms delays every RL reply on the stand-in to emulate the network
+round-trip to the real game service (docker network, gateway, TLS).
+
+Usage:
+    python3 bench_transport.py [steps] [latency_ms]
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import uuid
+
+import numpy as np
+import uvicorn
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+
+from async_vec_env import AsyncRemoteVecEnv
+from pong_env import PongEnv
+from pong_sim import PongSim
+from rl_transport import RL_WS_PATH
+
+HOST = "127.0.0.1"
+PORT = 38106
+
+
+def _rl_step(sim, msg):
+    """Same semantics as the game service rlStep() use case."""
+    ticks = msg.get("ticks")
+    count = 1 if ticks is None else min(int(ticks), 32)
+    reward, done, ran = 0, False, 0
+    while ran < count and not done:
+        r, done = sim.rl_step(msg["action"], msg.get("leftAction"))
+        reward += r
+        ran += 1
+    if ticks is None:
+        return {"status": "success", "state": sim.get_state(), "reward": reward, "done": done}
+    state = sim.get_state(include_background=False)
+    return {"status": "success", "state": state, "reward": reward, "done": done, "ticks": ran}
+
+
+def create_standin_app(latency_ms=0):
+    app = FastAPI()
+    sessions = {}
+    delay = latency_ms / 1000
+
+    async def network_delay():
+        if delay:
+            await asyncio.sleep(delay)
+
+    @app.post("/create-session")
+    async def create_session():
+        session_id = str(uuid.uuid4())
+        sessions[session_id] = PongSim()
+        return {"sessionId": session_id}
+
+    @app.post("/rl/reset")
+    async def reset(request: Request):
+        sim = sessions[(await request.json())["sessionId"]]
+        await network_delay()
+        sim.reset()
+        return {"status": "success", "state": sim.get_state()}
+
+    @app.post("/rl/step")
+    async def step(request: Request):
+        body = await request.json()
+        await network_delay()
+        return _rl_step(sessions[body["sessionId"]], body)
+
+    @app.websocket(RL_WS_PATH + "/{session_id}")
+    async def rl_socket(websocket: WebSocket, session_id: str):
+        await websocket.accept()
+        sim = sessions[session_id]
+        try:
+            while True:
+                msg = await websocket.receive_json()
+                await network_delay()
+                if msg["type"] == "reset":
+                    sim.reset()
+                    reply = {"status": "success", "state": sim.get_state()}
+                else:
+                    reply = _rl_step(sim, msg)
+                await websocket.send_json({"id": msg.get("id"), **reply})
+        except WebSocketDisconnect:
+            pass
+
+    return app
+
+
+def start_standin_server(latency_ms=0):
+    config = uvicorn.Config(create_standin_app(latency_ms), host=HOST, port=PORT, log_level="warning")
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread
+
+
+def bench(transport, steps):
+    env = PongEnv(base_url=f"http://{HOST}:{PORT}", transport=transport)
+    rng = np.random.default_rng(0)
+    actions = rng.integers(0, 3, size=(steps, 2))
+    start = time.perf_counter()
+    for right, left in actions:
+        _, _, done, _, _ = env.step_both(right, left)
+        if done:
+            env.reset()
+    elapsed = time.perf_counter() - start
+    env.close()
+    return steps / elapsed
+
+
+def bench_pool(num_envs, steps):
+    env = AsyncRemoteVecEnv(num_envs=num_envs, base_url=f"http://{HOST}:{PORT}")
+    rng = np.random.default_rng(0)
+    env.reset()
+    start = time.perf_counter()
+    for _ in range(steps // num_envs):
+        env.step(rng.integers(0, 3, size=num_envs))
+    elapsed = time.perf_counter() - start
+    env.close()
+    return (steps // num_envs) * num_envs / elapsed
+
+
+def main():
+    steps = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    latency_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 0
+    server, thread = start_standin_server(latency_ms)
+    try:
+        results = {transport: bench(transport, steps) for transport in ("http", "ws")}
+        pool = {k: bench_pool(k, steps) for k in (1, 4, 16, 64)}
+    finally:
+        server.should_exit = True
+        thread.join()
+
+    print(f"{'transport':<10} {'steps/s':>10}")
+    for transport, rate in results.items():
+        print(f"{transport:<10} {rate:>10.0f}")
+    print(f"ws / http speed-up: {results['ws'] / results['http']:.1f}x")
+    print()
+    print(f"{'async K':<10} {'steps/s':>10}")
+    for k, rate in pool.items():
+        print(f"{k:<10} {rate:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
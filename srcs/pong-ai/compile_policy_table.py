@@ -0,0 +1,101 @@
+"""Compile the actor of a trained model into a policy lookup table.
+
+Evaluates the policy at the centre of every grid cell (policy_table.BOUNDS,
+DEFAULT_BINS unless --bins is given) in large vectorized batches and writes
+the greedy actions to <model>.table.npy (uint8). The file is written under
+a temporary name and renamed into place, so processes that already map the
+old table keep a consistent copy.
+
+It then reports how often the table disagrees with the full model, on the
+recorded frames shared with export_onnx.py (<model>.parity.npy, recorded
+from local PongSim games on first use) or on a given .npy of observations.
+
+The registry refuses to serve a table disagreeing on more than
+MAX_DISAGREEMENT of those frames (PONG_AI_TABLE_MAX_DISAGREEMENT) and
+serves the float actor instead.
+
+Usage:
+    python3 compile_policy_table.py [model_path] [output.table.npy] [frames.npy] [--bins 40,40,8,8,16,40]
+
+Exits non-zero when the table disagrees on more than MAX_DISAGREEMENT of the frames.
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+from policy_table import BOUNDS, DEFAULT_BINS, PolicyTable
+
+BATCH = 1 << 18
+MAX_DISAGREEMENT = float(os.getenv("PONG_AI_TABLE_MAX_DISAGREEMENT", "0.15"))
+
+
+def compile_table(policy, output, bins=DEFAULT_BINS, batch=BATCH):
+    """Write the greedy action of policy for every grid cell to output; returns the PolicyTable."""
+    tmp = f"{output}.tmp.npy"
+    table = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.uint8, shape=tuple(bins))
+    grid = PolicyTable(table, BOUNDS)
+    flat = table.reshape(-1)
+    for start in range(0, flat.size, batch):
+        cells = np.arange(start, min(start + batch, flat.size))
+        flat[cells] = policy.logits(grid.cell_centres(cells)).argmax(axis=1)
+    table.flush()
+    del table, grid, flat
+    os.replace(tmp, output)
+    return PolicyTable.from_file(output)
+
+
+def disagreement(policy, table, observations):
+    """(mismatching frames, per full-model action: (frames, mismatches))."""
+    expected, _ = policy.predict(observations, deterministic=True)
+    actions, _ = table.predict(observations)
+    wrong = np.asarray(actions) != np.asarray(expected)
+    per_action = {int(a): (int(np.sum(expected == a)), int(np.sum(wrong[expected == a])))
+                  for a in np.unique(expected)}
+    return int(wrong.sum()), per_action
+
+
+def _parse_args(argv):
+    bins = DEFAULT_BINS
+    if "--bins" in argv:
+        i = argv.index("--bins")
+        bins = tuple(int(n) for n in argv[i + 1].split(","))
+        argv = argv[:i] + argv[i + 2:]
+    return argv, bins
+
+
+def main():
+    from export_onnx import record_observations
+    from model_registry import _base_path, load_numpy_policy
+
+    argv, bins = _parse_args(sys.argv[1:])
+    base = _base_path(argv[0] if argv else "models/best_model")
+    output = argv[1] if len(argv) > 1 else f"{base}.table.npy"
+    frames = argv[2] if len(argv) > 2 else f"{base}.parity.npy"
+
+    policy = load_numpy_policy(base)
+    start = time.perf_counter()
+    table = compile_table(policy, output, bins)
+    print(f"[table] {base} → {output} ({'x'.join(map(str, bins))}, "
+          f"{table.nbytes / 2**20:.1f} MiB) in {time.perf_counter() - start:.1f} s")
+
+    if os.path.exists(frames):
+        observations = np.load(frames)
+    else:
+        observations = record_observations(policy)
+        np.save(frames, observations)
+        print(f"[table] Recorded {len(observations)} frames → {frames}")
+
+    mismatches, per_action = disagreement(policy, table, observations)
+    print(f"[table] Disagreement: {mismatches}/{len(observations)} frames "
+          f"({mismatches / len(observations):.1%})")
+    for action, (count, wrong) in sorted(per_action.items()):
+        print(f"[table]   model action {action}: {wrong}/{count} differ")
+    if mismatches / len(observations) > MAX_DISAGREEMENT:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
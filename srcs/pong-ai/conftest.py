@@ -0,0 +1,18 @@
+"""Shared pytest fixtures for the pong-ai tests"""
+import numpy as np
+import pytest
+
+from numpy_policy import NumpyPolicy
+
+
+@pytest.fixture(scope="module")
+def policy():
+    """A random actor with the served 6 → 64 → 64 → 3 shape, scaled to the field"""
+    rng = np.random.default_rng(0)
+    shapes = [(6, 64), (64, 64), (64, 3)]
+    weights = [rng.normal(0, 1 / np.sqrt(i), size=(i, o)) for i, o in shapes]
+    # Scale the inputs to the field so the actions vary over the observation space
+    weights[0] /= np.array([800, 600, 20, 20, 600, 600])[:, None] / 4
+    biases = [np.zeros(o) for _, o in shapes]
+    biases[0] = -weights[0].T @ np.array([400, 300, 0, 0, 300, 300])
+    return NumpyPolicy(weights, biases)
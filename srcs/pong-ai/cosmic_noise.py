@@ -0,0 +1,273 @@
+"""NumPy port of the game service CosmicNoise force field.
+
+srcs/game/src/core/engine/CosmicNoise.ts seeds simplex-noise's
+createNoise3D() with an Alea PRNG. Both are ported here bit for bit, so a
+given seed produces the same noise values as the live engine:
+
+  - vectors_at() is getVectorAt() for a whole batch of balls in one call;
+    it is the only part of the noise that pushes the ball.
+  - field() is getField() (the 80x60 `cosmicBackground` grid), evaluated
+    in one vectorized call and cached per (seed, time bucket) with LRU
+    eviction, since the grid only drifts slowly with time.
+
+vector_at() is a scalar pure-Python version of vectors_at() for PongSim,
+where NumPy call overhead would dominate a single-ball evaluation.
+"""
+
+import math
+from collections import OrderedDict
+
+import numpy as np
+
+F3 = 1.0 / 3.0
+G3 = 1.0 / 6.0
+
+GRAD3 = np.array([
+    1, 1, 0, -1, 1, 0, 1, -1, 0, -1, -1, 0,
+    1, 0, 1, -1, 0, 1, 1, 0, -1, -1, 0, -1,
+    0, 1, 1, 0, -1, 1, 0, 1, -1, 0, -1, -1,
+], dtype=np.float64).reshape(12, 3)
+
+# Scales used by CosmicNoise.getVectorAt() / getField()
+VECTOR_SCALE = 0.05
+FIELD_SCALE = 0.005
+
+
+# ---------------------------------------------------------------------------
+# Alea PRNG (npm "alea"), used by CosmicNoise to seed the permutation table
+# ---------------------------------------------------------------------------
+def _mash():
+    n = 0xEFC8249D
+
+    def mash(data):
+        nonlocal n
+        for ch in str(data):
+            n += ord(ch)
+            h = 0.02519603282416938 * n
+            n = int(h) & 0xFFFFFFFF
+            h -= n
+            h *= n
+            n = int(h) & 0xFFFFFFFF
+            h -= n
+            n += h * 0x100000000
+        return (int(n) & 0xFFFFFFFF) * 2.3283064365386963e-10
+
+    return mash
+
+
+def alea(seed):
+    """Return a random() function producing the same stream as Alea(seed)."""
+    mash = _mash()
+    s0 = mash(" ")
+    s1 = mash(" ")
+    s2 = mash(" ")
+    s0 -= mash(seed)
+    if s0 < 0:
+        s0 += 1
+    s1 -= mash(seed)
+    if s1 < 0:
+        s1 += 1
+    s2 -= mash(seed)
+    if s2 < 0:
+        s2 += 1
+    c = 1
+
+    def random():
+        nonlocal s0, s1, s2, c
+        t = 2091639 * s0 + c * 2.3283064365386963e-10
+        s0, s1 = s1, s2
+        c = int(t)
+        s2 = t - c
+        return s2
+
+    return random
+
+
+def _js_number(seed):
+    """String(seed) as JavaScript prints an integral number."""
+    if isinstance(seed, float) and seed.is_integer():
+        seed = int(seed)
+    return str(seed)
+
+
+def build_permutation_table(random):
+    """simplex-noise buildPermutationTable(): 512-entry doubled permutation."""
+    p = list(range(256))
+    for i in range(255):
+        r = i + int(random() * (256 - i))
+        p[i], p[r] = p[r], p[i]
+    return np.array(p + p, dtype=np.int64)
+
+
+# ---------------------------------------------------------------------------
+# Noise field
+# ---------------------------------------------------------------------------
+class CosmicNoise:
+    """Seeded 3D simplex noise with the CosmicNoise.ts field/vector helpers."""
+
+    def __init__(self, width=800, height=600, size=10, seed=0, cache_size=64, time_bucket=0.01):
+        self.width = width
+        self.height = height
+        self.size = size
+        self.seed = seed
+        self.perm = build_permutation_table(alea(_js_number(seed)))
+        self._perm_list = self.perm.tolist()
+        # Gradient components per permutation entry (permGrad3x/y/z in simplex-noise)
+        grads = GRAD3[self.perm % 12]
+        self._grad_x, self._grad_y, self._grad_z = grads[:, 0].copy(), grads[:, 1].copy(), grads[:, 2].copy()
+        self._grad_list = grads.tolist()
+
+        self.grid_width = math.ceil(width / size)
+        self.grid_height = math.ceil(height / size)
+        gy, gx = np.mgrid[0:self.grid_height, 0:self.grid_width]
+        self._field_x = (gx * size).astype(np.float64) * FIELD_SCALE
+        self._field_y = (gy * size).astype(np.float64) * FIELD_SCALE
+
+        self.cache_size = cache_size
+        self.time_bucket = time_bucket
+        self._fields = OrderedDict()
+
+    # ---- Vectorized noise ----
+
+    def noise3d(self, x, y, z):
+        """createNoise3D() evaluated element-wise over broadcastable arrays."""
+        x, y, z = np.broadcast_arrays(
+            np.asarray(x, dtype=np.float64),
+            np.asarray(y, dtype=np.float64),
+            np.asarray(z, dtype=np.float64),
+        )
+        s = (x + y + z) * F3
+        i = np.floor(x + s)
+        j = np.floor(y + s)
+        k = np.floor(z + s)
+        t = (i + j + k) * G3
+        x0 = x - (i - t)
+        y0 = y - (j - t)
+        z0 = z - (k - t)
+
+        # Offsets of the second and third simplex corners
+        xy = x0 >= y0
+        yz = y0 >= z0
+        xz = x0 >= z0
+        i1 = (xy & (yz | xz)).astype(np.int64)
+        j1 = (~xy & yz).astype(np.int64)
+        k1 = ((xy & ~yz & ~xz) | (~xy & ~yz)).astype(np.int64)
+        i2 = (xy | (yz & xz)).astype(np.int64)
+        j2 = ((xy & yz) | ~xy).astype(np.int64)
+        k2 = ((xy & ~yz) | (~xy & ~(yz & xz))).astype(np.int64)
+
+        ii = i.astype(np.int64) & 255
+        jj = j.astype(np.int64) & 255
+        kk = k.astype(np.int64) & 255
+        perm = self.perm
+
+        corners = (
+            (x0, y0, z0, ii + perm[jj + perm[kk]]),
+            (x0 - i1 + G3, y0 - j1 + G3, z0 - k1 + G3,
+             ii + i1 + perm[jj + j1 + perm[kk + k1]]),
+            (x0 - i2 + 2.0 * G3, y0 - j2 + 2.0 * G3, z0 - k2 + 2.0 * G3,
+             ii + i2 + perm[jj + j2 + perm[kk + k2]]),
+            (x0 - 1.0 + 3.0 * G3, y0 - 1.0 + 3.0 * G3, z0 - 1.0 + 3.0 * G3,
+             ii + 1 + perm[jj + 1 + perm[kk + 1]]),
+        )
+        total = np.zeros(x.shape)
+        for cx, cy, cz, gi in corners:
+            t = 0.6 - cx * cx - cy * cy - cz * cz
+            np.maximum(t, 0.0, out=t)
+            t *= t
+            total += t * t * (self._grad_x[gi] * cx + self._grad_y[gi] * cy + self._grad_z[gi] * cz)
+        return 32.0 * total
+
+    def vectors_at(self, x, y, time):
+        """getVectorAt() for a batch of positions: returns (fx, fy) unit vectors."""
+        value = (self.noise3d(np.asarray(x) * VECTOR_SCALE, np.asarray(y) * VECTOR_SCALE, time) + 1) / 2
+        angle = value * math.pi * 2
+        return np.cos(angle), np.sin(angle)
+
+    def field(self, time):
+        """getField() at `time` — the (grid_height, grid_width) cosmicBackground grid.
+
+        Grids are cached per time bucket (the engine advances time by 0.01 per
+        tick), evicting the least recently used one past cache_size.
+        """
+        key = (self.seed, round(time / self.time_bucket))
+        grid = self._fields.get(key)
+        if grid is not None:
+            self._fields.move_to_end(key)
+            return grid
+        grid = (self.noise3d(self._field_x, self._field_y, time) + 1) / 2
+        grid.flags.writeable = False
+        self._fields[key] = grid
+        if len(self._fields) > self.cache_size:
+            self._fields.popitem(last=False)
+        return grid
+
+    # ---- Scalar noise ----
+
+    def _noise3d_point(self, x, y, z):
+        """Pure-Python createNoise3D() for a single point."""
+        perm = self._perm_list
+        grad = self._grad_list
+        s = (x + y + z) * F3
+        i = math.floor(x + s)
+        j = math.floor(y + s)
+        k = math.floor(z + s)
+        t = (i + j + k) * G3
+        x0 = x - (i - t)
+        y0 = y - (j - t)
+        z0 = z - (k - t)
+        if x0 >= y0:
+            if y0 >= z0:
+                i1, j1, k1, i2, j2, k2 = 1, 0, 0, 1, 1, 0
+            elif x0 >= z0:
+                i1, j1, k1, i2, j2, k2 = 1, 0, 0, 1, 0, 1
+            else:
+                i1, j1, k1, i2, j2, k2 = 0, 0, 1, 1, 0, 1
+        else:
+            if y0 < z0:
+                i1, j1, k1, i2, j2, k2 = 0, 0, 1, 0, 1, 1
+            elif x0 < z0:
+                i1, j1, k1, i2, j2, k2 = 0, 1, 0, 0, 1, 1
+            else:
+                i1, j1, k1, i2, j2, k2 = 0, 1, 0, 1, 1, 0
+        ii = i & 255
+        jj = j & 255
+        kk = k & 255
+
+        n = 0.0
+        t0 = 0.6 - x0 * x0 - y0 * y0 - z0 * z0
+        if t0 >= 0:
+            g = grad[ii + perm[jj + perm[kk]]]
+            t0 *= t0
+            n += t0 * t0 * (g[0] * x0 + g[1] * y0 + g[2] * z0)
+        x1 = x0 - i1 + G3
+        y1 = y0 - j1 + G3
+        z1 = z0 - k1 + G3
+        t1 = 0.6 - x1 * x1 - y1 * y1 - z1 * z1
+        if t1 >= 0:
+            g = grad[ii + i1 + perm[jj + j1 + perm[kk + k1]]]
+            t1 *= t1
+            n += t1 * t1 * (g[0] * x1 + g[1] * y1 + g[2] * z1)
+        x2 = x0 - i2 + 2.0 * G3
+        y2 = y0 - j2 + 2.0 * G3
+        z2 = z0 - k2 + 2.0 * G3
+        t2 = 0.6 - x2 * x2 - y2 * y2 - z2 * z2
+        if t2 >= 0:
+            g = grad[ii + i2 + perm[jj + j2 + perm[kk + k2]]]
+            t2 *= t2
+            n += t2 * t2 * (g[0] * x2 + g[1] * y2 + g[2] * z2)
+        x3 = x0 - 1.0 + 3.0 * G3
+        y3 = y0 - 1.0 + 3.0 * G3
+        z3 = z0 - 1.0 + 3.0 * G3
+        t3 = 0.6 - x3 * x3 - y3 * y3 - z3 * z3
+        if t3 >= 0:
+            g = grad[ii + 1 + perm[jj + 1 + perm[kk + 1]]]
+            t3 *= t3
+            n += t3 * t3 * (g[0] * x3 + g[1] * y3 + g[2] * z3)
+        return 32.0 * n
+
+    def vector_at(self, x, y, time):
+        """getVectorAt() for one position: returns (fx, fy)."""
+        value = (self._noise3d_point(x * VECTOR_SCALE, y * VECTOR_SCALE, time) + 1) / 2
+        angle = value * math.pi * 2
+        return math.cos(angle), math.sin(angle)
@@ -0,0 +1,154 @@
+"""Export the actor of a trained PPO model to ONNX and check parity.
+
+Writes <model>.onnx (obs (B, 6) float32 → logits (B, 3)) for the
+onnxruntime backend (PONG_AI_BACKEND=onnx), then replays a recorded set of
+observations through both the SB3 model and onnxruntime and compares the
+greedy actions.
+
+The observations are recorded once from local PongSim games played by the
+model itself (<model>.parity.npy) and reused on later exports, so parity is
+always checked on the same states the policy actually visits.
+
+The registry's auto-export (PONG_AI_BACKEND=onnx) goes through the same
+export_checked(), so a graph is never served without its parity check.
+
+Usage:
+    python3 export_onnx.py [model_path] [output.onnx]
+
+Exits non-zero when the ONNX graph picks a different action anywhere; the
+mismatched graph is not written.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+from pong_sim import ACTIONS, PongSim
+
+PARITY_STEPS = 2000
+PARITY_FRAME_SKIP = 4  # pong_env.FRAME_SKIP; pong_env (gymnasium) is not in the serving image
+
+
+def _base_path(path):
+    return path[:-len(".zip")] if path.endswith(".zip") else path
+
+
+def export_onnx(model, output):
+    """Write the actor of an SB3 PPO model (or its policy) to output."""
+    import torch
+
+    policy = getattr(model, "policy", model)
+
+    class Actor(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.policy_net = policy.mlp_extractor.policy_net
+            self.action_net = policy.action_net
+
+        def forward(self, obs):
+            return self.action_net(self.policy_net(obs))
+
+    actor = Actor().to("cpu").eval()
+    dummy = torch.zeros(1, policy.observation_space.shape[0], dtype=torch.float32)
+    with torch.no_grad():
+        torch.onnx.export(
+            actor, dummy, output,
+            input_names=["obs"],
+            output_names=["logits"],
+            dynamic_axes={"obs": {0: "batch"}, "logits": {0: "batch"}},
+            opset_version=17,
+        )
+    return output
+
+
+def record_observations(model, steps=PARITY_STEPS, seed=0):
+    """Observations from local games: model on the right, random left paddle.
+
+    Steps PongSim directly, PARITY_FRAME_SKIP ticks per action like
+    PongEnv(backend="local").step_both().
+    """
+    sim = PongSim(seed=seed)
+    rng = np.random.default_rng(seed)
+    sim.reset()
+    recorded = np.empty((steps, 6), dtype=np.float32)
+    for i in range(steps):
+        sim.observation(out=recorded[i])
+        action, _ = model.predict(recorded[i], deterministic=True)
+        right, left = ACTIONS[int(action)], ACTIONS[int(rng.integers(0, 3))]
+        for _ in range(PARITY_FRAME_SKIP):
+            _, done = sim.rl_step(right, left)
+            if done:
+                sim.reset()
+                break
+    return recorded
+
+
+def check_parity(model, policy, observations):
+    """Compare greedy actions of the SB3 model and another backend.
+
+    Returns (number of mismatching observations, max abs logit difference).
+    """
+    import torch
+
+    expected, _ = model.predict(observations, deterministic=True)
+    actions, _ = policy.predict(observations, deterministic=True)
+    with torch.no_grad():
+        obs_tensor = torch.as_tensor(observations, device=model.device)
+        sb3_logits = model.policy.get_distribution(obs_tensor).distribution.logits
+        # Categorical stores normalised logits: compare up to a per-row shift
+        sb3_logits = sb3_logits.cpu().numpy()
+    other = policy.logits(observations)
+    diff = (other - other.max(axis=1, keepdims=True)) - (sb3_logits - sb3_logits.max(axis=1, keepdims=True))
+    return int(np.sum(np.asarray(actions) != np.asarray(expected))), float(np.abs(diff).max())
+
+
+def parity_observations(model, base):
+    """<base>.parity.npy, recorded from the model's own games on first use."""
+    parity_file = f"{base}.parity.npy"
+    if os.path.exists(parity_file):
+        return np.load(parity_file)
+    observations = record_observations(model)
+    np.save(parity_file, observations)
+    print(f"[export] Recorded {len(observations)} parity observations → {parity_file}")
+    return observations
+
+
+def export_checked(model, base, output):
+    """Export the actor and check parity before writing output.
+
+    The graph is written to a temporary file and only moved to output when
+    no greedy action differs from the SB3 model on the parity observations.
+    Returns (mismatches, observation count, max abs logit difference).
+    """
+    from onnx_policy import OnnxPolicy
+
+    tmp = f"{output}.tmp.onnx"
+    export_onnx(model, tmp)
+    try:
+        observations = parity_observations(model, base)
+        mismatches, max_diff = check_parity(model, OnnxPolicy(tmp), observations)
+        if not mismatches:
+            os.replace(tmp, output)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return mismatches, len(observations), max_diff
+
+
+def main():
+    from stable_baselines3 import PPO
+
+    base = _base_path(sys.argv[1] if len(sys.argv) > 1 else "models/best_model")
+    output = sys.argv[2] if len(sys.argv) > 2 else f"{base}.onnx"
+
+    model = PPO.load(base, device="cpu")
+    mismatches, count, max_diff = export_checked(model, base, output)
+    print(f"[export] Parity: {mismatches}/{count} action mismatches, max logit diff {max_diff:.2e}")
+    if mismatches:
+        sys.exit(1)
+    print(f"[export] {base}.zip → {output}")
+
+
+if __name__ == "__main__":
+    main()
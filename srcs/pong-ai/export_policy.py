@@ -0,0 +1,29 @@
+"""Export the actor of a trained PPO model to a torch-free .npz.
+
+The .npz holds the actor MLP weights only; NumpyPolicy.from_npz() loads it
+with NumPy alone, so serving (PONG_AI_BACKEND=numpy) needs no torch.
+
+Usage:
+    python3 export_policy.py [model_path] [output.npz]
+
+model_path defaults to models/best_model (with or without .zip) and the
+output defaults to the same path with a .npz extension.
+"""
+
+import sys
+
+from numpy_policy import NumpyPolicy
+
+
+def export_policy(model_path="models/best_model", output=None):
+    base = model_path[:-len(".zip")] if model_path.endswith(".zip") else model_path
+    output = output or f"{base}.npz"
+    policy = NumpyPolicy.from_zip(base)
+    policy.save_npz(output)
+    shapes = " → ".join(str(w.shape[0]) for w in policy.weights) + f" → {policy.weights[-1].shape[1]}"
+    print(f"[export] {base}.zip → {output} ({shapes}, {policy.activation}, {policy.nbytes} bytes)")
+    return output
+
+
+if __name__ == "__main__":
+    export_policy(*sys.argv[1:3])
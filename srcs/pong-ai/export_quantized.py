@@ -0,0 +1,108 @@
+"""Export an int8-quantized actor and report its accuracy.
+
+Writes <model>.int8.npz (QuantizedPolicy, served with PONG_AI_BACKEND=int8)
+from the float actor, then compares the greedy actions of both on a
+held-out observation set. The set is recorded once from local PongSim games
+played by the float model with a different seed than export_onnx.py's parity
+frames (<model>.heldout.npy), or read from a given .npy.
+
+Usage:
+    python3 export_quantized.py [model_path] [output.int8.npz] [frames.npy]
+
+Exits non-zero when more than MAX_MISMATCH of the frames change action;
+the rejected actor is not written. The registry's auto-export
+(PONG_AI_BACKEND=int8) goes through the same export_checked().
+"""
+
+import os
+import sys
+
+import numpy as np
+
+from quantized_policy import QuantizedPolicy
+
+HELDOUT_STEPS = 5000
+HELDOUT_SEED = 1
+MAX_MISMATCH = 0.05
+
+
+def export_quantized(policy, output):
+    """Quantize a float NumpyPolicy and write it to output."""
+    quantized = QuantizedPolicy.from_policy(policy)
+    quantized.save_npz(output)
+    return quantized
+
+
+def accuracy_report(policy, quantized, observations):
+    """Agreement of the int8 actor with the float one on observations.
+
+    Returns a dict: mismatches, per_action ({float action: (frames, mismatches)}),
+    max_logit_diff (up to a per-row shift) and confident_mismatches (where
+    the float model's best logit led the runner-up by more than 0.1).
+    """
+    expected_logits = policy.logits(observations)
+    logits = quantized.logits(observations)
+    expected = expected_logits.argmax(axis=1)
+    wrong = logits.argmax(axis=1) != expected
+    top2 = np.sort(expected_logits, axis=1)[:, -2:]
+    diff = (logits - logits.max(axis=1, keepdims=True)) - (expected_logits - expected_logits.max(axis=1, keepdims=True))
+    return {
+        "mismatches": int(wrong.sum()),
+        "per_action": {int(a): (int(np.sum(expected == a)), int(np.sum(wrong[expected == a])))
+                       for a in np.unique(expected)},
+        "max_logit_diff": float(np.abs(diff).max()),
+        "confident_mismatches": int(np.sum(wrong & (top2[:, 1] - top2[:, 0] > 0.1))),
+    }
+
+
+def heldout_observations(policy, frames):
+    """Held-out frames from the .npy at frames, recorded from the float model's games on first use."""
+    if os.path.exists(frames):
+        return np.load(frames)
+    from export_onnx import record_observations
+    observations = record_observations(policy, steps=HELDOUT_STEPS, seed=HELDOUT_SEED)
+    np.save(frames, observations)
+    print(f"[export] Recorded {len(observations)} held-out frames → {frames}")
+    return observations
+
+
+def export_checked(policy, output, frames):
+    """Quantize policy and check it before writing output.
+
+    The actor is written to a temporary file and only moved to output when
+    at most MAX_MISMATCH of the held-out frames change action.
+    Returns (quantized policy, accuracy_report(), frame count).
+    """
+    quantized = QuantizedPolicy.from_policy(policy)
+    observations = heldout_observations(policy, frames)
+    report = accuracy_report(policy, quantized, observations)
+    if report["mismatches"] <= MAX_MISMATCH * len(observations):
+        tmp = f"{output}.tmp.npz"
+        quantized.save_npz(tmp)
+        os.replace(tmp, output)
+    return quantized, report, len(observations)
+
+
+def main():
+    from model_registry import _base_path, load_numpy_policy
+
+    base = _base_path(sys.argv[1] if len(sys.argv) > 1 else "models/best_model")
+    output = sys.argv[2] if len(sys.argv) > 2 else f"{base}.int8.npz"
+    frames = sys.argv[3] if len(sys.argv) > 3 else f"{base}.heldout.npy"
+
+    policy = load_numpy_policy(base)
+    quantized, report, count = export_checked(policy, output, frames)
+    rate = report["mismatches"] / count
+    print(f"[export] Accuracy: {report['mismatches']}/{count} action mismatches ({rate:.1%}), "
+          f"{report['confident_mismatches']} with a float logit margin > 0.1, "
+          f"max logit diff {report['max_logit_diff']:.3f}")
+    for action, (total, wrong) in sorted(report["per_action"].items()):
+        print(f"[export]   float action {action}: {wrong}/{total} differ")
+    if rate > MAX_MISMATCH:
+        sys.exit(1)
+    print(f"[export] {base} → {output} (int8, {quantized.export_nbytes} bytes vs {policy.nbytes} float32, "
+          f"file {os.path.getsize(output)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
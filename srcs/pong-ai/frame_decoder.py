@@ -0,0 +1,60 @@
+"""Fast decoding of game-service WebSocket messages.
+
+Every "state" frame carries the whole cosmicBackground grid (80x60 floats,
+~90 KB of JSON) next to the handful of fields the AI actually reads.
+json.loads() on the full frame builds the 4800-element nested list each
+time, ~1.5 ms per frame.
+
+decode_message() cuts the grid out of the raw text before parsing: it finds
+the "cosmicBackground" key, skips its value up to the closing "]]" and
+json.loads() only the remaining few hundred bytes. The grid is a list of
+lists of numbers, so it holds no strings or deeper nesting: the closing
+"]]" is found with rfind() from the end of the frame (the grid is the last
+field of getState()) and confirmed by the absence of any '"' in between,
+both C-level scans. A forward find("]]") stalls on every "],[" row
+boundary and costs ~100 us on a full grid. The result is the same dict as
+json.loads() with cosmicBackground set to None. Anything unexpected falls back to a full json.loads().
+"""
+
+import json
+
+_KEY = '"cosmicBackground":'
+
+
+def _skip_grid(raw, start):
+    """Index just past the grid value starting at raw[start], or -1."""
+    if raw.startswith("null", start):
+        return start + 4
+    if raw.startswith("[]", start):
+        return start + 2
+    if raw.startswith("[[", start):
+        end = raw.rfind("]]")
+        if end < start or raw.find('"', start, end) >= 0:
+            # Something follows the grid: take the slow forward scan
+            end = raw.find("]]", start)
+        return -1 if end < 0 else end + 2
+    return -1
+
+
+def decode_message(raw):
+    """json.loads() for game-service messages, without the cosmicBackground grid."""
+    if isinstance(raw, (bytes, bytearray)):
+        raw = raw.decode()
+    key = raw.find(_KEY)
+    if key < 0:
+        return json.loads(raw)
+
+    start = key + len(_KEY)
+    while raw[start:start + 1].isspace():
+        start += 1
+    end = _skip_grid(raw, start)
+    if end > 0:
+        try:
+            return json.loads(f"{raw[:start]}null{raw[end:]}")
+        except ValueError:
+            pass
+    message = json.loads(raw)
+    data = message.get("data")
+    if isinstance(data, dict) and "cosmicBackground" in data:
+        data["cosmicBackground"] = None
+    return message
@@ -0,0 +1,91 @@
+"""Thread pool that keeps policy evaluation off the server's event loop.
+
+All AI sessions of a uvicorn worker share one asyncio loop. A forward pass
+run inline blocks recv() for every other session until it returns, so a
+slow one (SB3/torch, a large batch) shows up as lag in all games. Policy
+evaluation is therefore submitted to a small dedicated ThreadPoolExecutor
+and the loop only does I/O.
+
+The pool is bounded (PONG_AI_INFERENCE_THREADS, default 2) and torch's
+intra-op pool is pinned to PONG_AI_TORCH_THREADS (default 1) so the
+inference threads do not oversubscribe the CPU. torch is only configured
+when the serving backend already imported it.
+
+queue_delay records, per decision, the time from the frame being received
+to its forward pass starting: the cost of waiting for the loop, the flush
+window and a free inference thread.
+"""
+
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+INFERENCE_THREADS = int(os.getenv("PONG_AI_INFERENCE_THREADS", "2"))
+TORCH_THREADS = int(os.getenv("PONG_AI_TORCH_THREADS", "1"))
+
+
+class DelayStats:
+    """Thread-safe ring buffer of the most recent delays, in seconds."""
+
+    def __init__(self, size=4096):
+        self._samples = np.zeros(size, dtype=np.float64)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self._samples[self._count % len(self._samples)] = seconds
+            self._count += 1
+
+    def reset(self):
+        with self._lock:
+            self._count = 0
+
+    def summary(self):
+        with self._lock:
+            samples = self._samples[:min(self._count, len(self._samples))].copy()
+            count = self._count
+        if not count:
+            return {"count": 0, "mean_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+        return {
+            "count": count,
+            "mean_ms": round(float(samples.mean()) * 1e3, 3),
+            "p99_ms": round(float(np.percentile(samples, 99)) * 1e3, 3),
+            "max_ms": round(float(samples.max()) * 1e3, 3),
+        }
+
+
+queue_delay = DelayStats()
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _pin_torch_threads():
+    torch = sys.modules.get("torch")
+    if torch is not None and torch.get_num_threads() != TORCH_THREADS:
+        torch.set_num_threads(TORCH_THREADS)
+
+
+def get_executor():
+    """The process-wide inference pool, created on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _pin_torch_threads()
+            _executor = ThreadPoolExecutor(
+                max_workers=INFERENCE_THREADS,
+                thread_name_prefix="inference",
+                initializer=_pin_torch_threads,
+            )
+        return _executor
+
+
+def timed(fn, received_at, *args):
+    """Run fn(*args), first recording how long the frame waited (received_at is perf_counter)."""
+    queue_delay.record(time.perf_counter() - received_at)
+    return fn(*args)
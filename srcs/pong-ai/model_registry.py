@@ -0,0 +1,293 @@
+"""Process-wide registry of loaded policies.
+
+Every AIPlayer used to call PPO.load() on its own, paying a full unzip and
+policy + optimizer rebuild per game and keeping one copy of the model per
+session in memory. The registry loads each model once and hands the same
+instance to every caller.
+
+Entries are keyed on the resolved model file and its mtime: overwriting
+best_model.zip (a new training run) makes the next get() load the new file
+and drop the stale entry, while unchanged files are never reloaded.
+
+Several models (the difficulty zoo served by pong_server) share one memory
+budget, PONG_AI_MODEL_MEMORY_MB: once the resident models exceed it the
+least recently used ones are dropped and reloaded on their next get().
+Sessions already playing keep their reference, so eviction never
+interrupts a game.
+
+PONG_AI_BACKEND picks what get() loads by default: "sb3" (PPO.load),
+"numpy" (the torch-free NumpyPolicy export, see export_policy.py), "onnx"
+(onnxruntime on the export_onnx.py graph), "table" (the memory-mapped
+action table of compile_policy_table.py) or "int8" (the quantized actor of
+export_quantized.py).
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+INFERENCE_BACKEND = os.getenv("PONG_AI_BACKEND", "sb3")  # sb3 | numpy | onnx | table | int8
+
+# Files a backend can serve from, preferred first
+MODEL_EXTENSIONS = {
+    "sb3": (".zip",),
+    "numpy": (".zip", ".npz"),
+    "onnx": (".zip", ".onnx"),
+    "table": (".zip", ".table.npy"),
+    "int8": (".zip", ".int8.npz"),
+}
+if INFERENCE_BACKEND not in MODEL_EXTENSIONS:
+    raise ValueError(f"Unknown PONG_AI_BACKEND: {INFERENCE_BACKEND!r}")
+
+MODEL_MEMORY_MB = float(os.getenv("PONG_AI_MODEL_MEMORY_MB", "256"))
+
+
+def _base_path(path):
+    for ext in (".zip", ".int8.npz", ".npz", ".onnx", ".table.npy"):
+        if path.endswith(ext):
+            return path[:-len(ext)]
+    return path
+
+
+def load_numpy_policy(path):
+    """NumpyPolicy for a model path, from its .npz export.
+
+    The .npz is (re)exported from the .zip first when it is missing or older
+    than the .zip; that step needs torch, loading the .npz does not.
+    """
+    from numpy_policy import NumpyPolicy
+
+    base = _base_path(path)
+    npz_file, zip_file = f"{base}.npz", f"{base}.zip"
+    if os.path.exists(zip_file) and (
+        not os.path.exists(npz_file) or os.path.getmtime(npz_file) < os.path.getmtime(zip_file)
+    ):
+        from export_policy import export_policy
+        export_policy(base, npz_file)
+    return NumpyPolicy.from_npz(npz_file)
+
+
+def load_onnx_policy(path):
+    """OnnxPolicy for a model path, exporting the .onnx when missing or stale.
+
+    The export is parity-checked against the SB3 model (export_onnx.export_checked)
+    and refused with ValueError when any greedy action differs.
+    """
+    from onnx_policy import OnnxPolicy
+
+    base = _base_path(path)
+    onnx_file, zip_file = f"{base}.onnx", f"{base}.zip"
+    if os.path.exists(zip_file) and (
+        not os.path.exists(onnx_file) or os.path.getmtime(onnx_file) < os.path.getmtime(zip_file)
+    ):
+        from stable_baselines3 import PPO
+        from export_onnx import export_checked
+        mismatches, count, max_diff = export_checked(PPO.load(base, device="cpu"), base, onnx_file)
+        if mismatches:
+            # Refuse to serve a graph that plays differently from the trained model
+            raise ValueError(f"ONNX export of {zip_file} failed parity: {mismatches}/{count} "
+                             f"action mismatches (max logit diff {max_diff:.2e})")
+        print(f"[registry] Exported {zip_file} → {onnx_file} (parity {count} frames, "
+              f"max logit diff {max_diff:.2e})")
+    return OnnxPolicy(onnx_file)
+
+
+def load_policy_table(path):
+    """Memory-mapped PolicyTable for a model path, compiling the table when missing or stale.
+
+    Compiling evaluates the policy over the whole grid (about a minute).
+    When the .zip is there the table is checked against the float actor on
+    the parity frames (export_onnx.parity_observations); past
+    compile_policy_table.MAX_DISAGREEMENT the float NumpyPolicy is served instead.
+    """
+    from policy_table import PolicyTable
+
+    base = _base_path(path)
+    table_file, zip_file = f"{base}.table.npy", f"{base}.zip"
+    if not os.path.exists(zip_file):
+        return PolicyTable.from_file(table_file)
+    from compile_policy_table import MAX_DISAGREEMENT, compile_table, disagreement
+    from export_onnx import parity_observations
+    policy = load_numpy_policy(base)
+    if not os.path.exists(table_file) or os.path.getmtime(table_file) < os.path.getmtime(zip_file):
+        compile_table(policy, table_file)
+        print(f"[registry] Compiled {zip_file} → {table_file}")
+    table = PolicyTable.from_file(table_file)
+    observations = parity_observations(policy, base)
+    mismatches, _ = disagreement(policy, table, observations)
+    rate = mismatches / len(observations)
+    if rate > MAX_DISAGREEMENT:
+        # Too lossy to stand in for the model: serve the float actor
+        print(f"[registry] {table_file} disagrees with the model on {rate:.1%} of frames "
+              f"(max {MAX_DISAGREEMENT:.0%}), serving the float actor")
+        return policy
+    return table
+
+
+def load_quantized_policy(path):
+    """QuantizedPolicy for a model path, quantizing the float actor when the .int8.npz is missing or stale.
+
+    The quantized actor is checked against the float one on held-out frames
+    (export_quantized.export_checked) and refused with ValueError when more
+    than MAX_MISMATCH of them change action.
+    """
+    from quantized_policy import QuantizedPolicy
+
+    base = _base_path(path)
+    int8_file, zip_file = f"{base}.int8.npz", f"{base}.zip"
+    if os.path.exists(zip_file) and (
+        not os.path.exists(int8_file) or os.path.getmtime(int8_file) < os.path.getmtime(zip_file)
+    ):
+        from export_quantized import MAX_MISMATCH, export_checked
+        _, report, count = export_checked(load_numpy_policy(base), int8_file, f"{base}.heldout.npy")
+        if report["mismatches"] > MAX_MISMATCH * count:
+            # Refuse to serve an actor that plays noticeably differently from the trained model
+            raise ValueError(f"int8 export of {zip_file} failed its accuracy check: "
+                             f"{report['mismatches']}/{count} action mismatches (max {MAX_MISMATCH:.0%})")
+        print(f"[registry] Quantized {zip_file} → {int8_file} ({report['mismatches']}/{count} "
+              f"held-out action mismatches)")
+    return QuantizedPolicy.from_npz(int8_file)
+
+
+def load_model(path):
+    """Load path with the PONG_AI_BACKEND loader, bypassing the registry."""
+    if INFERENCE_BACKEND == "numpy":
+        return load_numpy_policy(path)
+    if INFERENCE_BACKEND == "onnx":
+        return load_onnx_policy(path)
+    if INFERENCE_BACKEND == "table":
+        return load_policy_table(path)
+    if INFERENCE_BACKEND == "int8":
+        return load_quantized_policy(path)
+    from stable_baselines3 import PPO
+    return PPO.load(path)
+
+
+def model_nbytes(model, path=None):
+    """Approximate resident size of a loaded model.
+
+    NumPy backends report nbytes; SB3 models are sized from their policy
+    parameters; anything else falls back to the size of its file.
+    """
+    nbytes = getattr(model, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    try:
+        return sum(p.numel() * p.element_size() for p in model.policy.parameters())
+    except (AttributeError, TypeError):
+        pass
+    try:
+        return os.path.getsize(path)
+    except (OSError, TypeError):
+        return 0
+
+
+class ModelRegistry:
+    def __init__(self, loader=None, memory_budget=MODEL_MEMORY_MB * 2**20):
+        self._loader = loader or load_model
+        self.memory_budget = memory_budget
+        self._models = OrderedDict()  # (model file, mtime) → model, least recently used first
+        self._sizes = {}  # (model file, mtime) → model_nbytes()
+        self._loading = {}  # (model file, mtime) → Future of the load in flight
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(path):
+        base = os.path.abspath(_base_path(path))
+        for ext in MODEL_EXTENSIONS.get(INFERENCE_BACKEND, (".zip",)):
+            try:
+                return f"{base}{ext}", os.path.getmtime(f"{base}{ext}")
+            except OSError:
+                continue
+        return f"{base}.zip", None
+
+    def get(self, path, loader=None):
+        """Return the model saved at path, loading it on first use.
+
+        Load errors propagate and are not cached. A file whose mtime cannot
+        be read has no stable identity and is loaded without caching.
+
+        The load runs outside the registry lock, which only guards the
+        bookkeeping: resident() and install() on the event loop never wait
+        for a load (a table compile can take minutes). Concurrent gets of
+        the same file wait for the one load in flight.
+        """
+        key = self._key(path)
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._models.move_to_end(key)
+                return model
+            in_flight = self._loading.get(key)
+            if in_flight is None:
+                in_flight = self._loading[key] = Future()
+                owner = True
+            else:
+                owner = False
+        if not owner:
+            return in_flight.result()
+        try:
+            model = (loader or self._loader)(path)
+        except BaseException as e:
+            with self._lock:
+                del self._loading[key]
+            in_flight.set_exception(e)
+            raise
+        with self._lock:
+            del self._loading[key]
+            if key[1] is not None:
+                self._store(key, model)
+        in_flight.set_result(model)
+        return model
+
+    def version(self, path):
+        """(model file, mtime) identifying the file currently saved at path."""
+        return self._key(path)
+
+    def install(self, key, model):
+        """Serve an already loaded model for key (a version()), replacing older versions."""
+        with self._lock:
+            self._store(key, model)
+
+    def _store(self, key, model):
+        # Drop older versions of the same file
+        for stale in [k for k in self._models if k[0] == key[0]]:
+            self._drop(stale)
+        self._models[key] = model
+        self._sizes[key] = model_nbytes(model, key[0])
+        self._evict(keep=key)
+
+    def _drop(self, key):
+        del self._models[key]
+        del self._sizes[key]
+
+    def _evict(self, keep):
+        """Drop least recently used models until the budget holds (never `keep`)."""
+        while sum(self._sizes.values()) > self.memory_budget and len(self._models) > 1:
+            oldest = next(k for k in self._models if k != keep)
+            print(f"[registry] Evicting {oldest[0]} ({self._sizes[oldest]} bytes) over the memory budget")
+            self._drop(oldest)
+
+    def loaded(self):
+        """(model file, mtime) of every resident model."""
+        with self._lock:
+            return list(self._models)
+
+    def resident(self):
+        """Resident models, most recently used last: [{"path", "bytes"}]."""
+        with self._lock:
+            return [{"path": key[0], "bytes": self._sizes[key]} for key in self._models]
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+            self._sizes.clear()
+
+
+registry = ModelRegistry()
+
+
+def get_model(path, loader=None):
+    """Shared model for path from the process-wide registry."""
+    return registry.get(path, loader)
@@ -0,0 +1,141 @@
+"""Hot reload of the served model, without restarting pong_server.
+
+Deploying a new best_model.zip used to need a restart, killing every game
+in progress. ModelReloader polls the model file's mtime every
+PONG_AI_RELOAD_INTERVAL seconds. A new version is loaded off the event
+loop once its mtime has held for one poll, so a copy still being written
+is not picked up. It is then warmed up with a batch of dummy observations
+and validated, so its first game pays no lazy initialisation. Only then is
+it swapped in: installed in the model registry and published as
+reloader.model in one step on the loop. A version that fails to load or
+validate is logged and skipped, and the old model keeps serving.
+
+A service that started without a model (missing file, or one that failed
+to load or warm up) watches the file all the same: the first version that
+validates is installed as version 1, with no restart.
+
+Running sessions hold the model they started with. PONG_AI_RELOAD_SWITCH
+picks when they move to a new one: "game" (default) keeps the old weights
+until the game ends, "point" switches at the next point (a score change
+or a pause), never during a rally. New games always get the current
+model.
+"""
+
+import asyncio
+import os
+import time
+
+import numpy as np
+
+from model_registry import registry as default_registry
+from policy_table import BOUNDS
+
+RELOAD_INTERVAL = float(os.getenv("PONG_AI_RELOAD_INTERVAL", "5"))  # seconds, 0 disables
+RELOAD_SWITCH = os.getenv("PONG_AI_RELOAD_SWITCH", "game")  # game | point
+WARMUP_BATCH = 64
+
+if RELOAD_SWITCH not in ("game", "point"):
+    raise ValueError(f"Unknown PONG_AI_RELOAD_SWITCH: {RELOAD_SWITCH!r}")
+
+
+def warm_up(model, batch=WARMUP_BATCH, action_count=3):
+    """Run batched and single predicts on dummy observations; raise ValueError if the actions are invalid."""
+    low, high = np.array(BOUNDS, dtype=np.float32).T
+    obs = np.random.default_rng(0).uniform(low, high, size=(batch, len(BOUNDS))).astype(np.float32)
+    actions, _ = model.predict(obs, deterministic=True)
+    actions = np.asarray(actions)
+    if actions.shape != (batch,) or not np.all((actions >= 0) & (actions < action_count)):
+        raise ValueError(f"Invalid warm-up actions: shape {actions.shape}, values {np.unique(actions)[:8]}")
+    act = getattr(model, "act", None)
+    if act is not None and act(obs[0]) not in range(action_count):
+        raise ValueError(f"Invalid warm-up action from act(): {act(obs[0])!r}")
+
+
+class ModelReloader:
+    def __init__(self, path, model, loader, make_scheduler=None, interval=RELOAD_INTERVAL,
+                 switch=RELOAD_SWITCH, registry=None):
+        """
+        path:           model base path to watch (as passed to the registry).
+        model:          the model currently served from path, None if there is none
+                        yet (the file present now failed and is not retried).
+        loader:         loads a model from path (run on a worker thread).
+        make_scheduler: optional model → BatchInferenceScheduler, published as .scheduler.
+        """
+        self.path = path
+        self.loader = loader
+        self.make_scheduler = make_scheduler
+        self.interval = interval
+        self.switch = switch
+        self.registry = registry or default_registry
+        self.model = model
+        self.scheduler = make_scheduler(model) if make_scheduler and model is not None else None
+        self.version = 1 if model is not None else 0
+        self.last_error = None
+        self._current = self.registry.version(path)
+        self._pending = None  # changed file identity waiting to settle for one poll
+        self._failed = None  # identity that failed to load, not retried
+        if model is None:
+            self._current, self._failed = None, self._current
+        self._task = None
+
+    def start(self):
+        if self.interval > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.get_running_loop().create_task(self._watch())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except Exception as e:
+                print(f"[reload] Watch error: {e}", flush=True)
+
+    def _changed(self):
+        """File identity to load now, or None (unchanged, missing, failed or still settling)."""
+        key = self.registry.version(self.path)
+        if key[1] is None or key == self._current or key == self._failed:
+            self._pending = None
+            return None
+        if key != self._pending:
+            self._pending = key
+            return None
+        return key
+
+    def _load(self):
+        started = time.perf_counter()
+        model = self.loader(self.path)
+        loaded = time.perf_counter()
+        warm_up(model)
+        return model, loaded - started, time.perf_counter() - loaded
+
+    async def check(self):
+        """One poll: load, warm up and swap in a changed model file. True if swapped."""
+        key = self._changed()
+        if key is None:
+            return False
+        self._pending = None
+        try:
+            model, load_time, warmup_time = await asyncio.to_thread(self._load)
+        except Exception as e:
+            self._failed = key
+            self.last_error = f"{key[0]}: {e}"
+            print(f"[reload] Keeping version {self.version}, new {key[0]} rejected: {e}", flush=True)
+            return False
+        # Swap: installed and published together, between two loop iterations
+        self.registry.install(key, model)
+        self.scheduler = self.make_scheduler(model) if self.make_scheduler else None
+        self.model = model
+        self._current = key
+        self.version += 1
+        self.last_error = None
+        print(f"[reload] Model version {self.version} live: {key[0]} "
+              f"(load {load_time * 1e3:.0f} ms, warm-up {warmup_time * 1e3:.0f} ms)", flush=True)
+        return True
+
+    def stats(self):
+        return {"version": self.version, "switch": self.switch, "last_error": self.last_error}
@@ -0,0 +1,161 @@
+"""Torch-free forward pass of the PPO actor.
+
+The pong policy is a small MLP (obs → 64 → 64 → 3 logits, tanh). Running it
+through SB3/torch costs a few hundred microseconds of dispatch per call, far
+more than the math itself. NumpyPolicy holds copies of the actor weights as
+NumPy arrays and exposes the same predict() signature as an SB3 model, so
+it can stand in for one wherever only actions are needed (self-play
+opponents, inference).
+
+A snapshot taken with NumpyPolicy.from_sb3() is truly frozen: later updates
+of the learner do not leak into it, and it never touches the learner's
+autograd state.
+
+For serving, export_policy.py writes the weights of models/best_model.zip to
+a flat .npz that from_npz() reads without torch; act() then runs the greedy
+single-observation forward pass in preallocated buffers.
+"""
+
+import io
+import json
+import re
+import threading
+import zipfile
+
+import numpy as np
+
+ACTIVATIONS = {
+    "Tanh": np.tanh,
+    "ReLU": lambda x: np.maximum(x, 0),
+}
+
+# In-place variants for act(): (x, out) → out
+_INPLACE = {
+    "Tanh": lambda x, out: np.tanh(x, out=out),
+    "ReLU": lambda x, out: np.maximum(x, 0, out=out),
+}
+
+
+class NumpyPolicy:
+    def __init__(self, weights, biases, activation="Tanh", seed=None):
+        """
+        weights/biases: per-layer arrays, hidden layers first, action head
+                        last; weights are (in, out) so a layer is x @ W + b.
+        activation:     hidden-layer activation, "Tanh" (SB3 default) or "ReLU".
+        """
+        if activation not in ACTIVATIONS:
+            raise ValueError(f"Unsupported activation: {activation!r}")
+        self.weights = [np.ascontiguousarray(w, dtype=np.float32) for w in weights]
+        self.biases = [np.ascontiguousarray(b, dtype=np.float32) for b in biases]
+        self.activation = activation
+        self._act = ACTIVATIONS[activation]
+        self._act_inplace = _INPLACE[activation]
+        self._rng = np.random.default_rng(seed)
+        # act() scratch, per thread: one input row and one output row per layer
+        self._local = threading.local()
+
+    def _scratch(self):
+        scratch = getattr(self._local, "scratch", None)
+        if scratch is None:
+            scratch = self._local.scratch = (
+                np.zeros(self.weights[0].shape[0], dtype=np.float32),
+                [np.zeros(w.shape[1], dtype=np.float32) for w in self.weights],
+            )
+        return scratch
+
+    @classmethod
+    def from_sb3(cls, model, seed=None):
+        """Copy the actor weights out of an SB3 PPO model (or its policy)."""
+        import torch
+
+        policy = getattr(model, "policy", model)
+        layers = [m for m in policy.mlp_extractor.policy_net if isinstance(m, torch.nn.Linear)]
+        layers.append(policy.action_net)
+        with torch.no_grad():
+            weights = [layer.weight.detach().cpu().numpy().T.copy() for layer in layers]
+            biases = [layer.bias.detach().cpu().numpy().copy() for layer in layers]
+        return cls(weights, biases, activation=policy.activation_fn.__name__, seed=seed)
+
+    @classmethod
+    def from_zip(cls, path, seed=None):
+        """Read the actor weights straight from an SB3 .zip save.
+
+        Only policy.pth is decoded, so this skips PPO.load()'s env checks,
+        optimizer and policy rebuild.
+        """
+        import torch
+
+        if not path.endswith(".zip"):
+            path = f"{path}.zip"
+        with zipfile.ZipFile(path) as archive:
+            state = torch.load(io.BytesIO(archive.read("policy.pth")), map_location="cpu")
+            policy_kwargs = json.dumps(json.loads(archive.read("data")).get("policy_kwargs", {}))
+
+        layer_key = re.compile(r"mlp_extractor\.policy_net\.(\d+)\.weight")
+        hidden = sorted(int(m.group(1)) for m in map(layer_key.fullmatch, state) if m)
+        names = [f"mlp_extractor.policy_net.{i}" for i in hidden] + ["action_net"]
+        weights = [state[f"{name}.weight"].numpy().T.copy() for name in names]
+        biases = [state[f"{name}.bias"].numpy().copy() for name in names]
+        activation = "ReLU" if "ReLU" in policy_kwargs else "Tanh"
+        return cls(weights, biases, activation=activation, seed=seed)
+
+    @classmethod
+    def from_npz(cls, path, seed=None):
+        """Load weights written by save_npz() — NumPy only, no torch."""
+        with np.load(path) as data:
+            n = int(data["num_layers"])
+            weights = [data[f"w{i}"] for i in range(n)]
+            biases = [data[f"b{i}"] for i in range(n)]
+            activation = str(data["activation"])
+        return cls(weights, biases, activation=activation, seed=seed)
+
+    def save_npz(self, path):
+        arrays = {f"w{i}": w for i, w in enumerate(self.weights)}
+        arrays.update({f"b{i}": b for i, b in enumerate(self.biases)})
+        np.savez(path, num_layers=len(self.weights), activation=self.activation, **arrays)
+
+    @property
+    def nbytes(self):
+        return sum(w.nbytes + b.nbytes for w, b in zip(self.weights, self.biases))
+
+    def logits(self, obs):
+        """Action logits for an (N, obs_dim) batch."""
+        x = obs
+        last = len(self.weights) - 1
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            x = x @ w + b
+            if i < last:
+                x = self._act(x)
+        return x
+
+    def predict(self, observation, state=None, episode_start=None, deterministic=False):
+        """Same contract as BaseAlgorithm.predict(): returns (actions, None).
+
+        A single observation gives a 0-d action array, a batch an (N,) array.
+        Stochastic actions sample the categorical distribution (Gumbel-max).
+        """
+        obs = np.asarray(observation, dtype=np.float32)
+        single = obs.ndim == 1
+        logits = self.logits(obs.reshape(1, -1) if single else obs)
+        if not deterministic:
+            logits = logits - np.log(-np.log(self._rng.random(logits.shape)))
+        actions = logits.argmax(axis=1)
+        return (actions[0] if single else actions), state
+
+    def act(self, observation):
+        """Greedy action for one observation, as a plain int.
+
+        Equivalent to predict(observation, deterministic=True) but writes
+        every layer into preallocated per-thread buffers, so a call
+        allocates nothing and inference threads can share one instance.
+        """
+        x, bufs = self._scratch()
+        x[:] = observation
+        last = len(self.weights) - 1
+        for i, (w, b, out) in enumerate(zip(self.weights, self.biases, bufs)):
+            np.dot(x, w, out=out)
+            out += b
+            if i < last:
+                self._act_inplace(out, out)
+            x = out
+        return int(x.argmax())
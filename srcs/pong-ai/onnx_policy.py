@@ -0,0 +1,55 @@
+"""onnxruntime serving backend for the PPO actor (PONG_AI_BACKEND=onnx).
+
+OnnxPolicy runs the actor graph written by export_onnx.py on the CPU
+execution provider and exposes the same predict() / act() interface as
+NumpyPolicy, so AIPlayer and AIService do not care which backend they get.
+
+Intra-op threads default to PONG_AI_ONNX_THREADS (1): the actor is tiny, so
+extra threads only add synchronisation, and the server runs many sessions
+side by side.
+"""
+
+import os
+import threading
+
+import numpy as np
+
+
+class OnnxPolicy:
+    def __init__(self, path, intra_op_threads=None):
+        import onnxruntime as ort
+
+        if intra_op_threads is None:
+            intra_op_threads = int(os.getenv("PONG_AI_ONNX_THREADS", "1"))
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = intra_op_threads
+        options.inter_op_num_threads = 1
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        self.path = path
+        self.intra_op_threads = intra_op_threads
+        self.session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        self._input = self.session.get_inputs()[0].name
+        self._obs_dim = self.session.get_inputs()[0].shape[1]
+        self._local = threading.local()  # per-thread act() input row
+
+    def logits(self, obs):
+        """Action logits for an (N, obs_dim) batch."""
+        return self.session.run(None, {self._input: np.asarray(obs, dtype=np.float32)})[0]
+
+    def predict(self, observation, state=None, episode_start=None, deterministic=True):
+        """Greedy actions with the BaseAlgorithm.predict() return shape.
+
+        The exported graph only has the logits, so serving is deterministic.
+        """
+        obs = np.asarray(observation, dtype=np.float32)
+        single = obs.ndim == 1
+        actions = self.logits(obs.reshape(1, -1) if single else obs).argmax(axis=1)
+        return (actions[0] if single else actions), state
+
+    def act(self, observation):
+        """Greedy action for one observation, as a plain int (thread-safe)."""
+        obs = getattr(self._local, "obs", None)
+        if obs is None:
+            obs = self._local.obs = np.zeros((1, self._obs_dim), dtype=np.float32)
+        obs[0] = observation
+        return int(self.session.run(None, {self._input: obs})[0].argmax())
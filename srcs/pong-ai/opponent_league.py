@@ -0,0 +1,134 @@
+"""Opponent league for self-play.
+
+Instead of one opponent replaced every OPPONENT_UPDATE_FREQ steps, the
+league keeps the most recent checkpoints of models/checkpoints/ (plus the
+latest live snapshot) as NumpyPolicy objects and gives every game its own
+opponent, sampled at the start of each episode.
+
+Sampling is weighted by how often each opponent beats the agent (with a
+uniform prior), so the agent keeps playing the opponents it still loses to
+instead of forgetting how to beat older strategies.
+
+The pool is capped by both a policy count and a memory budget; the least
+recently sampled policies are evicted first. Policies are loaded in
+refresh(), off the hot path: predict() only runs NumPy forward passes,
+one per opponent currently in play, on the slices of the batch it drives.
+
+The league plugs into the vectorized envs as their opponent_model: they
+call predict() on the mirrored batch as usual and report finished games
+through on_episodes_end().
+"""
+
+import glob
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from numpy_policy import NumpyPolicy
+
+
+class OpponentLeague:
+    def __init__(self, checkpoint_dir="models/checkpoints/", max_policies=8,
+                 memory_budget=16 * 1024 * 1024, seed=None):
+        """
+        max_policies:  number of checkpoints kept in memory.
+        memory_budget: cap on the summed NumpyPolicy weight size, in bytes.
+        """
+        self.checkpoint_dir = checkpoint_dir
+        self.max_policies = max_policies
+        self.memory_budget = memory_budget
+        self._rng = np.random.default_rng(seed)
+        self._policies = OrderedDict()  # name → NumpyPolicy, least recently used first
+        self._stats = {}                # name → [games, opponent wins]
+        self._slots = np.empty(0, dtype=object)  # per game: name of its current opponent
+
+    def __len__(self):
+        return len(self._policies)
+
+    @property
+    def names(self):
+        return list(self._policies)
+
+    @property
+    def nbytes(self):
+        return sum(policy.nbytes for policy in self._policies.values())
+
+    # ---- pool management (off the hot path) ----
+
+    def add(self, name, policy):
+        """Insert or replace a policy, then evict down to the limits."""
+        self._policies[name] = policy
+        self._policies.move_to_end(name)
+        self._stats[name] = [0, 0]
+        self._evict()
+        # Games that started while the pool was empty get their first opponent
+        self._resample([i for i, slot in enumerate(self._slots) if slot is None])
+
+    def refresh(self):
+        """Load the newest checkpoints that are not in the pool yet."""
+        paths = sorted(glob.glob(os.path.join(self.checkpoint_dir, "*.zip")), key=os.path.getmtime)
+        for path in paths[-self.max_policies:]:
+            name = os.path.splitext(os.path.basename(path))[0]
+            if name not in self._policies:
+                try:
+                    self.add(name, NumpyPolicy.from_zip(path))
+                except Exception as e:
+                    print(f"[League] Could not load {path}: {e}")
+
+    def _evict(self):
+        while len(self._policies) > 1 and (
+            len(self._policies) > self.max_policies or self.nbytes > self.memory_budget
+        ):
+            name, _ = self._policies.popitem(last=False)
+            self._stats.pop(name, None)
+            self._resample(np.flatnonzero(self._slots == name))
+
+    # ---- sampling ----
+
+    def win_rates(self):
+        """Opponent win rate against the agent, with a uniform Beta(1, 1) prior."""
+        return {name: (wins + 1) / (games + 2) for name, (games, wins) in self._stats.items()}
+
+    def sample(self):
+        """Pick an opponent for a new episode and mark it recently used."""
+        names = self.names
+        rates = self.win_rates()
+        weights = np.array([rates[name] for name in names])
+        name = names[self._rng.choice(len(names), p=weights / weights.sum())]
+        self._policies.move_to_end(name)
+        return name
+
+    def _resample(self, idx):
+        for i in idx:
+            self._slots[i] = self.sample() if self._policies else None
+
+    def on_episodes_end(self, idx, rewards):
+        """Record results of the games in idx and draw their next opponents.
+
+        rewards are from the agent's point of view: +1 win, -1 loss.
+        """
+        if not len(self._slots):
+            return
+        for i, reward in zip(idx, rewards):
+            name = self._slots[i]
+            if name in self._stats:
+                self._stats[name][0] += 1
+                self._stats[name][1] += int(reward < 0)
+        self._resample(idx)
+
+    # ---- inference ----
+
+    def predict(self, observation, state=None, episode_start=None, deterministic=False):
+        """Actions for a batch of mirrored observations, game i vs its own opponent."""
+        obs = np.asarray(observation, dtype=np.float32)
+        if len(self._slots) != len(obs):
+            self._slots = np.full(len(obs), None, dtype=object)
+            self._resample(range(len(obs)))
+        if not self._policies:
+            return self._rng.integers(0, 3, size=len(obs)), state
+        actions = np.empty(len(obs), dtype=np.int64)
+        for name in set(self._slots):
+            idx = np.flatnonzero(self._slots == name)
+            actions[idx], _ = self._policies[name].predict(obs[idx], deterministic=deterministic)
+        return actions, state
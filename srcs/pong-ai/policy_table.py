@@ -0,0 +1,90 @@
+"""Precomputed action table for the PPO actor (PONG_AI_BACKEND=table).
+
+The observation space is small and bounded: ball x/y on the 800x600 field,
+ball velocity (the engine caps its magnitude at settings.ballSpeed, 5 by
+default) and the two paddle centres. compile_policy_table.py evaluates the policy once at
+the centre of every cell of a uniform grid over BOUNDS and stores the
+greedy actions as a uint8 .npy array, one byte per cell.
+
+PolicyTable serves that file through a read-only memory map: a decision is
+six bin computations and one array index, with no forward pass. All
+processes mapping the same table (uvicorn workers, one table per model)
+share its pages through the OS page cache instead of each holding a copy.
+
+The grid is lossy: the policy's decision boundaries fall inside cells, so
+the table disagrees with the full model on a share of frames. The compile
+tool reports that share on recorded frames.
+"""
+
+import numpy as np
+
+# Ball velocity bound: the default ballSpeed plus a margin. Faster game
+# settings fall into the edge velocity cells.
+VELOCITY_BOUND = 5.5
+
+# (low, high) per observation feature, in PongSim.observation() order
+BOUNDS = ((0.0, 800.0), (0.0, 600.0), (-VELOCITY_BOUND, VELOCITY_BOUND), (-VELOCITY_BOUND, VELOCITY_BOUND),
+          (50.0, 550.0), (50.0, 550.0))
+
+# Cells per feature (~62 MiB). Every velocity cell is reachable; ball and
+# paddle positions matter most, and trading position cells for more
+# velocity cells raised the disagreement on recorded frames
+DEFAULT_BINS = (40, 40, 8, 8, 16, 40)
+
+
+class PolicyTable:
+    def __init__(self, table, bounds=BOUNDS):
+        if table.ndim != len(bounds):
+            raise ValueError(f"Table has {table.ndim} axes, expected {len(bounds)}")
+        self.table = table
+        self.bounds = bounds
+        self._flat = np.asarray(table).reshape(-1)
+        # Scalar reads through a memoryview return plain ints, ~10x faster than ndarray indexing
+        self._cells = memoryview(self._flat)
+        strides = np.cumprod((1,) + table.shape[:0:-1])[::-1]
+        # Per feature: (low, cells per unit, cell count, flat stride)
+        self._axes = tuple(
+            (lo, n / (hi - lo), n, int(stride))
+            for (lo, hi), n, stride in zip(bounds, table.shape, strides)
+        )
+        self._low = np.array([lo for lo, _ in bounds])
+        self._scale = np.array([n / (hi - lo) for (lo, hi), n in zip(bounds, table.shape)])
+        self._strides = np.asarray(strides, dtype=np.int64)
+
+    @classmethod
+    def from_file(cls, path):
+        """Memory-map a table written by compile_policy_table.py (read-only)."""
+        return cls(np.load(path, mmap_mode="r"))
+
+    @property
+    def nbytes(self):
+        return self.table.nbytes
+
+    def cell_centres(self, flat_index):
+        """(N, 6) float32 observations at the centres of the given flat cells."""
+        idx = np.unravel_index(flat_index, self.table.shape)
+        return np.stack([
+            lo + (i + 0.5) / scale for i, (lo, scale, _, _) in zip(idx, self._axes)
+        ], axis=1).astype(np.float32)
+
+    def index(self, obs):
+        """Flat cell index of every row of an (N, 6) batch."""
+        idx = ((np.asarray(obs, dtype=np.float64) - self._low) * self._scale).astype(np.int64)
+        np.clip(idx, 0, np.array(self.table.shape) - 1, out=idx)
+        return idx @ self._strides
+
+    def predict(self, observation, state=None, episode_start=None, deterministic=True):
+        """Greedy actions with the BaseAlgorithm.predict() return shape."""
+        obs = np.asarray(observation)
+        single = obs.ndim == 1
+        actions = self._flat[self.index(obs.reshape(1, -1) if single else obs)].astype(np.int64)
+        return (actions[0] if single else actions), state
+
+    def act(self, observation):
+        """Action for one observation, as a plain int: one table lookup."""
+        flat = 0
+        values = observation.tolist() if isinstance(observation, np.ndarray) else observation
+        for value, (lo, scale, n, stride) in zip(values, self._axes):
+            i = int((value - lo) * scale)
+            flat += (0 if i < 0 else n - 1 if i >= n else i) * stride
+        return self._cells[flat]
@@ -4,6 +4,9 @@ import requests
 import urllib3
 import numpy as np
 import os
+import warnings
+from pong_sim import PongSim, ACTIONS
+from rl_transport import HttpTransport, WsTransport
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -18,9 +21,30 @@ FRAME_SKIP = 4
 class PongEnv(gym.Env):
     metadata = {"render_modes": [], "render_fps": 60}
 
-    def __init__(self, base_url=None, render_mode=None, verify_ssl=None):
+    def __init__(self, base_url=None, render_mode=None, verify_ssl=None, backend=None, transport=None):
+        """
+        backend:   "remote" (default) drives a game-service session;
+                   "local" runs the in-process PongSim port of PongGame.ts,
+                   with no network and no docker stack required.
+                   Defaults to the PONG_ENV_BACKEND env var.
+        transport: how the remote backend talks to the game service —
+                   "http" (default, one POST per command) or "ws" (one
+                   long-lived WebSocket per session, falls back to HTTP if
+                   the server has no RL socket). Defaults to PONG_ENV_TRANSPORT.
+        """
         super().__init__()
 
+        if backend is None:
+            backend = os.getenv("PONG_ENV_BACKEND", "remote")
+        if backend not in ("remote", "local"):
+            raise ValueError(f"Unknown PongEnv backend: {backend!r}")
+        self.backend = backend
+
+        if transport is None:
+            transport = os.getenv("PONG_ENV_TRANSPORT", "http")
+        if transport not in ("http", "ws"):
+            raise ValueError(f"Unknown PongEnv transport: {transport!r}")
+
         if base_url is None:
             base_url = os.getenv("GAME_SERVICE_URL", "http://localhost:8080/api/game")
 
@@ -52,16 +76,35 @@ class PongEnv(gym.Env):
         # Action space: 0 = stop, 1 = up, 2 = down
         self.action_space = spaces.Discrete(3)
 
-        self._http = requests.Session()
-        self._http.verify = self.verify_ssl
-
         # Last observation — used by SelfPlayEnv to compute opponent action
         self._last_obs = None
 
-        self.session_id = self._create_session()
-        print(f"[PongEnv] Session created: {self.session_id} (SSL verify={self.verify_ssl})")
+        # Whether the game service supports multi-tick /rl/step (None = not probed yet)
+        self._multi_tick = None
+
+        if self.backend == "local":
+            self._http = None
+            self._transport = None
+            self._sim = PongSim()
+            self.session_id = None
+        else:
+            self._http = requests.Session()
+            self._http.verify = self.verify_ssl
+            self._sim = None
+            self.session_id = self._create_session()
+            self._transport = self._open_transport(transport)
+            print(f"[PongEnv] Session created: {self.session_id} (SSL verify={self.verify_ssl})")
         self.reset()
 
+    def _open_transport(self, transport):
+        if transport == "ws":
+            try:
+                return WsTransport(self.base_url, self.session_id, verify_ssl=self.verify_ssl)
+            except Exception as e:
+                warnings.warn(f"[PongEnv] RL WebSocket unavailable ({e}), falling back to HTTP",
+                              RuntimeWarning, stacklevel=2)
+        return HttpTransport(self._http, self.base_url, self.session_id)
+
     def _create_session(self):
         try:
             resp = self._http.post(f"{self.base_url}/create-session", timeout=5)
@@ -75,14 +118,15 @@ class PongEnv(gym.Env):
 
     def reset(self, seed=None, options=None):
         super().reset(seed=seed)
+        if self._sim is not None:
+            if seed is not None:
+                self._sim.rng.seed(seed)
+            self._sim.reset()
+            obs = self._sim.observation()
+            self._last_obs = obs
+            return obs, {}
         try:
-            resp = self._http.post(
-                f"{self.base_url}/rl/reset",
-                json={"sessionId": self.session_id},
-                timeout=5
-            )
-            resp.raise_for_status()
-            data = resp.json()
+            data = self._transport.reset()
             if "state" not in data:
                 raise KeyError(f"Expected 'state' in response, got: {list(data.keys())}")
             obs = self._convert_state(data["state"])
@@ -93,36 +137,9 @@ class PongEnv(gym.Env):
             raise
 
     def step(self, action):
-        action_map = {0: "stop", 1: "up", 2: "down"}
-        obs = None
-        reward = 0
-        done = False
-
-        # Advance FRAME_SKIP ticks, accumulate reward.
-        for i in range(FRAME_SKIP):
-            try:
-                resp = self._http.post(
-                    f"{self.base_url}/rl/step",
-                    json={
-                        "sessionId": self.session_id,
-                        "action": action_map[action],
-                        "paddle": "right"
-                    },
-                    timeout=5
-                )
-                resp.raise_for_status()
-                data = resp.json()
-                obs = self._convert_state(data["state"])
-                reward += data.get("reward", 0)
-                done = data.get("done", False)
-                if done:
-                    break
-            except requests.exceptions.RequestException as e:
-                print(f"[PongEnv] Error in step: {e}")
-                raise
-
-        self._last_obs = obs
-        return obs, reward, done, False, {}
+        if self._sim is not None:
+            return self._step_local(action, None)
+        return self._step_remote(action, None, "step")
 
     def step_both(self, right_action, left_action):
         """Advance the game sending actions for BOTH paddles simultaneously.
@@ -133,38 +150,78 @@ class PongEnv(gym.Env):
         The game service /rl/step endpoint must accept an optional
         'leftAction' field alongside 'action' / 'paddle'.
         """
+        if self._sim is not None:
+            return self._step_local(right_action, left_action)
+        return self._step_remote(right_action, left_action, "step_both")
+
+    def _step_remote(self, right_action, left_action, caller):
+        """Advance FRAME_SKIP ticks on the game service, accumulating reward.
+
+        Sends a single /rl/step with "ticks": FRAME_SKIP. The server answers
+        with the final state (without the cosmicBackground grid), the summed
+        reward and the done flag, and echoes "ticks" back. An older server
+        ignores the field and advances one tick only: the missing echo makes
+        us finish the step tick by tick and stop asking for multi-tick steps.
+        """
         action_map = {0: "stop", 1: "up", 2: "down"}
+        payload = {
+            "action": action_map[int(right_action)],
+            "paddle": "right",
+        }
+        if left_action is not None:
+            payload["leftAction"] = action_map[int(left_action)]
+
         obs = None
         reward = 0
         done = False
-
-        for _ in range(FRAME_SKIP):
-            try:
-                resp = self._http.post(
-                    f"{self.base_url}/rl/step",
-                    json={
-                        "sessionId": self.session_id,
-                        "action": action_map[right_action],
-                        "paddle": "right",
-                        "leftAction": action_map[left_action],
-                    },
-                    timeout=5
-                )
-                resp.raise_for_status()
-                data = resp.json()
+        remaining = FRAME_SKIP
+        try:
+            if self._multi_tick is not False:
+                data = self._transport.step({**payload, "ticks": FRAME_SKIP})
                 obs = self._convert_state(data["state"])
                 reward += data.get("reward", 0)
                 done = data.get("done", False)
-                if done:
-                    break
-            except requests.exceptions.RequestException as e:
-                print(f"[PongEnv] Error in step_both: {e}")
-                raise
+                if "ticks" in data:
+                    self._multi_tick = True
+                    remaining = 0
+                else:
+                    self._multi_tick = False
+                    warnings.warn("[PongEnv] Server has no multi-tick /rl/step, falling back to per-tick steps",
+                                  RuntimeWarning, stacklevel=3)
+                    remaining -= 1
+
+            # Per-tick fallback
+            while remaining > 0 and not done:
+                data = self._transport.step(payload)
+                obs = self._convert_state(data["state"])
+                reward += data.get("reward", 0)
+                done = data.get("done", False)
+                remaining -= 1
+        except requests.exceptions.RequestException as e:
+            print(f"[PongEnv] Error in {caller}: {e}")
+            raise
 
         self._last_obs = obs
         return obs, reward, done, False, {}
 
-    def _convert_state(self, backend_state):
+    def _step_local(self, right_action, left_action):
+        """FRAME_SKIP ticks of the in-process simulator, same contract as the HTTP loop."""
+        sim = self._sim
+        right = ACTIONS[int(right_action)]
+        left = None if left_action is None else ACTIONS[int(left_action)]
+        reward = 0
+        done = False
+        for _ in range(FRAME_SKIP):
+            r, done = sim.rl_step(right, left)
+            reward += r
+            if done:
+                break
+        obs = sim.observation()
+        self._last_obs = obs
+        return obs, reward, done, False, {}
+
+    @staticmethod
+    def _convert_state(backend_state):
         """Convert backend game state to 6-feature observation vector.
         Mirrors _extract_observation() in ai_player.py exactly.
         """
@@ -190,6 +247,8 @@ class PongEnv(gym.Env):
         pass
 
     def close(self):
+        if self._transport is not None:
+            self._transport.close()
         if self.window is not None:
             import pygame
             pygame.quit()
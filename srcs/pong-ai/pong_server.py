@@ -1,10 +1,58 @@
+import time
+
+# Process start, for the time-to-ready log
+STARTED_AT = time.perf_counter()
+
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Dict, Optional
 import os
 import asyncio
-from stable_baselines3 import PPO
-from ai_player import AIPlayer
+import weakref
+from ai_player import DEFAULT_OBSERVATION, AIPlayer, first_decision_delay, frame_counters
+from action_repeat import ActionRepeat, server_load
+from heuristic_policy import DIFFICULTY_NOISE, InterceptPolicy
+from model_registry import INFERENCE_BACKEND, MODEL_EXTENSIONS, get_model, load_model, registry
+from model_reloader import WARMUP_BATCH, ModelReloader, warm_up
+from inference_scheduler import BatchInferenceScheduler
+from inference_pool import get_executor, queue_delay
+
+if TYPE_CHECKING:
+    import stable_baselines3
+
+# Play with the analytic intercept policy (heuristic_policy.py) instead of
+# refusing games when no model is loaded, and for sessions past the limit
+HEURISTIC_FALLBACK = os.getenv("PONG_AI_HEURISTIC_FALLBACK", "1") == "1"
+MAX_MODEL_SESSIONS = int(os.getenv("PONG_AI_MAX_MODEL_SESSIONS", "64"))
+# "model": about as strong as the shipped model (heuristic_policy.py)
+HEURISTIC_DIFFICULTY = os.getenv("PONG_AI_HEURISTIC_DIFFICULTY", "model")
+# How long a join waits for the startup warm-up before answering 503, so the
+# first games after a deploy play the model instead of the fallback
+WARMUP_WAIT = float(os.getenv("PONG_AI_WARMUP_WAIT_S", "5"))
+
+# /join-game difficulty ids → model id in the models directory. A difficulty
+# whose model is not installed plays the intercept policy at that difficulty.
+DIFFICULTY_MODELS = {
+    "easy": None,
+    "medium": "pong_moderate",
+    "hard": "pong_strong",
+    "experimental": "pong_v2",
+}
+
+
+def __getattr__(name):
+    # stable_baselines3 pulls in torch (~2 s): imported on first use, so the
+    # HTTP app starts and answers /health while the model loads
+    if name == "PPO":
+        from stable_baselines3 import PPO
+        globals()["PPO"] = PPO
+        return PPO
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _ppo():
+    """stable_baselines3.PPO (or the test double patched in as pong_server.PPO)."""
+    return globals().get("PPO") or __getattr__("PPO")
 
 
 app = FastAPI(
@@ -23,47 +71,179 @@ app.add_middleware(
 
 
 class AIService:
-    """Manages AI model loading and readiness checks."""
+    """Manages AI model loading and readiness checks.
+
+    The default model (MODEL_PATH) is loaded at startup and hot-reloaded
+    when its file changes (see model_reloader.py); the other models of the
+    zoo are loaded on first use through the shared registry, which keeps
+    them resident within its memory budget.
+    """
     
-    def __init__(self, model_path: str = "models/best_model"):
-        self.model_path = model_path
-        self.model: Optional[PPO] = None
+    def __init__(self, model_path: Optional[str] = None, load: bool = True):
+        self.model_path = model_path or os.getenv("MODEL_PATH", "models/best_model")
+        self.models_dir = os.path.dirname(self.model_path) or "."
+        self._model: Optional["stable_baselines3.PPO"] = None
+        self.reloader: Optional[ModelReloader] = None
         self.load_error: Optional[str] = None
-        self.load_model()
+        # Set while start() loads and warms up the model: /health is not ready yet
+        self.warming_up = False
+        if load:
+            self.load_model()
+    
+    @property
+    def model(self):
+        """The default model: the latest version swapped in once reloading started."""
+        return self.reloader.model if self.reloader is not None else self._model
+    
+    def _model_files(self, path: str):
+        return [f"{path}{ext}" for ext in MODEL_EXTENSIONS[INFERENCE_BACKEND]]
+    
+    def has_model(self, path: str) -> bool:
+        return any(os.path.exists(f) for f in self._model_files(path))
     
     def load_model(self):
-        model_file = f"{self.model_path}.zip"
-        if not os.path.exists(model_file):
-            self.load_error = f"AI model not found: {model_file}"
+        if not self.has_model(self.model_path):
+            self.load_error = f"AI model not found: {self._model_files(self.model_path)[0]}"
             print(f"❌ {self.load_error}")
             return
         try:
-            self.model = PPO.load(self.model_path)
-            print(f"✅ Model loaded: {self.model_path}")
+            self._model = self.get_model(self.model_path)
+            print(f"✅ Model loaded: {self.model_path} (backend={INFERENCE_BACKEND})")
         except Exception as e:
             self.load_error = f"Failed to load AI model: {e}"
             print(f"❌ {self.load_error}")
     
+    def load(self, path: str):
+        """Load the model at path, bypassing the registry."""
+        return _ppo().load(path) if INFERENCE_BACKEND == "sb3" else load_model(path)
+    
+    def get_model(self, path: str):
+        """Model at path from the shared registry, loaded on first use."""
+        # Registered so every AIPlayer reuses this instance
+        loader = _ppo().load if INFERENCE_BACKEND == "sb3" else None
+        return get_model(path, loader=loader)
+    
+    def start_reloading(self, make_scheduler=None):
+        """Watch the default model file and swap new versions in (model_reloader.py).
+
+        Also without a model: the first valid file deployed is installed with no restart.
+        """
+        if self.reloader is None:
+            self.reloader = ModelReloader(self.model_path, self._model, self.load, make_scheduler)
+            # The reloader owns the default model from now on: no stale pin after a swap
+            self._model = None
+        self.reloader.start()
+    
+    def resolve(self, model_id: str) -> Optional[str]:
+        """Path of a model id (models/<id> or models/<id>/best_model), None if not installed."""
+        if model_id in ("default", os.path.basename(self.model_path)):
+            return self.model_path
+        if not model_id or os.path.basename(model_id) != model_id or model_id.startswith("."):
+            raise ValueError(f"Invalid model id: {model_id!r}")
+        for path in (os.path.join(self.models_dir, model_id),
+                     os.path.join(self.models_dir, model_id, "best_model")):
+            if self.has_model(path):
+                return path
+        return None
+    
+    async def start(self, make_scheduler=None):
+        """Load and warm up the default model off the event loop, then start reloading.
+
+        The warm-up runs batched dummy predictions, directly and through the
+        batch scheduler's inference threads, so the first game does not pay
+        for lazy torch/onnxruntime initialisation. Returns the phase timings (ms).
+        """
+        self.warming_up = True
+        timings = {}
+        try:
+            started = time.perf_counter()
+            await asyncio.to_thread(self.load_model)
+            timings["load_ms"] = (time.perf_counter() - started) * 1e3
+            if self._model is not None:
+                started = time.perf_counter()
+                try:
+                    await asyncio.to_thread(warm_up, self._model)
+                    if make_scheduler is not None:
+                        scheduler = make_scheduler(self._model)
+                        await asyncio.gather(*(scheduler.predict(DEFAULT_OBSERVATION) for _ in range(WARMUP_BATCH)))
+                    timings["warmup_ms"] = (time.perf_counter() - started) * 1e3
+                except Exception as e:
+                    self.load_error = f"AI model failed warm-up: {e}"
+                    print(f"❌ {self.load_error}")
+                    self._model = None
+            # Watch the file even without a model: deploying one needs no restart
+            self.start_reloading(make_scheduler)
+            return timings
+        finally:
+            self.warming_up = False
+    
     def is_ready(self) -> bool:
-        return self.model is not None
+        return self.model is not None and not self.warming_up
+    
+    async def wait_warm(self, timeout: float) -> bool:
+        """Wait up to timeout seconds for start() to finish; False if still warming up."""
+        deadline = time.perf_counter() + timeout
+        while self.warming_up and time.perf_counter() < deadline:
+            await asyncio.sleep(0.05)
+        return not self.warming_up
 
 
 ai_service: Optional[AIService] = None
 active_ai_players: Dict[str, AIPlayer] = {}
+# Batches the forward passes of all AI sessions of a model (see inference_scheduler.py),
+# keyed by the loaded model. Held weakly: the sessions and the reloader own their
+# scheduler, so a model the registry evicted is freed once its last game ends.
+inference_schedulers: "weakref.WeakValueDictionary[int, BatchInferenceScheduler]" = weakref.WeakValueDictionary()
+# Active sessions driven by the model (the others play the heuristic)
+model_sessions = 0
+# Startup phases in ms: app_ms (import → serving HTTP), load_ms, warmup_ms, ready_ms (import → ready)
+startup_timings: Dict[str, float] = {}
+
+
+def scheduler_for(model) -> BatchInferenceScheduler:
+    """The batch scheduler shared by all sessions playing this model."""
+    # A live entry holds its model, so id(model) cannot be reused while it exists
+    scheduler = inference_schedulers.get(id(model))
+    if scheduler is None:
+        # Forward passes run on the bounded inference pool, never on the loop
+        scheduler = inference_schedulers[id(model)] = BatchInferenceScheduler(model, executor=get_executor())
+    return scheduler
+
+
+async def prepare_model(service: AIService):
+    """Background startup: load and warm up the model, log time-to-ready."""
+    # New versions of the default model come with their own scheduler
+    timings = await service.start(scheduler_for)
+    startup_timings.update({k: round(v, 1) for k, v in timings.items()})
+    if service.is_ready():
+        startup_timings["ready_ms"] = round((time.perf_counter() - STARTED_AT) * 1e3, 1)
+        print(f"[startup] Ready in {startup_timings['ready_ms']:.0f} ms "
+              f"(load {timings['load_ms']:.0f} ms, warm-up {timings['warmup_ms']:.0f} ms)", flush=True)
 
 
 @app.on_event("startup")
 async def startup_event():
     global ai_service
-    ai_service = AIService()
-    print("✅ Pong AI Service started")
+    # Serve /health (503 until warm) at once; the model loads in the background
+    ai_service = AIService(load=False)
+    ai_service.warming_up = True
+    asyncio.create_task(prepare_model(ai_service))
+    startup_timings["app_ms"] = round((time.perf_counter() - STARTED_AT) * 1e3, 1)
+    print(f"✅ Pong AI Service started in {startup_timings['app_ms']:.0f} ms, loading model")
 
 
 @app.post("/join-game")
 async def join_game(request: Request):
     """AI joins a game session via WebSocket to game-service."""
     
-    if ai_service is None or not ai_service.is_ready():
+    global model_sessions
+
+    # The model is still loading: not a load failure, so no fallback game
+    if ai_service is not None and ai_service.warming_up and not await ai_service.wait_warm(WARMUP_WAIT):
+        raise HTTPException(status_code=503, detail="AI model warming up, retry shortly")
+
+    model_ready = ai_service is not None and ai_service.is_ready()
+    if ai_service is None or (not model_ready and not HEURISTIC_FALLBACK):
         raise HTTPException(
             status_code=503, 
             detail=ai_service.load_error if ai_service else "Service not initialized"
@@ -86,15 +266,58 @@ async def join_game(request: Request):
             "message": "AI is already in this game"
         }
     
-    # Create AI player
-    model_path = "models/best_model"
-    ai_player = AIPlayer(model_path)
+    # Model to play: an explicit model id, a difficulty, or the default model
+    model_id = body.get("model")
+    difficulty = body.get("difficulty")
+    if difficulty is not None and difficulty not in DIFFICULTY_MODELS:
+        raise HTTPException(status_code=400, detail=f"Unknown difficulty: {difficulty}")
+    if model_id is None and difficulty is not None:
+        model_id = DIFFICULTY_MODELS[difficulty]
+    if model_id is not None:
+        try:
+            model_path = ai_service.resolve(model_id)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if model_path is None and (difficulty is None or not HEURISTIC_FALLBACK):
+            raise HTTPException(status_code=404, detail=f"AI model not installed: {model_id}")
+    elif difficulty is None:
+        model_path = ai_service.model_path if model_ready else None
+    else:
+        model_path = None  # difficulty without a model: intercept policy
+
+    # Lazily load a zoo model off the event loop; games of a resident model cost nothing
+    model = ai_service.model if model_path == ai_service.model_path else None
+    if model_path is not None and model is None:
+        try:
+            model = await asyncio.to_thread(ai_service.get_model, model_path)
+        except Exception as e:
+            print(f"❌ Failed to load AI model {model_path}: {e}")
+            if not HEURISTIC_FALLBACK:
+                raise HTTPException(status_code=503, detail=f"Failed to load AI model: {e}")
+
+    # Create AI player (borrows the registered model, no PPO.load per game).
+    # Without a model, or past the model session limit, it plays the heuristic.
+    use_model = model is not None and model_sessions < MAX_MODEL_SESSIONS
+    if use_model:
+        # Sessions of the default model follow its hot reloads (PONG_AI_RELOAD_SWITCH)
+        reloader = ai_service.reloader if model_path == ai_service.model_path else None
+        # The model resolved above: the player and its scheduler share one version,
+        # and no registry lookup (or load) runs on the loop
+        ai_player = AIPlayer(model_path, scheduler=scheduler_for(model), reloader=reloader,
+                             model=model)
+        model_sessions += 1
+    else:
+        reason = "no model loaded" if model is None else f"{model_sessions} model sessions"
+        level = difficulty if difficulty in DIFFICULTY_NOISE else HEURISTIC_DIFFICULTY
+        print(f"AI using heuristic policy ({level}) for session {session_id} ({reason})")
+        ai_player = AIPlayer(None, heuristic=InterceptPolicy.for_difficulty(level))
     active_ai_players[session_id] = ai_player
     
     print(f"AI player created for session: {session_id}")
     
     # Start AI player in background with error handling
     async def play_with_error_handling():
+        global model_sessions
         try:
             await ai_player.play(session_id)
         except Exception as e:
@@ -104,6 +327,8 @@ async def join_game(request: Request):
         finally:
             # Cleanup when done
             active_ai_players.pop(session_id, None)
+            if use_model:
+                model_sessions -= 1
     
     asyncio.create_task(play_with_error_handling())
     
@@ -113,7 +338,9 @@ async def join_game(request: Request):
         "status": "success",
         "session_id": session_id,
         "message": "AI player joined the game",
-        "paddle": "right"
+        "paddle": "right",
+        "policy": "model" if use_model else "heuristic",
+        "model": (model_id or "default") if use_model else None
     }
 
 @app.head("/health")
@@ -122,6 +349,12 @@ async def health_head():
         raise HTTPException(status_code=503, detail="AI model not loaded")
     return {}
 
+
+def _not_ready_detail():
+    if ai_service.warming_up:
+        return "AI model loading and warming up"
+    return ai_service.load_error or "AI model not loaded"
+
 @app.get("/health") 
 async def health_get():
     if ai_service is None:
@@ -130,12 +363,31 @@ async def health_get():
     if not ai_service.is_ready():
         raise HTTPException(
             status_code=503, 
-            detail=ai_service.load_error or "AI model not loaded"
+            detail=_not_ready_detail()
         )
     
     return {
         "status": "healthy",
-        "model_loaded": True
+        "model_loaded": True,
+        # Frame received → forward pass started, over the recent decisions
+        "inference_queue_delay": queue_delay.summary(),
+        # State frames skipped because a newer one arrived first
+        "state_frames": dict(frame_counters),
+        "model_sessions": model_sessions,
+        "heuristic_sessions": len(active_ai_players) - model_sessions,
+        # Models resident in the registry, least recently used first
+        "models": registry.resident(),
+        # Hot reloads of the default model: live version, switch policy, last rejected file
+        "reload": ai_service.reloader.stats() if ai_service.reloader is not None else None,
+        "startup": startup_timings,
+        # First frame → first action of each session, over the recent sessions
+        "first_decision_latency": first_decision_delay.summary(),
+        # Frames each action is held for at the current load (see action_repeat.py)
+        "decision_rate": {
+            "frames_per_decision": ActionRepeat().interval(),
+            "sessions": server_load.sessions,
+            "loop_lag_ms": round(server_load.lag * 1e3, 3),
+        },
     }
 
 
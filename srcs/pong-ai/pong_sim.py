@@ -0,0 +1,475 @@
+"""In-process port of the game service Pong engine.
+
+Reproduces srcs/game/src/core/engine/PongGame.ts tick for tick so PongEnv
+can train without the docker stack or any network round-trip:
+
+  - Ball Euler integration (vel += acc, clamped to speedLimit, pos += vel)
+  - paddle movement and clamping
+  - top/bottom wall bounce, paddle bounce with the `serve` sign flip
+  - scoring, ball reset and the maxScore win condition
+  - the cosmic noise force pushing the ball every tick (cosmic_noise.py)
+
+rl_step() mirrors the /rl/step controller: it sets the paddle directions,
+advances one tick and reports (reward, done) exactly like the server.
+
+Everything is plain Python floats (the engine uses float64 too), which is
+much faster than NumPy for a single game.
+"""
+
+import math
+import random
+
+import numpy as np
+
+from cosmic_noise import CosmicNoise
+
+WIDTH = 800
+HEIGHT = 600
+
+# Mirrors DEFAULT_GAME_SETTINGS in srcs/game/src/types/game.types.ts
+DEFAULT_SETTINGS = {
+    "ballRadius": 5,
+    "ballSpeed": 5,
+    "ballMass": 1,
+    "paddleSpeed": 8,
+    "microWaveSize": 10,
+    "maxScore": 5,
+}
+
+# Distance between the field edge and the paddle face / goal line
+PADDLE_MARGIN = 20
+PADDLE_HEIGHT = 100
+PADDLE_WIDTH = 10
+# PongGame's constructor hard-codes the paddle speed; settings.paddleSpeed
+# only applies once applySettings() is called.
+PADDLE_SPEED = 8
+
+# Same action encoding as PongEnv: 0 = stop, 1 = up, 2 = down
+ACTIONS = ("stop", "up", "down")
+_DIRECTIONS = {"stop": 0, "up": -1, "down": 1}
+
+
+def _make_noise(enabled, noise_seed, rng, size):
+    """CosmicNoise for a sim; the engine seeds with Date.now(), we draw from rng."""
+    if not enabled:
+        return None
+    if noise_seed is None:
+        noise_seed = rng.getrandbits(41)
+    return CosmicNoise(WIDTH, HEIGHT, size, seed=noise_seed)
+
+
+class PongSim:
+    """Single Pong game with the exact physics of PongGame.ts.
+
+    cosmic_noise=False drops the noise force, leaving pure rigid-body physics.
+    """
+
+    width = WIDTH
+    height = HEIGHT
+
+    def __init__(self, settings=None, seed=None, cosmic_noise=True, noise_seed=None):
+        self.settings = dict(DEFAULT_SETTINGS)
+        self.rng = random.Random(seed)
+        self.time = 0.0
+        self.serve = 1
+        self.noise = _make_noise(cosmic_noise, noise_seed, self.rng, self.settings["microWaveSize"])
+
+        self.radius = float(self.settings["ballRadius"])
+        self.speed_limit = float(self.settings["ballSpeed"])
+        self.mass = float(self.settings["ballMass"])
+
+        self.ball_x = WIDTH / 2
+        self.ball_y = HEIGHT / 2
+        self.vel_x = float(self.settings["ballSpeed"])
+        self.vel_y = 0.0
+        self.acc_x = 0.0
+        self.acc_y = 0.0
+
+        self.paddle_height = PADDLE_HEIGHT
+        self.paddle_width = PADDLE_WIDTH
+        self.paddle_speed = float(PADDLE_SPEED)
+        self.left_y = HEIGHT / 2 - PADDLE_HEIGHT / 2
+        self.right_y = HEIGHT / 2 - PADDLE_HEIGHT / 2
+        self.left_dir = 0
+        self.right_dir = 0
+
+        self.score_left = 0
+        self.score_right = 0
+        self.status = "waiting"
+
+        if settings:
+            self.apply_settings(settings)
+
+    # ---- Settings ----
+
+    def apply_settings(self, settings):
+        """Same semantics as PongGame.applySettings()."""
+        if "ballSpeed" in settings:
+            speed = int(settings["ballSpeed"])
+            self.speed_limit = float(speed)
+            self.settings["ballSpeed"] = speed
+        if "ballRadius" in settings:
+            self.radius = float(settings["ballRadius"])
+            self.settings["ballRadius"] = self.radius
+        if "ballMass" in settings:
+            self.mass = float(settings["ballMass"])
+            self.settings["ballMass"] = self.mass
+        if "paddleSpeed" in settings:
+            self.paddle_speed = float(settings["paddleSpeed"])
+            self.settings["paddleSpeed"] = self.paddle_speed
+        if "microWaveSize" in settings:
+            size = int(settings["microWaveSize"])
+            self.settings["microWaveSize"] = size
+            if self.noise is not None:
+                self.noise = CosmicNoise(WIDTH, HEIGHT, size, seed=self.noise.seed)
+        if "maxScore" in settings:
+            max_score = int(settings["maxScore"])
+            if 1 <= max_score <= 50:
+                self.settings["maxScore"] = max_score
+
+    # ---- Paddle control ----
+
+    def set_paddle_direction(self, paddle, direction):
+        if paddle == "left":
+            self.left_dir = _DIRECTIONS[direction]
+        elif paddle == "right":
+            self.right_dir = _DIRECTIONS[direction]
+
+    # ---- Physics ----
+
+    def apply_force(self, fx, fy):
+        """Ball.apply(): a += F / m (a zero mass ignores the force)."""
+        if self.mass != 0:
+            self.acc_x += fx / self.mass
+            self.acc_y += fy / self.mass
+
+    def update(self):
+        """One engine tick — PongGame.update()."""
+        # Cosmic noise force field
+        if self.noise is not None:
+            fx, fy = self.noise.vector_at(self.ball_x, self.ball_y, self.time)
+            self.apply_force(fx * self.serve, fy * self.serve)
+
+        # Ball.update(): Euler step with Vector2.limit()
+        vx = self.vel_x + self.acc_x
+        vy = self.vel_y + self.acc_y
+        length = math.hypot(vx, vy)
+        if length > self.speed_limit:
+            vx = (vx / length) * self.speed_limit
+            vy = (vy / length) * self.speed_limit
+        self.vel_x = vx
+        self.vel_y = vy
+        self.ball_x += vx
+        self.ball_y += vy
+        self.acc_x = 0.0
+        self.acc_y = 0.0
+
+        self._update_paddles()
+        self._handle_collisions()
+        self._handle_scoring()
+        if (self.score_left >= self.settings["maxScore"]
+                or self.score_right >= self.settings["maxScore"]):
+            self.status = "finished"
+
+        self.time += 0.01
+
+    def _update_paddles(self):
+        max_y = HEIGHT - self.paddle_height
+        y = self.left_y + self.left_dir * self.paddle_speed
+        self.left_y = 0 if y < 0 else (max_y if y > max_y else y)
+        y = self.right_y + self.right_dir * self.paddle_speed
+        self.right_y = 0 if y < 0 else (max_y if y > max_y else y)
+
+    def _handle_collisions(self):
+        r = self.radius
+        # Top/bottom wall bounce
+        if self.ball_y - r <= 0:
+            self.ball_y = r
+            self.vel_y = -self.vel_y
+        elif self.ball_y + r >= HEIGHT:
+            self.ball_y = HEIGHT - r
+            self.vel_y = -self.vel_y
+
+        # Left paddle
+        if self.ball_x - r <= PADDLE_MARGIN + self.paddle_width:
+            if self.left_y <= self.ball_y <= self.left_y + self.paddle_height:
+                self.vel_x = -self.vel_x
+                self.acc_x += 5
+                self.serve *= -1
+        # Right paddle
+        elif self.ball_x + r >= WIDTH - PADDLE_MARGIN - self.paddle_width:
+            if self.right_y <= self.ball_y <= self.right_y + self.paddle_height:
+                self.vel_x = -self.vel_x
+                self.acc_x += -5
+                self.serve *= -1
+
+    def _handle_scoring(self):
+        if self.ball_x - self.radius <= PADDLE_MARGIN:
+            self.score_right += 1
+            self.reset_ball()
+        elif self.ball_x + self.radius >= WIDTH - PADDLE_MARGIN:
+            self.score_left += 1
+            self.reset_ball()
+
+    def is_finished(self):
+        return self.status == "finished"
+
+    def reset_ball(self):
+        self.ball_x = WIDTH / 2
+        self.ball_y = HEIGHT / 2
+        self.vel_x = float(self.settings["ballSpeed"] * self.serve)
+        self.vel_y = (self.rng.random() - 0.5) * 10
+        self.acc_x = 0.0
+        self.acc_y = 0.0
+
+    def reset(self):
+        """PongGame.reset(): scores zeroed, status back to 'waiting', ball centered."""
+        self.score_left = 0
+        self.score_right = 0
+        self.status = "waiting"
+        self.reset_ball()
+
+    # ---- RL API ----
+
+    def rl_step(self, action="stop", left_action=None):
+        """Mirror of the /rl/step controller for the right paddle.
+
+        Returns (reward, done): +1/-1 once the game is finished, 0 otherwise.
+        """
+        self.set_paddle_direction("right", action)
+        if left_action is not None:
+            self.set_paddle_direction("left", left_action)
+        self.update()
+        if self.status == "finished":
+            return (1 if self.score_right > self.score_left else -1), True
+        return 0, False
+
+    # ---- Serialization ----
+
+    def observation(self, out=None):
+        """6-feature observation, identical to PongEnv._convert_state()."""
+        if out is None:
+            out = np.empty(6, dtype=np.float32)
+        half = self.paddle_height / 2
+        out[0] = self.ball_x
+        out[1] = self.ball_y
+        out[2] = self.vel_x
+        out[3] = self.vel_y
+        out[4] = self.left_y + half
+        out[5] = self.right_y + half
+        return out
+
+    def get_state(self, include_background=True):
+        """Same shape as PongGame.getState().
+
+        cosmicBackground is the raw noise grid at the current time, without
+        the ball wake that affectedFrom() paints on the live engine's copy.
+        """
+        background = None
+        if include_background and self.noise is not None:
+            background = self.noise.field(self.time).tolist()
+        return {
+            "ball": {
+                "x": self.ball_x,
+                "y": self.ball_y,
+                "radius": self.radius,
+                "vx": self.vel_x,
+                "vy": self.vel_y,
+            },
+            "paddles": {
+                "left": {"y": self.left_y, "height": self.paddle_height},
+                "right": {"y": self.right_y, "height": self.paddle_height},
+            },
+            "scores": {"left": self.score_left, "right": self.score_right},
+            "status": self.status,
+            "cosmicBackground": background,
+        }
+
+
+# Action index (0 = stop, 1 = up, 2 = down) -> paddle y direction
+ACTION_DIRECTIONS = np.array([0, -1, 1], dtype=np.float64)
+
+
+class BatchPongSim:
+    """N independent PongSim games stepped together with masked vector ops.
+
+    Struct-of-arrays layout: every per-game quantity (ball pos/vel/acc,
+    paddle y, scores, serve sign, clock) lives in one (N,) array, so a tick
+    costs a fixed number of NumPy calls regardless of N. All games share the
+    same settings and one noise field. Semantics are identical to PongSim,
+    including the per-tick order of noise force, paddle update, collisions,
+    scoring and win check.
+    """
+
+    # Per-game arrays, in the order they are snapshotted by _freeze()
+    _STATE = (
+        "ball_x", "ball_y", "vel_x", "vel_y", "acc_x", "acc_y",
+        "left_y", "right_y", "serve", "time", "score_left", "score_right",
+    )
+
+    width = WIDTH
+    height = HEIGHT
+
+    def __init__(self, num_games, settings=None, seed=None, cosmic_noise=True, noise_seed=None):
+        self.num_games = n = int(num_games)
+        sim = PongSim(settings=settings, seed=seed, cosmic_noise=cosmic_noise, noise_seed=noise_seed)
+        self.noise = sim.noise
+        self.settings = sim.settings
+        self.radius = sim.radius
+        self.speed_limit = sim.speed_limit
+        self.mass = sim.mass
+        self.paddle_height = sim.paddle_height
+        self.paddle_width = sim.paddle_width
+        self.paddle_speed = sim.paddle_speed
+        self.rng = np.random.default_rng(seed)
+
+        self.ball_x = np.full(n, WIDTH / 2)
+        self.ball_y = np.full(n, HEIGHT / 2)
+        self.vel_x = np.full(n, float(self.settings["ballSpeed"]))
+        self.vel_y = np.zeros(n)
+        self.acc_x = np.zeros(n)
+        self.acc_y = np.zeros(n)
+        self.left_y = np.full(n, HEIGHT / 2 - PADDLE_HEIGHT / 2)
+        self.right_y = np.full(n, HEIGHT / 2 - PADDLE_HEIGHT / 2)
+        self.serve = np.ones(n)
+        self.time = np.zeros(n)
+        self.score_left = np.zeros(n)
+        self.score_right = np.zeros(n)
+        self.finished = np.zeros(n, dtype=bool)
+
+        self._all = np.arange(n)
+        self._obs = np.empty((n, 6), dtype=np.float32)
+
+    # ---- Physics ----
+
+    def update(self, left_dir, right_dir):
+        """One engine tick for every game. Directions are (N,) arrays of -1/0/+1."""
+        r = self.radius
+        limit = self.speed_limit
+
+        # Cosmic noise force field, for every ball in one call
+        if self.noise is not None and self.mass != 0:
+            fx, fy = self.noise.vectors_at(self.ball_x, self.ball_y, self.time)
+            self.acc_x += (fx * self.serve) / self.mass
+            self.acc_y += (fy * self.serve) / self.mass
+
+        # Ball.update(): Euler step with Vector2.limit()
+        vx = self.vel_x + self.acc_x
+        vy = self.vel_y + self.acc_y
+        length = np.hypot(vx, vy)
+        over = length > limit
+        if over.any():
+            vx[over] = (vx[over] / length[over]) * limit
+            vy[over] = (vy[over] / length[over]) * limit
+        self.vel_x = vx
+        self.vel_y = vy
+        self.ball_x += vx
+        self.ball_y += vy
+        self.acc_x.fill(0.0)
+        self.acc_y.fill(0.0)
+
+        # Paddles
+        max_y = HEIGHT - self.paddle_height
+        np.clip(self.left_y + left_dir * self.paddle_speed, 0, max_y, out=self.left_y)
+        np.clip(self.right_y + right_dir * self.paddle_speed, 0, max_y, out=self.right_y)
+
+        # Top/bottom wall bounce
+        top = self.ball_y - r <= 0
+        bottom = ~top & (self.ball_y + r >= HEIGHT)
+        wall = top | bottom
+        if wall.any():
+            self.ball_y[top] = r
+            self.ball_y[bottom] = HEIGHT - r
+            vy[wall] = -vy[wall]
+
+        # Paddle bounce: the right paddle is only checked outside the left zone
+        bx, by, ph = self.ball_x, self.ball_y, self.paddle_height
+        left_zone = bx - r <= PADDLE_MARGIN + self.paddle_width
+        left_hit = left_zone & (by >= self.left_y) & (by <= self.left_y + ph)
+        right_hit = (~left_zone & (bx + r >= WIDTH - PADDLE_MARGIN - self.paddle_width)
+                     & (by >= self.right_y) & (by <= self.right_y + ph))
+        hit = left_hit | right_hit
+        if hit.any():
+            vx[hit] = -vx[hit]
+            self.acc_x[left_hit] += 5
+            self.acc_x[right_hit] += -5
+            self.serve[hit] *= -1
+
+        # Scoring
+        right_scores = bx - r <= PADDLE_MARGIN
+        left_scores = ~right_scores & (bx + r >= WIDTH - PADDLE_MARGIN)
+        scored = right_scores | left_scores
+        if scored.any():
+            self.score_right += right_scores
+            self.score_left += left_scores
+            self.reset_ball(np.flatnonzero(scored))
+
+        max_score = self.settings["maxScore"]
+        self.finished |= (self.score_left >= max_score) | (self.score_right >= max_score)
+        self.time += 0.01
+
+    def reset_ball(self, idx):
+        self.ball_x[idx] = WIDTH / 2
+        self.ball_y[idx] = HEIGHT / 2
+        self.vel_x[idx] = self.settings["ballSpeed"] * self.serve[idx]
+        self.vel_y[idx] = (self.rng.random(len(idx)) - 0.5) * 10
+        self.acc_x[idx] = 0.0
+        self.acc_y[idx] = 0.0
+
+    def reset(self, idx=None):
+        """PongGame.reset() for the given games (all games by default)."""
+        if idx is None:
+            idx = self._all
+        self.score_left[idx] = 0
+        self.score_right[idx] = 0
+        self.finished[idx] = False
+        self.reset_ball(idx)
+
+    # ---- RL API ----
+
+    def rl_step(self, right_actions, left_actions, ticks=1):
+        """Advance every game up to `ticks` ticks with fixed actions.
+
+        Same contract as PongEnv's FRAME_SKIP loop: a game that finishes
+        mid-way stops advancing and its reward is +1/-1, else 0.
+        Finished games are NOT reset here — see reset().
+
+        Returns (rewards, dones) as (N,) float32 / bool arrays.
+        """
+        right_dir = ACTION_DIRECTIONS[right_actions]
+        left_dir = ACTION_DIRECTIONS[left_actions]
+        done = self.finished.copy()
+        for _ in range(ticks):
+            frozen = np.flatnonzero(done)
+            saved = self._freeze(frozen) if len(frozen) else None
+            self.update(left_dir, right_dir)
+            if saved is not None:
+                self._thaw(frozen, saved)
+            done |= self.finished
+            if done.all():
+                break
+        rewards = np.where(self.score_right > self.score_left, 1.0, -1.0).astype(np.float32)
+        rewards[~done] = 0.0
+        return rewards, done
+
+    def _freeze(self, idx):
+        return [getattr(self, name)[idx] for name in self._STATE]
+
+    def _thaw(self, idx, saved):
+        for name, values in zip(self._STATE, saved):
+            getattr(self, name)[idx] = values
+
+    # ---- Serialization ----
+
+    def observations(self, out=None):
+        """(N, 6) observations, row-wise identical to PongSim.observation()."""
+        if out is None:
+            out = self._obs
+        half = self.paddle_height / 2
+        out[:, 0] = self.ball_x
+        out[:, 1] = self.ball_y
+        out[:, 2] = self.vel_x
+        out[:, 3] = self.vel_y
+        out[:, 4] = self.left_y + half
+        out[:, 5] = self.right_y + half
+        return out
@@ -0,0 +1,92 @@
+"""Vectorized self-play Pong environment for stable-baselines3.
+
+Steps N games at once on a BatchPongSim, so PPO collects its rollouts with
+one handful of NumPy calls per tick instead of one Python env per game.
+
+Like SelfPlayEnv, the agent controls the RIGHT paddle of every game and the
+LEFT paddles are driven by a frozen opponent (random until set_opponent()
+is called). Opponent actions for the whole batch come from a single
+predict() call on the mirrored observations.
+
+Finished games are reset automatically; the final observation is returned
+in info["terminal_observation"] as SB3 expects.
+"""
+
+import numpy as np
+from gymnasium import spaces
+from stable_baselines3.common.vec_env import VecEnv
+
+from pong_env import FRAME_SKIP
+from pong_sim import BatchPongSim, WIDTH, HEIGHT
+from self_play_env import opponent_actions, opponent_episodes_end
+
+
+class PongVecEnv(VecEnv):
+    metadata = {"render_modes": [], "render_fps": 60}
+    render_mode = None
+
+    def __init__(self, num_envs=256, opponent_model=None, settings=None, seed=None):
+        # Same spaces as PongEnv
+        observation_space = spaces.Box(
+            low=np.array([0, 0, -20, -20, 0, 0], dtype=np.float32),
+            high=np.array([WIDTH, HEIGHT, 20, 20, HEIGHT, HEIGHT], dtype=np.float32),
+            dtype=np.float32,
+        )
+        action_space = spaces.Discrete(3)
+        super().__init__(num_envs, observation_space, action_space)
+
+        self.sim = BatchPongSim(num_envs, settings=settings, seed=seed)
+        self.opponent_model = opponent_model  # None → random opponent
+        self._rng = np.random.default_rng(seed)
+        self._actions = np.zeros(num_envs, dtype=np.int64)
+
+    def set_opponent(self, model):
+        """Replace the frozen opponent policy (called by UpdateOpponentCallback)."""
+        self.opponent_model = model
+
+    # ---- VecEnv API ----
+
+    def reset(self):
+        if self._seeds[0] is not None:
+            self.sim.rng = np.random.default_rng(self._seeds[0])
+            self._rng = np.random.default_rng(self._seeds[0])
+        self._reset_seeds()
+        self._reset_options()
+        self.sim.reset()
+        return self.sim.observations().copy()
+
+    def step_async(self, actions):
+        self._actions = np.asarray(actions, dtype=np.int64).reshape(self.num_envs)
+
+    def step_wait(self):
+        obs = self.sim.observations()
+        left_actions = opponent_actions(self.opponent_model, obs, self._rng, WIDTH)
+        rewards, dones = self.sim.rl_step(self._actions, left_actions, ticks=FRAME_SKIP)
+
+        obs = self.sim.observations().copy()
+        infos = [{} for _ in range(self.num_envs)]
+        done_idx = np.flatnonzero(dones)
+        opponent_episodes_end(self.opponent_model, done_idx, rewards[done_idx])
+        if len(done_idx):
+            for i in done_idx:
+                infos[i]["terminal_observation"] = obs[i].copy()
+                infos[i]["TimeLimit.truncated"] = False
+            self.sim.reset(done_idx)
+            obs[done_idx] = self.sim.observations()[done_idx]
+        return obs, rewards, dones, infos
+
+    def close(self):
+        pass
+
+    def get_attr(self, attr_name, indices=None):
+        return [getattr(self, attr_name) for _ in self._get_indices(indices)]
+
+    def set_attr(self, attr_name, value, indices=None):
+        setattr(self, attr_name, value)
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        method = getattr(self, method_name)
+        return [method(*method_args, **method_kwargs) for _ in self._get_indices(indices)]
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False for _ in self._get_indices(indices)]
@@ -0,0 +1,117 @@
+"""Int8-quantized PPO actor (PONG_AI_BACKEND=int8).
+
+QuantizedPolicy stores every layer's weights as int8 with one float32
+scale per output unit (symmetric, per-channel), so the exported actor is a
+quarter of the float export and carries no optimizer state or torch
+pickles. The observation features span very different ranges (ball x up
+to 800, velocity +/-5), so the first layer is quantized per input feature
+over its policy_table.BOUNDS range, with the range centre and step folded
+into its bias and weights. Quantizing the raw first-layer weights per
+output instead lets the large position inputs swamp the velocity rows and
+doubles the action mismatch.
+
+Only the weights are quantized. They are dequantized once at load and the
+forward pass is NumpyPolicy's float one: NumPy has no int8 GEMM, and
+quantizing the activations per call (as torch's quantize_dynamic() does)
+made act() about 4x slower than the float actor on this 17k-parameter MLP.
+A decision costs the same as PONG_AI_BACKEND=numpy; the gain is the file.
+
+export_quantized.py writes the .int8.npz from a float actor and reports how
+often its actions differ from the float model on held-out observations.
+"""
+
+import numpy as np
+
+from numpy_policy import ACTIVATIONS, NumpyPolicy
+from policy_table import BOUNDS
+
+QMAX = 127
+
+
+def quantize_weights(w):
+    """(int8 weights, per-column float32 scales) for an (in, out) float matrix."""
+    scale = np.abs(w).max(axis=0) / QMAX
+    scale[scale == 0] = 1.0
+    return np.rint(w / scale).astype(np.int8), scale.astype(np.float32)
+
+
+class QuantizedPolicy:
+    def __init__(self, weights, scales, biases, input_offset, input_scale, activation="Tanh"):
+        """
+        weights:      per-layer int8 (in, out) matrices, action head last.
+        scales:       per-layer float32 (out,) dequantization scales.
+        biases:       per-layer float32 biases, applied after dequantization.
+        input_offset: float32 (obs_dim,) centre of each observation feature's range.
+        input_scale:  float32 (obs_dim,) step of each quantized observation feature.
+        """
+        if activation not in ACTIVATIONS:
+            raise ValueError(f"Unsupported activation: {activation!r}")
+        self.weights = [np.ascontiguousarray(w, dtype=np.int8) for w in weights]
+        self.scales = [np.ascontiguousarray(s, dtype=np.float32) for s in scales]
+        self.biases = [np.ascontiguousarray(b, dtype=np.float32) for b in biases]
+        self.input_offset = np.ascontiguousarray(input_offset, dtype=np.float32)
+        self.input_scale = np.ascontiguousarray(input_scale, dtype=np.float32)
+        self.activation = activation
+        # Dequantized float actor; the first layer takes raw observations again
+        dense = [w.astype(np.float64) * s for w, s in zip(self.weights, self.scales)]
+        dense[0] /= self.input_scale[:, None]
+        biases = [self.biases[0] - self.input_offset.astype(np.float64) @ dense[0]] + self.biases[1:]
+        self._float = NumpyPolicy(dense, biases, activation)
+
+    @classmethod
+    def from_policy(cls, policy, bounds=BOUNDS):
+        """Quantize a float NumpyPolicy."""
+        low, high = np.array(bounds, dtype=np.float64).T
+        input_offset = (low + high) / 2
+        input_scale = (high - low) / (2 * QMAX)
+        w0 = policy.weights[0].astype(np.float64)
+        # The first layer sees quantized steps around the range centres
+        layers = [w0 * input_scale[:, None]] + list(policy.weights[1:])
+        biases = [policy.biases[0] + input_offset @ w0] + list(policy.biases[1:])
+        weights, scales = zip(*(quantize_weights(w) for w in layers))
+        return cls(weights, scales, biases, input_offset, input_scale, policy.activation)
+
+    @classmethod
+    def from_npz(cls, path):
+        """Load an actor written by save_npz() — NumPy only, no torch."""
+        with np.load(path) as data:
+            n = int(data["num_layers"])
+            return cls(
+                [data[f"w{i}"] for i in range(n)],
+                [data[f"s{i}"] for i in range(n)],
+                [data[f"b{i}"] for i in range(n)],
+                data["input_offset"],
+                data["input_scale"],
+                str(data["activation"]),
+            )
+
+    def save_npz(self, path):
+        arrays = {f"w{i}": w for i, w in enumerate(self.weights)}
+        arrays.update({f"s{i}": s for i, s in enumerate(self.scales)})
+        arrays.update({f"b{i}": b for i, b in enumerate(self.biases)})
+        np.savez(path, num_layers=len(self.weights), activation=self.activation,
+                 input_offset=self.input_offset, input_scale=self.input_scale, **arrays)
+
+    @property
+    def export_nbytes(self):
+        """Bytes of the int8 export (weights, scales, biases, input ranges)."""
+        return self.input_offset.nbytes + self.input_scale.nbytes + sum(
+            w.nbytes + s.nbytes + b.nbytes for w, s, b in zip(self.weights, self.scales, self.biases)
+        )
+
+    @property
+    def nbytes(self):
+        """Resident bytes: the int8 export plus the dequantized float actor."""
+        return self.export_nbytes + self._float.nbytes
+
+    def logits(self, obs):
+        """Action logits for an (N, obs_dim) batch."""
+        return self._float.logits(np.asarray(obs, dtype=np.float32))
+
+    def predict(self, observation, state=None, episode_start=None, deterministic=True):
+        """Greedy actions with the BaseAlgorithm.predict() return shape."""
+        return self._float.predict(observation, state, episode_start, deterministic=True)
+
+    def act(self, observation):
+        """Greedy action for one observation, as a plain int (thread-safe, allocation-free)."""
+        return self._float.act(observation)
@@ -0,0 +1,102 @@
+"""Transports between PongEnv and the game service RL API.
+
+HttpTransport POSTs every command to /rl/reset and /rl/step.
+WsTransport keeps one WebSocket open per env session (/ai/ws/<sessionId>,
+the game service's rlWebSocket route, proxied by the gateway under
+/api/game) and sends the same commands as JSON frames, so a step no longer
+pays for HTTP framing and headers. Commands carry an id and replies come
+back in order, so several commands can be in flight at once
+(submit/collect).
+
+Both expose reset() and step(payload) returning the decoded server reply.
+"""
+
+import itertools
+import json
+import ssl
+
+import requests
+from websockets.sync.client import connect
+
+# Game service RL socket route (srcs/game/src/routes/GameRoutes.ts)
+RL_WS_PATH = "/ai/ws"
+
+
+class TransportError(requests.exceptions.RequestException):
+    """Server-side failure reported over a transport (same family as HTTP errors)."""
+
+
+class HttpTransport:
+    def __init__(self, http, base_url, session_id):
+        self._http = http
+        self.base_url = base_url
+        self.session_id = session_id
+
+    def reset(self):
+        resp = self._http.post(
+            f"{self.base_url}/rl/reset",
+            json={"sessionId": self.session_id},
+            timeout=5
+        )
+        resp.raise_for_status()
+        return resp.json()
+
+    def step(self, payload):
+        resp = self._http.post(
+            f"{self.base_url}/rl/step",
+            json={"sessionId": self.session_id, **payload},
+            timeout=5
+        )
+        resp.raise_for_status()
+        return resp.json()
+
+    def close(self):
+        pass
+
+
+class WsTransport:
+    def __init__(self, base_url, session_id, verify_ssl=False, timeout=5):
+        if base_url.startswith("https://"):
+            uri = "wss://" + base_url[len("https://"):]
+        elif base_url.startswith("http://"):
+            uri = "ws://" + base_url[len("http://"):]
+        else:
+            uri = base_url
+        self.uri = f"{uri}{RL_WS_PATH}/{session_id}"
+        self.session_id = session_id
+        self.timeout = timeout
+
+        ssl_context = None
+        if self.uri.startswith("wss://"):
+            ssl_context = ssl.create_default_context()
+            if not verify_ssl:
+                ssl_context.check_hostname = False
+                ssl_context.verify_mode = ssl.CERT_NONE
+
+        self._ids = itertools.count(1)
+        self._ws = connect(self.uri, ssl_context=ssl_context, open_timeout=timeout, compression=None)
+
+    def submit(self, message):
+        """Send a command without waiting for its reply. Returns the command id."""
+        msg_id = next(self._ids)
+        self._ws.send(json.dumps({"id": msg_id, **message}))
+        return msg_id
+
+    def collect(self, msg_id):
+        """Wait for the reply to a submitted command (replies arrive in order)."""
+        while True:
+            data = json.loads(self._ws.recv(timeout=self.timeout))
+            if data.get("id") == msg_id:
+                break
+        if data.get("status") == "failure":
+            raise TransportError(data.get("message", "RL command failed"))
+        return data
+
+    def reset(self):
+        return self.collect(self.submit({"type": "reset"}))
+
+    def step(self, payload):
+        return self.collect(self.submit({"type": "step", **payload}))
+
+    def close(self):
+        self._ws.close()
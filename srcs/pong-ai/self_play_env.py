@@ -4,6 +4,10 @@ The agent always controls the RIGHT paddle.
 The LEFT paddle is controlled by a frozen copy of the same model,
 updated periodically via UpdateOpponentCallback in train.py.
 
+mirror_observations() and opponent_actions() are the batched versions of
+the per-env mirroring and predict(), shared by the vectorized envs, which
+also report finished games through opponent_episodes_end().
+
 Until a model is available the opponent acts randomly.
 """
 
@@ -12,6 +16,28 @@ import gymnasium as gym
 from pong_env import PongEnv
 
 
+def mirror_observations(obs, width=800):
+    """Batched _get_opponent_obs(): mirror an (N, 6) batch for the left paddle."""
+    opp = obs[:, [0, 1, 2, 3, 5, 4]]
+    opp[:, 0] = width - opp[:, 0]
+    opp[:, 2] = -opp[:, 2]
+    return opp
+
+
+def opponent_actions(opponent_model, obs, rng, width=800):
+    """Left-paddle actions for an (N, 6) batch: one predict() call, or random."""
+    if opponent_model is None:
+        return rng.integers(0, 3, size=len(obs))
+    actions, _ = opponent_model.predict(mirror_observations(obs, width), deterministic=False)
+    return np.asarray(actions, dtype=np.int64)
+
+
+def opponent_episodes_end(opponent_model, idx, rewards):
+    """Report finished games to opponents that track them (OpponentLeague)."""
+    if len(idx) and hasattr(opponent_model, "on_episodes_end"):
+        opponent_model.on_episodes_end(idx, rewards)
+
+
 class SelfPlayEnv(gym.Env):
     metadata = {"render_modes": [], "render_fps": 60}
 
@@ -35,12 +61,7 @@ class SelfPlayEnv(gym.Env):
           - vx is negated      (moving toward left = positive from left's pov)
           - paddle roles swap  (left_y ↔ right_y)
         """
-        width = self.env.width
-        ball_x, ball_y, vx, vy, left_y, right_y = obs
-        return np.array(
-            [width - ball_x, ball_y, -vx, vy, right_y, left_y],
-            dtype=np.float32,
-        )
+        return mirror_observations(np.asarray(obs, dtype=np.float32)[None], self.env.width)[0]
 
     def reset(self, **kwargs):
         obs, info = self.env.reset(**kwargs)
@@ -56,10 +77,18 @@ class SelfPlayEnv(gym.Env):
             opp_action = int(opp_action)
         else:
             opp_action = self.env.action_space.sample()
+        return self.step_with_opponent(action, opp_action)
 
+    def step_with_opponent(self, action, opponent_action):
+        """Step with an opponent action computed by the caller.
+
+        Vectorized hosts (SharedMemVecEnv) predict the opponent actions of
+        all their SelfPlayEnvs in one batched forward pass and feed them
+        here, instead of paying one predict() per env per step.
+        """
         obs, reward, terminated, truncated, info = self.env.step_both(
             right_action=action,
-            left_action=opp_action,
+            left_action=opponent_action,
         )
         self.env._last_obs = obs
         return obs, reward, terminated, truncated, info
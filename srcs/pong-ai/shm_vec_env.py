@@ -0,0 +1,199 @@
+"""Multi-process self-play VecEnv with shared-memory observations.
+
+SubprocVecEnv pickles every observation, reward, done and info through a
+pipe, one env per process. SharedMemVecEnv instead starts n_workers
+processes that each host several SelfPlayEnv instances, and exchanges the
+per-step data through shared arrays:
+
+    actions         (N,)    written by the main process before "step"
+    opp_actions     (N,)    left-paddle actions, one batched predict()
+    obs             (N, 6)  written by the workers (already auto-reset)
+    terminal_obs    (N, 6)  final observation of the games that just ended
+    rewards, dones  (N,)
+
+The pipes only carry the command and a tiny ack, so the cost of a step is
+the env stepping itself, spread over n_workers cores.
+
+The opponent stays in the main process: its actions for all N games come
+from one predict() on the mirrored obs batch and are handed to the workers
+through opp_actions, so opponent inference is one forward pass per step
+instead of one per env. Finished games are reset inside the worker; the
+final observation is returned in info["terminal_observation"] as SB3
+expects.
+"""
+
+import multiprocessing as mp
+
+import numpy as np
+from gymnasium import spaces
+from stable_baselines3.common.vec_env import VecEnv
+
+from self_play_env import SelfPlayEnv, opponent_actions, opponent_episodes_end
+
+
+def _worker(remote, parent_remote, env_slice, env_kwargs, buffers):
+    """Step the SelfPlayEnvs of env_slice and write results to the shared arrays."""
+    parent_remote.close()
+    actions, opp_actions, obs, terminal_obs, rewards, dones = _as_arrays(buffers)
+    envs = [SelfPlayEnv(**env_kwargs) for _ in range(env_slice.start, env_slice.stop)]
+    try:
+        while True:
+            cmd, data = remote.recv()
+            if cmd == "step":
+                for i, env in zip(range(env_slice.start, env_slice.stop), envs):
+                    ob, reward, terminated, truncated, _ = env.step_with_opponent(
+                        int(actions[i]), int(opp_actions[i])
+                    )
+                    done = terminated or truncated
+                    if done:
+                        terminal_obs[i] = ob
+                        ob, _ = env.reset()
+                    obs[i] = ob
+                    rewards[i] = reward
+                    dones[i] = done
+                remote.send(None)
+            elif cmd == "reset":
+                for k, (i, env) in enumerate(zip(range(env_slice.start, env_slice.stop), envs)):
+                    obs[i], _ = env.reset(seed=None if data is None else data + k)
+                remote.send(None)
+            elif cmd == "close":
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for env in envs:
+            env.close()
+        remote.close()
+
+
+def _as_arrays(buffers):
+    actions, opp_actions, obs, terminal_obs, rewards, dones = buffers
+    return (
+        np.frombuffer(actions, dtype=np.int64),
+        np.frombuffer(opp_actions, dtype=np.int64),
+        np.frombuffer(obs, dtype=np.float32).reshape(-1, 6),
+        np.frombuffer(terminal_obs, dtype=np.float32).reshape(-1, 6),
+        np.frombuffer(rewards, dtype=np.float32),
+        np.frombuffer(dones, dtype=np.bool_),
+    )
+
+
+class SharedMemVecEnv(VecEnv):
+    metadata = {"render_modes": [], "render_fps": 60}
+    render_mode = None
+
+    def __init__(self, num_envs=64, n_workers=None, opponent_model=None, start_method=None, seed=None,
+                 **env_kwargs):
+        """
+        num_envs:   total number of SelfPlayEnv games, split across workers.
+        n_workers:  worker processes (default: one per CPU, capped at num_envs).
+        env_kwargs: passed to every SelfPlayEnv / PongEnv (e.g. backend="local").
+        """
+        if n_workers is None:
+            n_workers = mp.cpu_count()
+        n_workers = max(1, min(n_workers, num_envs))
+
+        # Same spaces as PongEnv
+        observation_space = spaces.Box(
+            low=np.array([0, 0, -20, -20, 0, 0], dtype=np.float32),
+            high=np.array([800, 600, 20, 20, 600, 600], dtype=np.float32),
+            dtype=np.float32,
+        )
+        super().__init__(num_envs, observation_space, spaces.Discrete(3))
+
+        # Shared arrays: lock-free, each worker only touches its own slice
+        buffers = (
+            mp.RawArray("b", num_envs * 8),       # int64 actions
+            mp.RawArray("b", num_envs * 8),       # int64 opponent actions
+            mp.RawArray("f", num_envs * 6),       # float32 obs
+            mp.RawArray("f", num_envs * 6),       # float32 terminal obs
+            mp.RawArray("f", num_envs),           # float32 rewards
+            mp.RawArray("b", num_envs),           # bool dones
+        )
+        (self._actions, self._opp_actions, self._obs, self._terminal_obs,
+         self._rewards, self._dones) = _as_arrays(buffers)
+        self.opponent_model = opponent_model  # None → random opponent
+        self._rng = np.random.default_rng(seed)
+
+        if start_method is None:
+            # forkserver is safe with threads (torch); fork is not
+            start_method = "forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn"
+        ctx = mp.get_context(start_method)
+
+        self.n_workers = n_workers
+        self._bounds = bounds = np.linspace(0, num_envs, n_workers + 1).astype(int)
+        self.remotes, self.processes = [], []
+        for w in range(n_workers):
+            remote, work_remote = ctx.Pipe()
+            env_slice = slice(int(bounds[w]), int(bounds[w + 1]))
+            process = ctx.Process(
+                target=_worker,
+                args=(work_remote, remote, env_slice, env_kwargs, buffers),
+                daemon=True,
+            )
+            process.start()
+            work_remote.close()
+            self.remotes.append(remote)
+            self.processes.append(process)
+        self.closed = False
+        if seed is not None:
+            self.seed(seed)
+        print(f"[SharedMemVecEnv] {num_envs} envs on {n_workers} worker processes")
+
+    def set_opponent(self, model):
+        """Replace the frozen opponent policy (called by UpdateOpponentCallback)."""
+        self.opponent_model = model
+
+    # ---- VecEnv API ----
+
+    def reset(self):
+        seed = self._seeds[0]
+        for w, remote in enumerate(self.remotes):
+            remote.send(("reset", None if seed is None else seed + int(self._bounds[w])))
+        for remote in self.remotes:
+            remote.recv()
+        self._reset_seeds()
+        self._reset_options()
+        return self._obs.copy()
+
+    def step_async(self, actions):
+        self._actions[:] = np.asarray(actions, dtype=np.int64).reshape(self.num_envs)
+        # _obs holds every env's current (post auto-reset) observation
+        self._opp_actions[:] = opponent_actions(self.opponent_model, self._obs, self._rng)
+        for remote in self.remotes:
+            remote.send(("step", None))
+
+    def step_wait(self):
+        for remote in self.remotes:
+            remote.recv()
+        dones = self._dones.copy()
+        rewards = self._rewards.copy()
+        done_idx = np.flatnonzero(dones)
+        opponent_episodes_end(self.opponent_model, done_idx, rewards[done_idx])
+        infos = [{} for _ in range(self.num_envs)]
+        for i in done_idx:
+            infos[i]["terminal_observation"] = self._terminal_obs[i].copy()
+            infos[i]["TimeLimit.truncated"] = False
+        return self._obs.copy(), rewards, dones, infos
+
+    def close(self):
+        if self.closed:
+            return
+        for remote in self.remotes:
+            remote.send(("close", None))
+        for process in self.processes:
+            process.join()
+        self.closed = True
+
+    def get_attr(self, attr_name, indices=None):
+        return [getattr(self, attr_name) for _ in self._get_indices(indices)]
+
+    def set_attr(self, attr_name, value, indices=None):
+        setattr(self, attr_name, value)
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        method = getattr(self, method_name)
+        return [method(*method_args, **method_kwargs) for _ in self._get_indices(indices)]
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False for _ in self._get_indices(indices)]
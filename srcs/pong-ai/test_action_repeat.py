@@ -0,0 +1,83 @@
+"""
+Unit tests for the frame-skip decision rate (action_repeat.py)
+
+Run with: pytest test_action_repeat.py -v
+"""
+import asyncio
+import time
+
+from action_repeat import ActionRepeat, ServerLoad
+
+
+def _decisions(repeat, frames):
+    return [frame for frame in frames if repeat.should_decide(frame)]
+
+
+class TestActionRepeat:
+    """Tests for ActionRepeat"""
+
+    def test_matches_training_frame_skip(self):
+        """The default interval should be pong_env's FRAME_SKIP"""
+        from pong_env import FRAME_SKIP
+
+        assert ActionRepeat(load=ServerLoad()).interval() == FRAME_SKIP
+
+    def test_repeats_between_decisions(self):
+        """Only every frame_skip-th frame should get a decision"""
+        repeat = ActionRepeat(frame_skip=4, load=ServerLoad())
+
+        assert _decisions(repeat, range(1, 13)) == [1, 5, 9]
+        assert repeat.decisions == 3
+        assert repeat.repeats == 9
+
+    def test_dropped_frames_count_towards_interval(self):
+        """Gaps in frame numbers should not stretch the hold time"""
+        repeat = ActionRepeat(frame_skip=4, load=ServerLoad())
+
+        assert _decisions(repeat, [1, 3, 6, 7, 11]) == [1, 6, 11]
+
+    def test_reset_decides_next_frame(self):
+        """After a pause the first frame should get a decision"""
+        repeat = ActionRepeat(frame_skip=4, load=ServerLoad())
+        repeat.should_decide(1)
+        repeat.reset()
+
+        assert repeat.should_decide(2)
+
+    def test_widens_with_sessions(self):
+        """More sessions than the threshold should scale the interval"""
+        load = ServerLoad()
+        repeat = ActionRepeat(frame_skip=4, max_frame_skip=12, load=load)
+
+        load.sessions = 32
+        assert repeat.interval() == 4
+        load.sessions = 48
+        assert repeat.interval() == 6
+        load.sessions = 500
+        assert repeat.interval() == 12
+
+    def test_widens_with_loop_lag(self):
+        """Event-loop lag past the threshold should scale the interval"""
+        load = ServerLoad()
+        repeat = ActionRepeat(frame_skip=4, max_frame_skip=12, load=load)
+
+        load.lag = 0.020
+        assert load.pressure(lag_threshold=0.010) == 2
+        assert repeat.interval() == 8
+
+
+class TestServerLoad:
+    """Tests for the event-loop lag monitor"""
+
+    def test_measures_blocked_loop(self):
+        """A loop blocked by synchronous work should show up as lag"""
+        load = ServerLoad(period=0.01, smoothing=1.0)
+
+        async def run():
+            load.start()
+            await asyncio.sleep(0.005)
+            time.sleep(0.05)  # blocks the loop past the monitor's wake-up
+            await asyncio.sleep(0.001)  # lets the overdue monitor run once
+            return load.lag
+
+        assert asyncio.run(run()) > 0.02
@@ -0,0 +1,158 @@
+"""
+Unit tests for the AI player's receive loop (ai_player.py)
+
+Run with: pytest test_ai_player.py -v
+"""
+import asyncio
+import json
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+import ai_player
+from action_repeat import ActionRepeat, ServerLoad
+from ai_player import AIPlayer
+
+
+def _state(x, status="playing"):
+    return json.dumps({"type": "state", "data": {
+        "ball": {"x": x, "y": 300, "vx": 5, "vy": 0},
+        "paddles": {"left": {"y": 250, "height": 100}, "right": {"y": 250, "height": 100}},
+        "status": status,
+        "cosmicBackground": [[0.0, 0.1], [0.2, 0.3]],
+    }})
+
+
+class FakeWebSocket:
+    """Delivers a fixed list of messages, all already buffered unless paced"""
+
+    def __init__(self, messages, interval=None):
+        self.messages = list(messages)
+        self.interval = interval
+        self.state = Mock()
+        self.state.name = "OPEN"
+        self.send = AsyncMock()
+        self.close = AsyncMock()
+
+    async def __aiter__(self):
+        for raw in self.messages:
+            if self.interval is not None:
+                await asyncio.sleep(self.interval)
+            yield raw
+
+
+@pytest.fixture
+def player():
+    with patch("ai_player.get_model"):
+        return AIPlayer("models/best_model", game_service_url="ws://game-service:3003")
+
+
+def _play(player, messages, interval=None):
+    websocket = FakeWebSocket(messages, interval)
+
+    async def connect(session_id):
+        player.websocket = websocket
+        return True
+
+    def decide(obs, received_at):
+        # obs is the player's reused buffer: keep the ball x seen at decision time
+        decided.append(float(obs[0]))
+        return "up"
+
+    decided = player.decided = []
+    player.connect = connect
+    player._decide = AsyncMock(side_effect=decide)
+    asyncio.run(player.play("session"))
+    return websocket
+
+
+class TestReceiveLoop:
+    """Tests for latest-frame-wins state handling"""
+
+    def test_only_newest_buffered_state_is_decided(self, player):
+        """Stale state frames queued behind a newer one should be dropped"""
+        _play(player, [_state(100), _state(200), _state(300), json.dumps({"type": "gameOver"})])
+
+        player._decide.assert_awaited_once()
+        assert player.decided == [300]
+        assert player.frames_received == 3
+        assert player.frames_dropped == 2
+
+    def test_control_messages_kept_in_order(self, player):
+        """connected and ready_check should still be handled before the state"""
+        websocket = _play(player, [
+            json.dumps({"type": "connected", "player": {"role": "A"}}),
+            _state(100),
+            json.dumps({"type": "ready_check"}),
+            _state(200),
+            json.dumps({"type": "error", "message": "boom"}),
+        ])
+
+        sent = [json.loads(call.args[0]) for call in websocket.send.await_args_list]
+        assert sent[1] == {"type": "ready"}
+        assert sent[2] == {"type": "paddle", "paddle": "left", "direction": "up"}
+        assert player.frames_dropped == 1
+        assert player.playing is False
+
+    def test_closed_socket_ends_play(self, player):
+        """The loop should stop once the reader has drained a closed socket"""
+        _play(player, [_state(100)])
+
+        player._decide.assert_awaited_once()
+        assert player.websocket is None
+
+    def test_process_wide_counters(self, player):
+        """Dropped frames should be added to the shared frame_counters"""
+        before = dict(ai_player.frame_counters)
+        _play(player, [_state(100), _state(200)])
+
+        assert ai_player.frame_counters["received"] - before["received"] == 2
+        assert ai_player.frame_counters["dropped"] - before["dropped"] == 1
+
+
+class TestActionRepeat:
+    """Tests for the frame-skip decision rate in play()"""
+
+    def test_decides_every_frame_skip_frames(self, player):
+        """Paced frames should get one decision per FRAME_SKIP frames"""
+        player.action_repeat = ActionRepeat(frame_skip=4, load=ServerLoad())
+        _play(player, [_state(x) for x in range(8)], interval=0.001)
+
+        assert player.frames_dropped == 0
+        assert player.decided == [0, 4]
+        assert player.action_repeat.repeats == 6
+
+
+class TestFirstDecision:
+    """Tests for the first-frame latency measurement"""
+
+    def test_first_decision_latency_recorded_once(self, player):
+        """Only the session's first decision should be timed and recorded"""
+        before = ai_player.first_decision_delay.summary()["count"]
+        _play(player, [_state(100), _state(200), json.dumps({"type": "gameOver"})], interval=0.001)
+
+        assert player.first_decision_latency is not None and player.first_decision_latency >= 0
+        assert ai_player.first_decision_delay.summary()["count"] == before + 1
+
+
+class TestHotLoop:
+    """Tests for the allocation-free per-frame path"""
+
+    def test_observation_buffer_reused(self, player):
+        """Every frame should be written into the same observation array"""
+        first = player._extract_observation(json.loads(_state(100))["data"])
+        second = player._extract_observation(json.loads(_state(200))["data"])
+
+        assert first is second
+        assert second.tolist() == [200, 300, 5, 0, 300, 300]
+
+    def test_malformed_state_uses_default_observation(self, player):
+        """Missing fields should fall back to the centred default"""
+        obs = player._extract_observation({"ball": {"x": 1}})
+
+        assert obs.tolist() == [400, 300, 0, 0, 300, 300]
+
+    def test_paddle_messages_match_json(self):
+        """Pre-encoded paddle messages should be the JSON the server expects"""
+        for (paddle, direction), raw in ai_player.PADDLE_MESSAGES.items():
+            assert json.loads(raw) == {"type": "paddle", "paddle": paddle, "direction": direction}
@@ -0,0 +1,53 @@
+"""
+Unit tests for the state-frame decoder (frame_decoder.py)
+
+Run with: pytest test_frame_decoder.py -v
+"""
+import json
+
+import pytest
+
+from bench_decoder import synthetic_frames
+from frame_decoder import decode_message
+
+
+def _expected(raw):
+    message = json.loads(raw)
+    if "cosmicBackground" in message.get("data", {}):
+        message["data"]["cosmicBackground"] = None
+    return message
+
+
+class TestDecodeMessage:
+    """Tests for decode_message"""
+
+    def test_matches_json_loads_on_state_frames(self):
+        """Every field but the grid should decode exactly like json.loads"""
+        for frame in synthetic_frames(count=20):
+            assert decode_message(frame) == _expected(frame)
+
+    def test_accepts_bytes(self):
+        """Binary WebSocket messages should decode too"""
+        frame = synthetic_frames(count=1)[0]
+        assert decode_message(frame.encode()) == _expected(frame)
+
+    @pytest.mark.parametrize("raw", [
+        '{"type": "ready_check"}',
+        '{"type": "connected", "player": {"role": "B"}}',
+        '{"type": "state", "data": {"status": "playing", "cosmicBackground": null}}',
+        '{"type": "state", "data": {"cosmicBackground": [], "status": "waiting"}}',
+    ])
+    def test_control_and_empty_grid_messages(self, raw):
+        """Messages without a grid should be returned unchanged"""
+        assert decode_message(raw) == _expected(raw)
+
+    def test_grid_not_last_field(self):
+        """Fields after the grid, including other nested lists, should survive"""
+        raw = ('{"type": "state", "data": {"cosmicBackground": [[0.1, 0.2], [0.3]], '
+               '"status": "playing", "trail": [[1, 2]]}}')
+        assert decode_message(raw) == _expected(raw)
+
+    def test_unexpected_grid_shape_falls_back(self):
+        """A grid the fast path cannot skip should still decode via json.loads"""
+        raw = '{"type": "state", "data": {"cosmicBackground": [[[1]], [[2]]], "status": "playing"}}'
+        assert decode_message(raw) == _expected(raw)
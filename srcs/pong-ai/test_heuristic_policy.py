@@ -0,0 +1,132 @@
+"""
+Unit tests for the analytic intercept policy (heuristic_policy.py)
+
+Run with: pytest test_heuristic_policy.py -v
+"""
+import os
+
+import numpy as np
+import pytest
+
+from heuristic_policy import DOWN, STOP, UP, InterceptPolicy, intercept_y
+from numpy_policy import NumpyPolicy
+from pong_env import FRAME_SKIP
+from pong_sim import ACTIONS, WIDTH, PongSim
+
+MODEL_ZIP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "best_model.zip")
+
+
+class TestInterceptY:
+    """Tests for the wall-folded intercept"""
+
+    def test_straight_line(self):
+        """Without a wall hit the intercept is the linear extrapolation"""
+        assert intercept_y(400, 300, 5, 1, 500) == pytest.approx(320)
+
+    def test_reflects_off_walls(self):
+        """Paths leaving the field should be folded back at the walls"""
+        # Bottom wall: 300 + 400 = 700 -> 595 - 105 = 490
+        assert intercept_y(400, 300, 5, 5, 800) == pytest.approx(490)
+        # Top wall: 300 - 400 = -100 -> 5 + 105 = 110
+        assert intercept_y(400, 300, 5, -5, 800) == pytest.approx(110)
+
+    def test_matches_simulated_bounce(self):
+        """The prediction should match PongSim's rigid-body bounces"""
+        sim = PongSim(seed=3, cosmic_noise=False)
+        sim.ball_x, sim.ball_y, sim.vel_x, sim.vel_y = 100.0, 200.0, 3.0, 4.0
+        predicted = intercept_y(100, 200, 3, 4, 700)
+        while sim.ball_x < 700:
+            sim.update()
+        assert sim.ball_y == pytest.approx(predicted, abs=abs(sim.vel_y) + 1)
+
+
+class TestInterceptPolicy:
+    """Tests for InterceptPolicy"""
+
+    def test_moves_towards_intercept(self):
+        """The paddle should head for the predicted crossing"""
+        policy = InterceptPolicy()
+        assert policy.act(np.array([400, 300, 5, 2, 300, 300])) == DOWN
+        assert policy.act(np.array([400, 300, 5, -2, 300, 300])) == UP
+        assert policy.act(np.array([400, 300, 5, 0, 300, 300])) == STOP
+
+    def test_left_paddle(self):
+        """Controlling the left paddle should use obs[4] and negative vx"""
+        policy = InterceptPolicy()
+        assert policy.act(np.array([400, 300, -5, 2, 300, 100]), paddle="left") == DOWN
+        assert policy.act(np.array([400, 300, -5, 0, 100, 300]), paddle="left") == DOWN
+
+    def test_recentres_when_ball_leaves(self):
+        """A receding ball should send the paddle back to the middle"""
+        assert InterceptPolicy().act(np.array([400, 300, -5, 2, 300, 100])) == DOWN
+
+    def test_noise_drawn_once_per_approach(self):
+        """The aim error should stay fixed during one approach"""
+        policy = InterceptPolicy(noise=50, seed=0)
+        obs = np.array([400, 300, 5, 1, 300, 300], dtype=np.float64)
+        first = policy.target(obs)
+        obs[0] = 500
+        assert policy.target(obs) - intercept_y(500, 300, 5, 1, 765) == pytest.approx(
+            first - intercept_y(400, 300, 5, 1, 765))
+
+    def test_predict_batch(self):
+        """predict() should return one action per row"""
+        obs = np.array([[400, 300, 5, 2, 300, 300], [400, 300, 5, -2, 300, 300]], dtype=np.float32)
+        actions, _ = InterceptPolicy().predict(obs)
+        assert actions.tolist() == [DOWN, UP]
+
+    def test_returns_serves(self):
+        """With noise off it should win against a random opponent"""
+        sim = PongSim(seed=1)
+        sim.status = "playing"
+        policy = InterceptPolicy()
+        rng = np.random.default_rng(1)
+        obs = np.empty(6, dtype=np.float32)
+        while sim.status != "finished":
+            sim.rl_step(ACTIONS[policy.act(sim.observation(obs))], ACTIONS[rng.integers(3)])
+        assert sim.score_right > sim.score_left
+
+
+def _mirrored(obs):
+    """The observation seen from the left paddle, as the right-paddle model expects it"""
+    mirrored = obs.copy()
+    mirrored[0], mirrored[2] = WIDTH - obs[0], -obs[2]
+    mirrored[4], mirrored[5] = obs[5], obs[4]
+    return mirrored
+
+
+class TestModelCalibration:
+    """Tests pinning the "model" difficulty to the shipped model's strength"""
+
+    @staticmethod
+    def _point_share(policy, model, points=400, seed=0):
+        """Share of points the policy (right) wins against the model (left, mirrored)"""
+        sim = PongSim(seed=seed, settings={"maxScore": 10**6})
+        sim.status = "playing"
+        obs = np.empty(6, dtype=np.float32)
+        won = lost = tick = 0
+        while won + lost < points:
+            if tick % FRAME_SKIP == 0:
+                sim.observation(obs)
+                sim.set_paddle_direction("right", ACTIONS[policy.act(obs)])
+                sim.set_paddle_direction("left", ACTIONS[model.act(_mirrored(obs))])
+            left, right = sim.score_left, sim.score_right
+            sim.update()
+            tick += 1
+            won += sim.score_right - right
+            lost += sim.score_left - left
+        return won / points
+
+    def test_model_difficulty_matches_the_model(self):
+        """At "model" the fallback should win about half the points against best_model"""
+        model = NumpyPolicy.from_zip(MODEL_ZIP)
+
+        share = self._point_share(InterceptPolicy.for_difficulty("model", seed=0), model)
+
+        assert 0.35 < share < 0.65
+
+    def test_hard_outplays_the_model(self):
+        """Without aim error the policy should win nearly every point, too strong for a fallback"""
+        model = NumpyPolicy.from_zip(MODEL_ZIP)
+
+        assert self._point_share(InterceptPolicy.for_difficulty("hard", seed=0), model, points=100) > 0.9
@@ -0,0 +1,124 @@
+"""
+Unit tests for the cross-session batched inference scheduler (inference_scheduler.py)
+
+Run with: pytest test_inference_scheduler.py -v
+"""
+import asyncio
+from unittest.mock import Mock
+
+import numpy as np
+
+from inference_scheduler import BatchInferenceScheduler
+
+
+def _model():
+    """A model whose action is the observation's first feature"""
+    model = Mock(spec=["predict"])
+    model.predict.side_effect = lambda obs, deterministic: (obs[..., 0].astype(np.int64), None)
+    return model
+
+
+def _obs(value):
+    return np.full(6, value, dtype=np.float32)
+
+
+class TestBatchInferenceScheduler:
+    """Tests for BatchInferenceScheduler"""
+
+    def test_sessions_share_one_forward_pass(self):
+        """Observations submitted within the window should run as one batch"""
+        model = _model()
+        scheduler = BatchInferenceScheduler(model, max_batch=64, flush_window=0.002)
+
+        async def run():
+            return await asyncio.gather(*(scheduler.predict(_obs(i % 3)) for i in range(10)))
+
+        actions = asyncio.run(run())
+
+        assert actions == [i % 3 for i in range(10)]
+        assert model.predict.call_count == 1
+        assert model.predict.call_args.args[0].shape == (10, 6)
+
+    def test_full_batch_flushes_immediately(self):
+        """Reaching max_batch should flush without waiting for the window"""
+        model = _model()
+        scheduler = BatchInferenceScheduler(model, max_batch=4, flush_window=60)
+
+        async def run():
+            return await asyncio.wait_for(
+                asyncio.gather(*(scheduler.predict(_obs(1)) for _ in range(8))), timeout=1
+            )
+
+        assert asyncio.run(run()) == [1] * 8
+        assert model.predict.call_count == 2
+        assert scheduler.stats()["mean_batch_size"] == 4
+
+    def test_errors_reach_every_waiting_session(self):
+        """A failing predict should raise in each submitter"""
+        model = Mock()
+        model.predict.side_effect = RuntimeError("boom")
+        scheduler = BatchInferenceScheduler(model, flush_window=0.001)
+
+        async def run():
+            return await asyncio.gather(
+                scheduler.predict(_obs(0)), scheduler.predict(_obs(1)), return_exceptions=True
+            )
+
+        results = asyncio.run(run())
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    def test_ai_player_uses_scheduler(self, monkeypatch):
+        """AIPlayer should route its decisions through the shared scheduler"""
+        import ai_player
+
+        monkeypatch.setattr(ai_player, "get_model", lambda path: Mock(spec=["predict"]))
+        model = _model()
+        player = ai_player.AIPlayer("models/best_model", scheduler=BatchInferenceScheduler(model))
+
+        action = asyncio.run(player._decide(_obs(2)))
+
+        assert action == "down"
+        assert model.predict.call_count == 1
+
+
+class TestInferencePool:
+    """Tests for running policy evaluation off the event loop"""
+
+    def test_batch_runs_on_inference_thread(self):
+        """With an executor the forward pass should not run on the loop thread"""
+        import threading
+        from inference_pool import get_executor
+
+        threads = []
+        model = Mock()
+
+        def predict(obs, deterministic):
+            threads.append(threading.current_thread().name)
+            return np.zeros(len(obs), dtype=np.int64), None
+
+        model.predict.side_effect = predict
+        scheduler = BatchInferenceScheduler(model, flush_window=0.001, executor=get_executor())
+
+        async def run():
+            return await asyncio.gather(scheduler.predict(_obs(0)), scheduler.predict(_obs(0)))
+
+        assert asyncio.run(run()) == [0, 0]
+        assert threads and threads[0].startswith("inference")
+
+    def test_queue_delay_recorded(self, monkeypatch):
+        """Unbatched decisions should run on the pool and record their queue delay"""
+        import time
+        import ai_player
+        from inference_pool import queue_delay
+
+        monkeypatch.setattr(ai_player, "get_model", lambda path: _model())
+        player = ai_player.AIPlayer("models/best_model")
+        queue_delay.reset()
+
+        action = asyncio.run(player._decide(_obs(1), time.perf_counter() - 0.05))
+
+        assert action == "up"
+        summary = queue_delay.summary()
+        assert summary["count"] == 1
+        assert summary["max_ms"] >= 50
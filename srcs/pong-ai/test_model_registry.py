@@ -0,0 +1,162 @@
+"""
+Unit tests for the process-wide model registry (model_registry.py)
+
+Run with: pytest test_model_registry.py -v
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import pytest
+
+from model_registry import ModelRegistry
+
+
+@pytest.fixture
+def model_file(tmp_path):
+    path = tmp_path / "model.zip"
+    path.write_bytes(b"v1")
+    return path
+
+
+class TestModelRegistry:
+    """Tests for ModelRegistry caching"""
+
+    def test_loads_each_model_once(self, model_file):
+        """Repeated gets should share one loaded instance"""
+        loader = Mock(side_effect=lambda path: object())
+        registry = ModelRegistry(loader)
+
+        first = registry.get(str(model_file)[:-len(".zip")])
+        second = registry.get(str(model_file))
+
+        assert first is second
+        loader.assert_called_once()
+
+    def test_reloads_when_file_changes(self, model_file):
+        """A newer mtime should load the new file and drop the stale entry"""
+        loader = Mock(side_effect=lambda path: object())
+        registry = ModelRegistry(loader)
+
+        old = registry.get(str(model_file))
+        os.utime(model_file, (1, 1))
+        new = registry.get(str(model_file))
+
+        assert new is not old
+        assert loader.call_count == 2
+        assert len(registry.loaded()) == 1
+
+    def test_load_errors_are_not_cached(self, model_file):
+        """A failed load should be retried on the next get"""
+        loader = Mock(side_effect=[Exception("boom"), "model"])
+        registry = ModelRegistry(loader)
+
+        with pytest.raises(Exception):
+            registry.get(str(model_file))
+
+        assert registry.get(str(model_file)) == "model"
+
+    def test_load_does_not_hold_the_lock(self, model_file):
+        """resident() should answer while a slow load runs on another thread"""
+        release = threading.Event()
+        registry = ModelRegistry(lambda path: release.wait(5) and Mock(nbytes=1))
+
+        with ThreadPoolExecutor(1) as pool:
+            loading = pool.submit(registry.get, str(model_file))
+            time.sleep(0.05)
+            started = time.perf_counter()
+            assert registry.resident() == []
+            assert time.perf_counter() - started < 0.1
+            release.set()
+            assert loading.result().nbytes == 1
+
+    def test_concurrent_gets_share_one_load(self, model_file):
+        """Gets racing on the same file should wait for the single load in flight"""
+        def slow_load(path):
+            time.sleep(0.1)
+            return object()
+        loader = Mock(side_effect=slow_load)
+        registry = ModelRegistry(loader)
+
+        with ThreadPoolExecutor(4) as pool:
+            models = list(pool.map(lambda _: registry.get(str(model_file)), range(4)))
+
+        assert all(model is models[0] for model in models)
+        loader.assert_called_once()
+
+    def test_ai_players_share_the_model(self, monkeypatch):
+        """AIPlayer instances should borrow the registered model"""
+        import ai_player
+        import model_registry
+
+        registry = ModelRegistry(Mock(side_effect=lambda path: object()))
+        monkeypatch.setattr(model_registry, "registry", registry)
+
+        first = ai_player.AIPlayer("models/best_model")
+        second = ai_player.AIPlayer("models/best_model")
+
+        assert first.model is second.model
+
+
+    def test_ai_player_uses_given_model(self, monkeypatch):
+        """A model passed to AIPlayer should be used without a registry lookup"""
+        import ai_player
+        import model_registry
+
+        registry = Mock()
+        monkeypatch.setattr(model_registry, "registry", registry)
+        model = object()
+
+        player = ai_player.AIPlayer("models/best_model", model=model)
+
+        assert player.model is model
+        registry.get.assert_not_called()
+
+class TestMemoryBudget:
+    """Tests for the LRU memory budget of the model zoo"""
+
+    @staticmethod
+    def _models(tmp_path, names):
+        for name in names:
+            (tmp_path / f"{name}.zip").write_bytes(b"model")
+        return [str(tmp_path / name) for name in names]
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """Past the budget the least recently used model should be dropped"""
+        loader = Mock(side_effect=lambda path: Mock(nbytes=100))
+        registry = ModelRegistry(loader, memory_budget=250)
+        easy, medium, hard = self._models(tmp_path, ["easy", "medium", "hard"])
+
+        registry.get(easy)
+        registry.get(medium)
+        registry.get(easy)  # medium is now the least recently used
+        registry.get(hard)
+
+        assert [m["path"] for m in registry.resident()] == [easy + ".zip", hard + ".zip"]
+        assert all(m["bytes"] == 100 for m in registry.resident())
+
+    def test_evicted_model_reloads_and_survives_in_sessions(self, tmp_path):
+        """An evicted model should stay usable by its holders and reload on the next get"""
+        loader = Mock(side_effect=lambda path: Mock(nbytes=100))
+        registry = ModelRegistry(loader, memory_budget=150)
+        first, second = self._models(tmp_path, ["first", "second"])
+
+        held = registry.get(first)
+        registry.get(second)
+        reloaded = registry.get(first)
+
+        assert held.nbytes == 100
+        assert reloaded is not held
+        assert loader.call_count == 3
+
+    def test_keeps_a_model_larger_than_the_budget(self, tmp_path):
+        """A single model over the budget should still be served and cached"""
+        loader = Mock(side_effect=lambda path: Mock(nbytes=1000))
+        registry = ModelRegistry(loader, memory_budget=10)
+        (path,) = self._models(tmp_path, ["big"])
+
+        assert registry.get(path) is registry.get(path)
+        loader.assert_called_once()
+
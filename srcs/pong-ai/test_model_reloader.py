@@ -0,0 +1,209 @@
+"""
+Unit tests for hot model reloading (model_reloader.py)
+
+Run with: pytest test_model_reloader.py -v
+"""
+import asyncio
+import os
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+from ai_player import AIPlayer
+from action_repeat import ActionRepeat
+from model_registry import ModelRegistry
+from model_reloader import ModelReloader, warm_up
+
+
+class _Model:
+    """Predicts a constant action for every observation"""
+
+    def __init__(self, action=0):
+        self.action = action
+
+    def predict(self, obs, deterministic=True):
+        obs = np.asarray(obs)
+        return np.full(len(obs), self.action), None
+
+    def act(self, obs):
+        return self.action
+
+
+@pytest.fixture
+def model_file(tmp_path):
+    path = tmp_path / "best_model.zip"
+    path.write_bytes(b"v1")
+    os.utime(path, (1, 1))
+    return path
+
+
+def _reloader(model_file, loader, **kwargs):
+    registry = ModelRegistry(loader)
+    base = str(model_file)[:-len(".zip")]
+    return ModelReloader(base, registry.get(base), loader, interval=0, registry=registry, **kwargs)
+
+
+def _deploy(model_file, mtime=2):
+    model_file.write_bytes(b"v2")
+    os.utime(model_file, (mtime, mtime))
+
+
+class TestWarmUp:
+    """Tests for the warm-up validation"""
+
+    def test_accepts_valid_actions(self):
+        """A model returning actions in 0..2 should pass"""
+        warm_up(_Model(2))
+
+    def test_rejects_out_of_range_actions(self):
+        """A model returning an unknown action should be refused"""
+        with pytest.raises(ValueError):
+            warm_up(_Model(7))
+
+
+class TestModelReloader:
+    """Tests for watching, validating and swapping the model"""
+
+    def test_swaps_after_file_settles(self, model_file):
+        """A new file should be loaded one poll after its mtime stopped changing"""
+        loader = Mock(side_effect=lambda path: _Model())
+        reloader = _reloader(model_file, loader)
+        old = reloader.model
+
+        _deploy(model_file)
+        assert not asyncio.run(reloader.check())  # still settling
+        assert asyncio.run(reloader.check())
+
+        assert reloader.model is not old
+        assert reloader.version == 2
+        # Installed in the registry: new games get it without another load
+        assert reloader.registry.get(reloader.path) is reloader.model
+        assert loader.call_count == 2
+
+    def test_unchanged_file_is_not_reloaded(self, model_file):
+        """Polls of an unchanged file should not load anything"""
+        loader = Mock(side_effect=lambda path: _Model())
+        reloader = _reloader(model_file, loader)
+
+        assert not asyncio.run(reloader.check())
+        assert not asyncio.run(reloader.check())
+        loader.assert_called_once()
+
+    def test_rejected_version_keeps_old_model(self, model_file):
+        """A model failing warm-up should be logged, skipped and not retried"""
+        loader = Mock(side_effect=[_Model(), _Model(7)])
+        reloader = _reloader(model_file, loader)
+        old = reloader.model
+
+        _deploy(model_file)
+        for _ in range(4):
+            assert not asyncio.run(reloader.check())
+
+        assert reloader.model is old
+        assert reloader.version == 1
+        assert "Invalid warm-up actions" in reloader.stats()["last_error"]
+        assert loader.call_count == 2
+
+    def test_installs_first_model(self, tmp_path):
+        """Without a model, the first file deployed should be loaded and installed as version 1"""
+        loader = Mock(side_effect=lambda path: _Model())
+        base = str(tmp_path / "best_model")
+        reloader = ModelReloader(base, None, loader, interval=0, registry=ModelRegistry(loader))
+
+        assert not asyncio.run(reloader.check())
+        (tmp_path / "best_model.zip").write_bytes(b"v1")
+        assert not asyncio.run(reloader.check())  # still settling
+        assert asyncio.run(reloader.check())
+
+        assert reloader.model is not None
+        assert reloader.version == 1
+
+    def test_file_failing_at_start_is_not_retried(self, model_file):
+        """Without a model, the file that failed at start should wait for a new version"""
+        loader = Mock(side_effect=lambda path: _Model())
+        base = str(model_file)[:-len(".zip")]
+        reloader = ModelReloader(base, None, loader, interval=0, registry=ModelRegistry(loader))
+
+        for _ in range(3):
+            assert not asyncio.run(reloader.check())
+        loader.assert_not_called()
+
+        _deploy(model_file)
+        asyncio.run(reloader.check())
+        assert asyncio.run(reloader.check())
+
+    def test_new_scheduler_with_new_model(self, model_file):
+        """make_scheduler should be called for the initial and each swapped model"""
+        make_scheduler = Mock(side_effect=lambda model: ("scheduler", model))
+        reloader = _reloader(model_file, Mock(side_effect=lambda path: _Model()), make_scheduler=make_scheduler)
+
+        _deploy(model_file)
+        asyncio.run(reloader.check())
+        asyncio.run(reloader.check())
+
+        assert reloader.scheduler == ("scheduler", reloader.model)
+        assert make_scheduler.call_count == 2
+
+
+def _frame(left, right, status="playing"):
+    return {"type": "state", "data": {
+        "ball": {"x": 400, "y": 300, "vx": 5, "vy": 0},
+        "paddles": {"left": {"y": 250, "height": 100}, "right": {"y": 250, "height": 100}},
+        "scores": {"left": left, "right": right},
+        "status": status,
+    }}
+
+
+class TestSessionSwitch:
+    """Tests for when a running session moves to a reloaded model"""
+
+    @staticmethod
+    def _player(switch):
+        reloader = Mock(model=_Model(1), scheduler=None, switch=switch, version=1)
+        player = AIPlayer("models/best_model", game_service_url="ws://game-service:3003",
+                          action_repeat=ActionRepeat(frame_skip=1), reloader=reloader)
+        return player, reloader
+
+    @staticmethod
+    def _feed(player, frames):
+        async def decide(obs, received_at):
+            return "up"
+        player._decide = decide
+
+        async def run():
+            for frame in frames:
+                player.frames_received += 1
+                await player._on_state(frame, 0.0)
+        asyncio.run(run())
+
+    def test_game_policy_keeps_weights_until_the_end(self):
+        """With switch=game a session should never change model mid-game"""
+        player, reloader = self._player("game")
+        old = player.model
+        reloader.model = _Model(2)
+
+        self._feed(player, [_frame(0, 0), _frame(1, 0), _frame(1, 0, status="paused")])
+
+        assert player.model is old
+
+    def test_point_policy_switches_after_the_rally(self):
+        """With switch=point a session should change model once the score moves"""
+        player, reloader = self._player("point")
+        reloader.model = new = _Model(2)
+
+        self._feed(player, [_frame(0, 0), _frame(0, 0)])
+        assert player.model is not new
+
+        self._feed(player, [_frame(1, 0)])
+        assert player.model is new
+        assert player._act == new.act
+
+    def test_point_policy_switches_when_paused(self):
+        """With switch=point a pause should be a safe point"""
+        player, reloader = self._player("point")
+        reloader.model = new = _Model(2)
+
+        self._feed(player, [_frame(0, 0, status="paused")])
+
+        assert player.model is new
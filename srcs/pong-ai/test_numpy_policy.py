@@ -0,0 +1,118 @@
+"""
+Unit tests for the torch-free policy forward pass (numpy_policy.py)
+
+Run with: pytest test_numpy_policy.py -v
+"""
+import numpy as np
+import pytest
+from stable_baselines3 import PPO
+
+from numpy_policy import NumpyPolicy
+from pong_env import PongEnv
+
+
+@pytest.fixture(scope="module")
+def model():
+    """A small untrained PPO model on the local backend"""
+    return PPO("MlpPolicy", PongEnv(backend="local"), n_steps=64, batch_size=64, device="cpu", seed=0)
+
+
+def _observations(n):
+    rng = np.random.default_rng(0)
+    low = np.array([0, 0, -20, -20, 0, 0], dtype=np.float32)
+    high = np.array([800, 600, 20, 20, 600, 600], dtype=np.float32)
+    return rng.uniform(low, high, size=(n, 6)).astype(np.float32)
+
+
+class TestNumpyPolicy:
+    """Tests for NumpyPolicy snapshots of an SB3 actor"""
+
+    def test_matches_sb3_deterministic_actions(self, model):
+        """Greedy actions should match PPO.predict(deterministic=True)"""
+        snapshot = NumpyPolicy.from_sb3(model)
+        obs = _observations(256)
+
+        expected, _ = model.predict(obs, deterministic=True)
+        actions, _ = snapshot.predict(obs, deterministic=True)
+
+        np.testing.assert_array_equal(actions, expected)
+
+    def test_single_observation(self, model):
+        """A single observation should give a scalar action like SB3"""
+        snapshot = NumpyPolicy.from_sb3(model)
+        obs = _observations(1)[0]
+
+        action, state = snapshot.predict(obs, deterministic=True)
+
+        assert np.ndim(action) == 0
+        assert int(action) == int(model.predict(obs, deterministic=True)[0])
+        assert state is None
+
+    def test_snapshot_is_frozen(self, model):
+        """Training the learner must not change an existing snapshot"""
+        import torch
+
+        snapshot = NumpyPolicy.from_sb3(model)
+        before = [w.copy() for w in snapshot.weights]
+        with torch.no_grad():
+            model.policy.action_net.weight.add_(1.0)
+
+        for w, b in zip(snapshot.weights, before):
+            np.testing.assert_array_equal(w, b)
+
+    def test_stochastic_actions_follow_logits(self):
+        """Sampling should pick a dominant logit almost always"""
+        snapshot = NumpyPolicy(
+            weights=[np.zeros((6, 3), dtype=np.float32)],
+            biases=[np.array([0, 10, 0], dtype=np.float32)],
+            seed=0,
+        )
+
+        actions, _ = snapshot.predict(_observations(500), deterministic=False)
+
+        assert np.mean(actions == 1) > 0.99
+
+    def test_from_zip_matches_from_sb3(self, model, tmp_path):
+        """Reading policy.pth from a save should give the same weights"""
+        model.save(tmp_path / "snapshot")
+
+        from_zip = NumpyPolicy.from_zip(str(tmp_path / "snapshot"))
+        from_sb3 = NumpyPolicy.from_sb3(model)
+
+        assert from_zip.activation == from_sb3.activation
+        for a, b in zip(from_zip.weights + from_zip.biases, from_sb3.weights + from_sb3.biases):
+            np.testing.assert_array_equal(a, b)
+
+
+class TestNumpyInference:
+    """Tests for the .npz export and the greedy serving path"""
+
+    def test_npz_round_trip(self, model, tmp_path):
+        """from_npz() should restore the exported weights exactly"""
+        snapshot = NumpyPolicy.from_sb3(model)
+        snapshot.save_npz(tmp_path / "policy.npz")
+
+        restored = NumpyPolicy.from_npz(tmp_path / "policy.npz")
+
+        assert restored.activation == snapshot.activation
+        obs = _observations(64)
+        np.testing.assert_array_equal(restored.logits(obs), snapshot.logits(obs))
+
+    def test_act_matches_deterministic_predict(self, model):
+        """act() should pick the same action as predict(deterministic=True)"""
+        snapshot = NumpyPolicy.from_sb3(model)
+
+        for obs in _observations(64):
+            assert snapshot.act(obs) == int(model.predict(obs, deterministic=True)[0])
+
+    def test_registry_exports_missing_npz(self, model, tmp_path):
+        """The numpy loader should export the .npz next to the .zip on first use"""
+        from model_registry import load_numpy_policy
+
+        model.save(tmp_path / "best_model")
+
+        policy = load_numpy_policy(str(tmp_path / "best_model"))
+
+        assert (tmp_path / "best_model.npz").exists()
+        obs = _observations(1)[0]
+        assert policy.act(obs) == int(model.predict(obs, deterministic=True)[0])
@@ -0,0 +1,106 @@
+"""
+Unit tests for the ONNX export and onnxruntime backend (export_onnx.py, onnx_policy.py)
+
+Run with: pytest test_onnx_policy.py -v
+"""
+import sys
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from stable_baselines3 import PPO
+
+pytest.importorskip("onnxruntime")
+
+from export_onnx import check_parity, export_checked, export_onnx, record_observations
+from onnx_policy import OnnxPolicy
+from pong_env import PongEnv
+
+
+@pytest.fixture(scope="module")
+def model():
+    """A small untrained PPO model on the local backend"""
+    return PPO("MlpPolicy", PongEnv(backend="local"), n_steps=64, batch_size=64, device="cpu", seed=0)
+
+
+@pytest.fixture(scope="module")
+def onnx_file(model, tmp_path_factory):
+    return export_onnx(model, str(tmp_path_factory.mktemp("onnx") / "model.onnx"))
+
+
+class TestOnnxPolicy:
+    """Tests for the onnxruntime serving backend"""
+
+    def test_parity_on_recorded_observations(self, model, onnx_file):
+        """The ONNX graph should choose the same actions as SB3"""
+        observations = record_observations(model, steps=500)
+
+        mismatches, max_diff = check_parity(model, OnnxPolicy(onnx_file), observations)
+
+        assert mismatches == 0
+        assert max_diff < 1e-4
+
+    def test_act_returns_int(self, model, onnx_file):
+        """act() should return the greedy action as a plain int"""
+        policy = OnnxPolicy(onnx_file, intra_op_threads=1)
+        obs = np.array([400, 300, 5, -2, 300, 250], dtype=np.float32)
+
+        action = policy.act(obs)
+
+        assert isinstance(action, int)
+        assert action == int(model.predict(obs, deterministic=True)[0])
+
+    def test_batch_predict_shape(self, onnx_file):
+        """predict() on a batch should return one action per row"""
+        policy = OnnxPolicy(onnx_file)
+
+        actions, state = policy.predict(np.zeros((7, 6), dtype=np.float32))
+
+        assert actions.shape == (7,)
+        assert state is None
+
+
+class TestCheckedExport:
+    """Tests for the parity-checked export used by the registry"""
+
+    def test_writes_graph_when_actions_match(self, model, tmp_path):
+        """A matching export should be written and its parity frames recorded"""
+        base = str(tmp_path / "model")
+
+        mismatches, count, _ = export_checked(model, base, f"{base}.onnx")
+
+        assert mismatches == 0 and count > 0
+        assert (tmp_path / "model.onnx").exists()
+        assert (tmp_path / "model.parity.npy").exists()
+        assert not list(tmp_path.glob("*.tmp.onnx"))
+
+    def test_refuses_graph_with_mismatches(self, model, tmp_path):
+        """A graph picking different actions should not be written"""
+        base = str(tmp_path / "model")
+
+        with patch("export_onnx.check_parity", return_value=(3, 0.5)):
+            mismatches, _, _ = export_checked(model, base, f"{base}.onnx")
+
+        assert mismatches == 3
+        assert not list(tmp_path.glob("*.onnx"))
+
+    def test_registry_refuses_mismatched_export(self, model, tmp_path):
+        """load_onnx_policy should raise instead of serving a mismatched graph"""
+        import model_registry
+
+        model.save(str(tmp_path / "model.zip"))
+        with patch("export_onnx.check_parity", return_value=(1, 0.2)):
+            with pytest.raises(ValueError, match="parity"):
+                model_registry.load_onnx_policy(str(tmp_path / "model"))
+        assert not (tmp_path / "model.onnx").exists()
+
+    def test_registry_export_without_pong_env(self, model, tmp_path):
+        """The serving image has no pong_env: the registry export should record parity frames without it"""
+        import model_registry
+
+        model.save(str(tmp_path / "model.zip"))
+        with patch.dict(sys.modules, {"pong_env": None, "rl_transport": None}):
+            policy = model_registry.load_onnx_policy(str(tmp_path / "model"))
+
+        assert isinstance(policy, OnnxPolicy)
+        assert (tmp_path / "model.parity.npy").exists()
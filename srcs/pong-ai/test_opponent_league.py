@@ -0,0 +1,100 @@
+"""
+Unit tests for the self-play opponent league (opponent_league.py)
+
+Run with: pytest test_opponent_league.py -v
+"""
+import numpy as np
+
+from numpy_policy import NumpyPolicy
+from opponent_league import OpponentLeague
+
+
+def _constant_policy(action):
+    """A policy that always picks `action`"""
+    bias = np.zeros(3, dtype=np.float32)
+    bias[action] = 100
+    return NumpyPolicy([np.zeros((6, 3), dtype=np.float32)], [bias])
+
+
+class TestOpponentLeague:
+    """Tests for OpponentLeague pool management and sampling"""
+
+    def test_evicts_least_recently_used(self):
+        """The pool should stay within max_policies, dropping the LRU policy"""
+        league = OpponentLeague(max_policies=2, seed=0)
+        league.add("a", _constant_policy(0))
+        league.add("b", _constant_policy(1))
+        league._policies.move_to_end("a")
+        league.add("c", _constant_policy(2))
+
+        assert sorted(league.names) == ["a", "c"]
+
+    def test_memory_budget_caps_pool(self):
+        """The pool should never exceed the memory budget"""
+        policy_bytes = _constant_policy(0).nbytes
+        league = OpponentLeague(max_policies=10, memory_budget=3 * policy_bytes, seed=0)
+        for i in range(6):
+            league.add(str(i), _constant_policy(i % 3))
+
+        assert len(league) == 3
+        assert league.nbytes <= 3 * policy_bytes
+
+    def test_each_game_plays_its_own_opponent(self):
+        """predict() should route every game to the policy assigned to it"""
+        league = OpponentLeague(seed=0)
+        league.add("up", _constant_policy(1))
+        league.add("down", _constant_policy(2))
+
+        actions, _ = league.predict(np.zeros((64, 6), dtype=np.float32), deterministic=True)
+
+        expected = np.where(league._slots == "up", 1, 2)
+        np.testing.assert_array_equal(actions, expected)
+        assert set(league._slots) == {"up", "down"}
+
+    def test_sampling_favours_opponents_that_win(self):
+        """Opponents that beat the agent should be sampled more often"""
+        league = OpponentLeague(seed=0)
+        league.add("strong", _constant_policy(0))
+        league.add("weak", _constant_policy(0))
+        league.predict(np.zeros((2, 6), dtype=np.float32))
+        for _ in range(50):
+            league._slots[:] = ["strong", "weak"]
+            league.on_episodes_end([0, 1], [-1, 1])
+
+        rates = league.win_rates()
+        assert rates["strong"] > 0.9 and rates["weak"] < 0.1
+        picks = [league.sample() for _ in range(200)]
+        assert picks.count("strong") > 150
+
+    def test_refresh_loads_newest_checkpoints(self, tmp_path):
+        """refresh() should load the last max_policies checkpoints from disk"""
+        import os
+        from stable_baselines3 import PPO
+        from pong_env import PongEnv
+
+        model = PPO("MlpPolicy", PongEnv(backend="local"), n_steps=64, batch_size=64, device="cpu")
+        for i in range(3):
+            path = tmp_path / f"pong_checkpoint_{i}.zip"
+            model.save(path)
+            os.utime(path, (i, i))
+
+        league = OpponentLeague(str(tmp_path), max_policies=2)
+        league.refresh()
+
+        assert sorted(league.names) == ["pong_checkpoint_1", "pong_checkpoint_2"]
+
+    def test_vec_env_reports_finished_games(self):
+        """PongVecEnv should report results and redraw opponents on episode end"""
+        from pong_vec_env import PongVecEnv
+
+        league = OpponentLeague(seed=0)
+        league.add("stop", _constant_policy(0))
+        env = PongVecEnv(num_envs=8, opponent_model=league, settings={"maxScore": 1}, seed=0)
+        env.reset()
+        for _ in range(200):
+            _, _, dones, _ = env.step(np.zeros(8, dtype=np.int64))
+            if dones.any():
+                break
+
+        games, _ = league._stats["stop"]
+        assert games == dones.sum()
@@ -0,0 +1,110 @@
+"""
+Unit tests for the precomputed policy lookup table (policy_table.py, compile_policy_table.py)
+
+Run with: pytest test_policy_table.py -v
+"""
+import os
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from compile_policy_table import compile_table, disagreement
+from model_registry import load_policy_table
+from numpy_policy import NumpyPolicy
+from policy_table import BOUNDS, PolicyTable
+
+BINS = (8, 6, 2, 2, 2, 6)
+
+
+@pytest.fixture
+def table(policy, tmp_path):
+    return compile_table(policy, str(tmp_path / "model.table.npy"), BINS, batch=100)
+
+
+def _observations(n):
+    rng = np.random.default_rng(1)
+    low, high = np.array(BOUNDS).T
+    return rng.uniform(low, high, size=(n, 6)).astype(np.float32)
+
+
+class TestPolicyTable:
+    """Tests for compiling and serving the action table"""
+
+    def test_file_is_memory_mapped_uint8(self, table, tmp_path):
+        """The compiled table should be a read-only uint8 memmap of the grid shape"""
+        assert table.table.shape == BINS
+        assert table.table.dtype == np.uint8
+        assert isinstance(table.table, np.memmap)
+        assert not table.table.flags.writeable
+        assert not list(tmp_path.glob("*.tmp.npy"))
+
+    def test_cells_hold_policy_action_at_centre(self, policy, table):
+        """Every cell should store the greedy action at its centre"""
+        cells = np.arange(table.table.size)
+        expected, _ = policy.predict(table.cell_centres(cells), deterministic=True)
+
+        np.testing.assert_array_equal(table.table.reshape(-1), expected)
+        assert len(np.unique(expected)) == 3
+
+    def test_act_matches_predict(self, table):
+        """act() and the batched predict() should index the same cells"""
+        obs = _observations(200)
+        actions, _ = table.predict(obs)
+
+        assert [table.act(row) for row in obs] == actions.tolist()
+        assert isinstance(table.act(obs[0]), int)
+
+    def test_out_of_bounds_clamped(self, table):
+        """Observations outside BOUNDS should use the edge cells"""
+        inside = np.array([low for low, _ in BOUNDS], dtype=np.float32)
+        outside = np.array([-50, -10, -99, -99, 0, 0], dtype=np.float32)
+
+        assert table.act(outside) == table.act(inside)
+
+    def test_agrees_with_policy_on_cell_centres(self, policy, table):
+        """disagreement() should report zero mismatches on the cell centres"""
+        centres = table.cell_centres(np.arange(table.table.size))
+        mismatches, per_action = disagreement(policy, table, centres)
+
+        assert mismatches == 0
+        assert sum(count for count, _ in per_action.values()) == len(centres)
+
+    def test_rejects_wrong_rank(self):
+        """A table with the wrong number of axes should be refused"""
+        with pytest.raises(ValueError):
+            PolicyTable(np.zeros((4, 4), dtype=np.uint8))
+
+
+class TestRegistryCheck:
+    """Tests for the disagreement check of the registry's table backend"""
+
+    @staticmethod
+    def _model_files(policy, tmp_path):
+        """A .zip with a newer .npz export, a compiled coarse table and parity frames"""
+        base = tmp_path / "model"
+        (tmp_path / "model.zip").write_bytes(b"model")
+        os.utime(tmp_path / "model.zip", (1, 1))
+        policy.save_npz(f"{base}.npz")
+        compile_table(policy, f"{base}.table.npy", BINS)
+        np.save(f"{base}.parity.npy", _observations(500))
+        return str(base)
+
+    def test_serves_table_within_threshold(self, policy, tmp_path):
+        """A table within MAX_DISAGREEMENT should be served"""
+        base = self._model_files(policy, tmp_path)
+
+        with patch("compile_policy_table.MAX_DISAGREEMENT", 1.0):
+            served = load_policy_table(base)
+
+        assert isinstance(served, PolicyTable)
+
+    def test_falls_back_to_float_actor(self, policy, tmp_path):
+        """A table disagreeing on too many frames should not be served"""
+        base = self._model_files(policy, tmp_path)
+
+        with patch("compile_policy_table.MAX_DISAGREEMENT", 0.0):
+            served = load_policy_table(base)
+
+        assert isinstance(served, NumpyPolicy)
+        np.testing.assert_array_equal(served.logits(_observations(50)), policy.logits(_observations(50)))
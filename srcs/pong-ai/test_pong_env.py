@@ -0,0 +1,179 @@
+"""
+Unit tests for pong_env.py remote stepping
+
+Run with: pytest test_pong_env.py -v
+"""
+import asyncio
+import json
+from unittest.mock import Mock
+
+import httpx
+import numpy as np
+import pytest
+
+from async_vec_env import AsyncRemoteVecEnv
+
+from pong_env import PongEnv, FRAME_SKIP
+from rl_transport import HttpTransport
+
+
+def _state(ball_x=400):
+    return {
+        "ball": {"x": ball_x, "y": 300, "vx": 5, "vy": 0},
+        "paddles": {"left": {"y": 250, "height": 100}, "right": {"y": 250, "height": 100}},
+    }
+
+
+def _response(payload):
+    resp = Mock()
+    resp.json.return_value = payload
+    return resp
+
+
+@pytest.fixture
+def remote_env():
+    """PongEnv wired to a mocked HTTP session instead of the game service"""
+    env = PongEnv(backend="local")
+    env._sim = None
+    env._http = Mock()
+    env.session_id = "test-session"
+    env.base_url = "http://game"
+    env._transport = HttpTransport(env._http, env.base_url, env.session_id)
+    return env
+
+
+class TestMultiTickStep:
+    """Tests for the single-request FRAME_SKIP step"""
+
+    def test_one_request_per_step(self, remote_env):
+        """A multi-tick server should get exactly one POST per env step"""
+        remote_env._http.post.return_value = _response(
+            {"state": _state(420), "reward": 0, "done": False, "ticks": FRAME_SKIP}
+        )
+
+        obs, reward, done, _, _ = remote_env.step_both(1, 2)
+
+        assert remote_env._http.post.call_count == 1
+        payload = remote_env._http.post.call_args.kwargs["json"]
+        assert payload["ticks"] == FRAME_SKIP
+        assert payload["leftAction"] == "down"
+        assert obs[0] == 420
+        assert remote_env._multi_tick is True
+
+    def test_falls_back_to_per_tick_loop(self, remote_env):
+        """A server that ignores ticks should be driven tick by tick, with a RuntimeWarning"""
+        remote_env._http.post.return_value = _response({"state": _state(), "reward": 0, "done": False})
+
+        with pytest.warns(RuntimeWarning, match="falling back to per-tick steps"):
+            remote_env.step(1)
+        assert remote_env._http.post.call_count == FRAME_SKIP
+        assert remote_env._multi_tick is False
+
+        remote_env.step(1)
+        assert remote_env._http.post.call_count == 2 * FRAME_SKIP
+        assert "ticks" not in remote_env._http.post.call_args.kwargs["json"]
+
+    def test_fallback_stops_on_done(self, remote_env):
+        """The per-tick fallback should stop at the end of the game"""
+        remote_env._multi_tick = False
+        remote_env._http.post.side_effect = [
+            _response({"state": _state(), "reward": 0, "done": False}),
+            _response({"state": _state(), "reward": 1, "done": True}),
+        ]
+
+        _, reward, done, _, _ = remote_env.step(0)
+
+        assert done
+        assert reward == 1
+        assert remote_env._http.post.call_count == 2
+
+
+class FakeRLService:
+    """httpx handler for /create-session, /rl/reset and multi-tick /rl/step"""
+
+    def __init__(self, done_sessions=(), fail_step=False):
+        self.sessions = []
+        self.done_sessions = set(done_sessions)
+        self.fail_step = fail_step
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.resets = []
+
+    async def __call__(self, request):
+        path = request.url.path
+        if path.endswith("/create-session"):
+            self.sessions.append(f"s{len(self.sessions)}")
+            return httpx.Response(200, json={"sessionId": self.sessions[-1]})
+        body = json.loads(request.content)
+        index = self.sessions.index(body["sessionId"])
+        if path.endswith("/rl/reset"):
+            self.resets.append(index)
+            return httpx.Response(200, json={"status": "success", "state": _state(400)})
+        if self.fail_step:
+            return httpx.Response(500, json={"status": "failure"})
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        # Later sessions answer first: results must still come back in env order
+        await asyncio.sleep(0.001 * (len(self.sessions) - index))
+        self.in_flight -= 1
+        done = body["sessionId"] in self.done_sessions
+        return httpx.Response(200, json={
+            "status": "success", "state": _state(100 + index), "reward": 1 if done else 0,
+            "done": done, "ticks": body["ticks"],
+        })
+
+
+def _vec_env(service, num_envs=4, **kwargs):
+    return AsyncRemoteVecEnv(num_envs=num_envs, base_url="http://game", seed=0,
+                             transport=httpx.MockTransport(service), **kwargs)
+
+
+class TestAsyncRemoteVecEnv:
+    """Tests for the concurrent K-session VecEnv"""
+
+    def test_step_results_in_env_order(self):
+        """Replies arriving out of order should map back to their env index"""
+        env = _vec_env(FakeRLService(), num_envs=4)
+        env.reset()
+
+        env.step_async(np.ones(4, dtype=np.int64))
+        obs, rewards, dones, infos = env.step_wait()
+        env.close()
+
+        assert obs[:, 0].tolist() == [100, 101, 102, 103]
+        assert not dones.any() and rewards.tolist() == [0, 0, 0, 0]
+
+    def test_auto_reset_with_terminal_observation(self):
+        """A finished game should report its last observation and be reset"""
+        service = FakeRLService(done_sessions={"s2"})
+        env = _vec_env(service, num_envs=3)
+        env.reset()
+
+        obs, rewards, dones, infos = env.step(np.zeros(3, dtype=np.int64))
+        env.close()
+
+        assert dones.tolist() == [False, False, True]
+        assert rewards[2] == 1
+        assert infos[2]["terminal_observation"][0] == 102
+        assert obs[2, 0] == 400  # observation after the reset
+        assert service.resets == [0, 1, 2, 2]
+
+    def test_http_error_propagates(self):
+        """A failing /rl/step should raise instead of returning stale observations"""
+        env = _vec_env(FakeRLService(fail_step=True), num_envs=2)
+        env.reset()
+
+        with pytest.raises(httpx.HTTPStatusError):
+            env.step(np.zeros(2, dtype=np.int64))
+        env.close()
+
+    def test_in_flight_requests_capped(self):
+        """No more than max_in_flight requests should be outstanding at once"""
+        service = FakeRLService()
+        env = _vec_env(service, num_envs=8, max_in_flight=3)
+        env.reset()
+
+        env.step(np.zeros(8, dtype=np.int64))
+        env.close()
+
+        assert service.max_in_flight == 3
@@ -64,6 +64,146 @@ class TestAIService:
         
         assert not service.is_ready()
         assert "test load error" in service.load_error
+    
+    def test_resolve_model_ids(self, tmp_path):
+        """resolve() should find models/<id> and models/<id>/best_model, and reject paths"""
+        from pong_server import AIService
+        
+        (tmp_path / "pong_v2.zip").write_bytes(b"model")
+        (tmp_path / "pong_strong").mkdir()
+        (tmp_path / "pong_strong" / "best_model.zip").write_bytes(b"model")
+        service = AIService(model_path=str(tmp_path / "best_model"))
+        
+        assert service.resolve("pong_v2") == str(tmp_path / "pong_v2")
+        assert service.resolve("pong_strong") == str(tmp_path / "pong_strong" / "best_model")
+        assert service.resolve("default") == service.model_path
+        assert service.resolve("pong_moderate") is None
+        with pytest.raises(ValueError):
+            service.resolve("../secrets")
+
+
+class TestStartup:
+    """Tests for lazy imports and the startup warm-up"""
+    
+    def test_import_does_not_load_torch(self):
+        """Importing pong_server should not import stable_baselines3 or torch"""
+        import subprocess
+        import sys
+        
+        code = "import sys, pong_server; print('stable_baselines3' in sys.modules, 'torch' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        
+        assert result.stdout.split() == ["False", "False"]
+    
+    @patch('pong_server.PPO')
+    @patch('os.path.exists')
+    def test_not_ready_until_warmed_up(self, mock_exists, mock_ppo):
+        """start() should load, run batched warm-up predicts, then report ready"""
+        import asyncio
+        import numpy as np
+        from pong_server import AIService
+        
+        mock_exists.return_value = True
+        mock_ppo.load.return_value.predict.side_effect = lambda obs, deterministic: (np.zeros(len(obs)), None)
+        mock_ppo.load.return_value.act = None
+        service = AIService(model_path="models/warm_model", load=False)
+        service.warming_up = True
+        
+        assert not service.is_ready()
+        timings = asyncio.run(service.start())
+        
+        assert service.is_ready()
+        assert set(timings) == {"load_ms", "warmup_ms"}
+        assert mock_ppo.load.return_value.predict.call_args.args[0].shape == (64, 6)
+        service.reloader.stop()
+    
+    def test_wait_warm_times_out(self):
+        """wait_warm() should give up after its timeout while still warming up"""
+        import asyncio
+        from pong_server import AIService
+        
+        service = AIService(model_path="models/cold_model", load=False)
+        service.warming_up = True
+        
+        assert asyncio.run(service.wait_warm(0.1)) is False
+        service.warming_up = False
+        assert asyncio.run(service.wait_warm(0.1)) is True
+    
+    @patch('pong_server.PPO')
+    @patch('os.path.exists')
+    def test_failed_warm_up_is_not_ready(self, mock_exists, mock_ppo):
+        """A model returning invalid actions at warm-up should not be served"""
+        import asyncio
+        import numpy as np
+        from pong_server import AIService
+        
+        mock_exists.return_value = True
+        mock_ppo.load.return_value.predict.side_effect = lambda obs, deterministic: (np.full(len(obs), 9), None)
+        service = AIService(model_path="models/broken_model", load=False)
+        
+        asyncio.run(service.start())
+        
+        assert not service.is_ready()
+        assert "warm-up" in service.load_error
+
+
+    @patch('pong_server.PPO')
+    def test_first_model_deployed_after_start(self, mock_ppo, tmp_path):
+        """Starting without a model file should still watch it and serve the first one deployed"""
+        import asyncio
+        import os
+        import numpy as np
+        from pong_server import AIService
+        
+        mock_ppo.load.return_value.predict.side_effect = lambda obs, deterministic: (np.zeros(len(obs)), None)
+        mock_ppo.load.return_value.act = None
+        service = AIService(model_path=str(tmp_path / "best_model"), load=False)
+        asyncio.run(service.start())
+        assert not service.is_ready()
+        assert service.reloader is not None
+        
+        (tmp_path / "best_model.zip").write_bytes(b"model")
+        os.utime(tmp_path / "best_model.zip", (1, 1))
+        assert not asyncio.run(service.reloader.check())  # settling
+        assert asyncio.run(service.reloader.check())
+        
+        assert service.is_ready()
+        assert service.model is mock_ppo.load.return_value
+        assert service.reloader.version == 1
+        service.reloader.stop()
+
+
+class TestInferenceSchedulers:
+    """Tests for the per-model batch schedulers"""
+
+    def test_sessions_of_a_model_share_its_scheduler(self):
+        """scheduler_for() should hand every session of a model the same scheduler"""
+        from pong_server import scheduler_for
+
+        first, second = Mock(), Mock()
+
+        assert scheduler_for(first) is scheduler_for(first)
+        assert scheduler_for(first) is not scheduler_for(second)
+
+    def test_evicted_model_is_garbage_collected(self, tmp_path):
+        """Once evicted and its games over, a model should not be kept alive by its scheduler"""
+        import gc
+        import weakref
+        from model_registry import ModelRegistry
+        from pong_server import scheduler_for
+
+        for name in ("first", "second"):
+            (tmp_path / f"{name}.zip").write_bytes(b"model")
+        registry = ModelRegistry(lambda path: Mock(nbytes=100), memory_budget=150)
+        model = registry.get(str(tmp_path / "first"))
+        scheduler = scheduler_for(model)  # as held by a session
+        collected = weakref.ref(model)
+
+        del model, scheduler  # the game ended
+        registry.get(str(tmp_path / "second"))  # evicts first
+        gc.collect()
+
+        assert collected() is None
 
 
 class TestHealthEndpoints:
@@ -74,9 +214,10 @@ class TestHealthEndpoints:
         """Create test client with ready AIService"""
         import pong_server
         
-        mock_service = Mock()
+        mock_service = Mock(warming_up=False)
         mock_service.is_ready.return_value = True
         mock_service.load_error = None
+        mock_service.reloader = None
         pong_server.ai_service = mock_service
         
         yield TestClient(pong_server.app)
@@ -86,7 +227,7 @@ class TestHealthEndpoints:
         """Create test client with not ready AIService"""
         import pong_server
         
-        mock_service = Mock()
+        mock_service = Mock(warming_up=False)
         mock_service.is_ready.return_value = False
         mock_service.load_error = "Model not found"
         pong_server.ai_service = mock_service
@@ -101,6 +242,7 @@ class TestHealthEndpoints:
         data = response.json()
         assert data["status"] == "healthy"
         assert data["model_loaded"] is True
+        assert isinstance(data["models"], list)
     
     def test_health_get_returns_503_when_not_ready(self, not_ready_client):
         """GET /health should return 503 when model not loaded"""
@@ -140,7 +282,7 @@ class TestJoinGameEndpoint:
         """Create test client with ready AIService"""
         import pong_server
         
-        mock_service = Mock()
+        mock_service = Mock(warming_up=False)
         mock_service.is_ready.return_value = True
         mock_service.load_error = None
         pong_server.ai_service = mock_service
@@ -155,11 +297,12 @@ class TestJoinGameEndpoint:
         assert response.status_code == 400
         assert "sessionId" in response.json()["detail"]
     
+    @patch('pong_server.HEURISTIC_FALLBACK', False)
     def test_join_game_returns_503_when_not_ready(self):
-        """POST /join-game should return 503 when model not loaded"""
+        """POST /join-game should return 503 when model not loaded and no fallback"""
         import pong_server
         
-        mock_service = Mock()
+        mock_service = Mock(warming_up=False)
         mock_service.is_ready.return_value = False
         mock_service.load_error = "Model not found"
         pong_server.ai_service = mock_service
@@ -170,10 +313,90 @@ class TestJoinGameEndpoint:
         assert response.status_code == 503
     
     @patch('pong_server.AIPlayer')
-    def test_join_game_success(self, mock_ai_player_class, ready_client):
-        """POST /join-game should create AI player and return success"""
+    def test_join_game_uses_heuristic_when_not_ready(self, mock_ai_player_class):
+        """POST /join-game should play the heuristic policy when model not loaded"""
         import pong_server
         
+        mock_service = Mock(warming_up=False)
+        mock_service.is_ready.return_value = False
+        mock_service.load_error = "Model not found"
+        pong_server.ai_service = mock_service
+        pong_server.active_ai_players = {}
+        mock_ai_player_class.return_value.play = AsyncMock()
+        
+        client = TestClient(pong_server.app)
+        response = client.post("/join-game", json={"sessionId": "test-123"})
+        
+        assert response.status_code == 200
+        assert response.json()["policy"] == "heuristic"
+        assert mock_ai_player_class.call_args.kwargs["heuristic"] is not None
+    
+    @patch('pong_server.MAX_MODEL_SESSIONS', 0)
+    @patch('pong_server.AIPlayer')
+    def test_join_game_uses_heuristic_past_session_limit(self, mock_ai_player_class, ready_client):
+        """POST /join-game should play the heuristic once the model session limit is reached"""
+        mock_ai_player_class.return_value.play = AsyncMock()
+        
+        response = ready_client.post("/join-game", json={"sessionId": "game-456"})
+        
+        assert response.status_code == 200
+        assert response.json()["policy"] == "heuristic"
+    
+    @patch('pong_server.AIPlayer')
+    def test_join_game_loads_difficulty_model(self, mock_ai_player_class, ready_client):
+        """POST /join-game with a difficulty should lazily load that model of the zoo"""
+        import pong_server
+        
+        mock_ai_player_class.return_value.play = AsyncMock()
+        pong_server.ai_service.resolve.return_value = "models/pong_strong"
+        
+        response = ready_client.post("/join-game", json={"sessionId": "game-hard", "difficulty": "hard"})
+        
+        assert response.status_code == 200
+        assert response.json()["policy"] == "model"
+        assert response.json()["model"] == "pong_strong"
+        pong_server.ai_service.resolve.assert_called_once_with("pong_strong")
+        pong_server.ai_service.get_model.assert_called_once_with("models/pong_strong")
+        assert mock_ai_player_class.call_args.args[0] == "models/pong_strong"
+        # The loaded model is handed over, not resolved again from the path
+        loaded = pong_server.ai_service.get_model.return_value
+        assert mock_ai_player_class.call_args.kwargs["model"] is loaded
+        assert mock_ai_player_class.call_args.kwargs["scheduler"].model is loaded
+    
+    @patch('pong_server.AIPlayer')
+    def test_join_game_difficulty_without_model_plays_heuristic(self, mock_ai_player_class, ready_client):
+        """POST /join-game with an uninstalled difficulty model should play the heuristic"""
+        import pong_server
+        from heuristic_policy import DIFFICULTY_NOISE
+        
+        mock_ai_player_class.return_value.play = AsyncMock()
+        pong_server.ai_service.resolve.return_value = None
+        
+        response = ready_client.post("/join-game", json={"sessionId": "game-med", "difficulty": "medium"})
+        
+        assert response.status_code == 200
+        assert response.json()["policy"] == "heuristic"
+        assert mock_ai_player_class.call_args.kwargs["heuristic"].noise == DIFFICULTY_NOISE["medium"]
+    
+    def test_join_game_unknown_model_returns_404(self, ready_client):
+        """POST /join-game should return 404 for a model id that is not installed"""
+        import pong_server
+        
+        pong_server.ai_service.resolve.return_value = None
+        
+        response = ready_client.post("/join-game", json={"sessionId": "game-x", "model": "missing"})
+        
+        assert response.status_code == 404
+    
+    def test_join_game_unknown_difficulty_returns_400(self, ready_client):
+        """POST /join-game should reject a difficulty outside the zoo"""
+        response = ready_client.post("/join-game", json={"sessionId": "game-x", "difficulty": "insane"})
+        
+        assert response.status_code == 400
+    
+    @patch('pong_server.AIPlayer')
+    def test_join_game_success(self, mock_ai_player_class, ready_client):
+        """POST /join-game should create AI player and return success"""
         mock_ai_player = Mock()
         mock_ai_player.play = AsyncMock()
         mock_ai_player_class.return_value = mock_ai_player
@@ -186,6 +409,38 @@ class TestJoinGameEndpoint:
         assert data["session_id"] == "game-123"
         assert data["paddle"] == "right"
     
+    @patch('pong_server.WARMUP_WAIT', 0.05)
+    def test_join_game_returns_503_while_warming_up(self, ready_client):
+        """POST /join-game should not start a fallback game while the model warms up"""
+        import pong_server
+        
+        pong_server.ai_service.warming_up = True
+        pong_server.ai_service.wait_warm = AsyncMock(return_value=False)
+        
+        response = ready_client.post("/join-game", json={"sessionId": "early"})
+        
+        assert response.status_code == 503
+        assert "warming up" in response.json()["detail"]
+        assert "early" not in pong_server.active_ai_players
+    
+    @patch('pong_server.AIPlayer')
+    def test_join_game_waits_for_warm_up(self, mock_ai_player_class, ready_client):
+        """A join during warm-up should play the model once it becomes ready"""
+        import pong_server
+        
+        mock_ai_player_class.return_value.play = AsyncMock()
+        pong_server.ai_service.warming_up = True
+        
+        async def finish_warm_up(timeout):
+            pong_server.ai_service.warming_up = False
+            return True
+        pong_server.ai_service.wait_warm = finish_warm_up
+        
+        response = ready_client.post("/join-game", json={"sessionId": "just-in-time"})
+        
+        assert response.status_code == 200
+        assert response.json()["policy"] == "model"
+    
     @patch('pong_server.AIPlayer')
     def test_join_game_already_playing(self, mock_ai_player_class, ready_client):
         """POST /join-game should return already_playing if session exists"""
@@ -0,0 +1,270 @@
+"""
+Unit tests for the in-process Pong simulator (pong_sim.py)
+
+Run with: pytest test_pong_sim.py -v
+"""
+import numpy as np
+import pytest
+
+from pong_sim import BatchPongSim, PongSim, HEIGHT, WIDTH, PADDLE_MARGIN
+
+
+class TestPongSim:
+    """Tests for the PongSim port of PongGame.ts"""
+
+    def test_initial_state_matches_engine(self):
+        """A fresh sim should match the PongGame constructor"""
+        sim = PongSim()
+        state = sim.get_state()
+
+        assert state["ball"]["x"] == WIDTH / 2
+        assert state["ball"]["y"] == HEIGHT / 2
+        assert state["ball"]["vx"] == 5
+        assert state["paddles"]["left"]["y"] == 250
+        assert state["status"] == "waiting"
+
+    def test_paddle_clamped_to_field(self):
+        """Paddles should never leave the field"""
+        sim = PongSim()
+        for _ in range(100):
+            sim.rl_step("up", "down")
+
+        assert sim.right_y == 0
+        assert sim.left_y == HEIGHT - sim.paddle_height
+
+    def test_speed_limit_applied(self):
+        """Velocity should be clamped to the ball speed limit after an update"""
+        sim = PongSim(cosmic_noise=False)
+        sim.vel_x, sim.vel_y = 30.0, 40.0
+        sim.update()
+
+        assert np.hypot(sim.vel_x, sim.vel_y) == pytest.approx(sim.speed_limit)
+        assert sim.vel_x == pytest.approx(3.0)
+
+    def test_wall_bounce_flips_vy(self):
+        """Hitting the top wall should clamp y and flip vy"""
+        sim = PongSim(cosmic_noise=False)
+        sim.ball_y, sim.vel_x, sim.vel_y = 6.0, 0.0, -4.0
+        sim.update()
+
+        assert sim.ball_y == sim.radius
+        assert sim.vel_y == 4.0
+
+    def test_paddle_hit_flips_serve(self):
+        """A right paddle hit should bounce the ball and flip the serve sign"""
+        sim = PongSim(cosmic_noise=False)
+        sim.ball_x = WIDTH - PADDLE_MARGIN - sim.paddle_width - sim.radius - 2
+        sim.ball_y = sim.right_y + 50
+        sim.vel_x, sim.vel_y = 5.0, 0.0
+        sim.update()
+
+        assert sim.vel_x == -5.0
+        assert sim.acc_x == -5
+        assert sim.serve == -1
+
+    def test_missed_ball_scores_and_finishes(self):
+        """Missing the ball should score for the other side until maxScore"""
+        sim = PongSim(settings={"maxScore": 1}, seed=0, cosmic_noise=False)
+        sim.reset()
+        sim.right_y = 0
+        sim.ball_y, sim.vel_y = HEIGHT - 50, 0.0
+
+        done = False
+        reward = 0
+        for _ in range(500):
+            reward, done = sim.rl_step("stop", "stop")
+            if done:
+                break
+
+        assert done
+        assert sim.score_left == 1
+        assert reward == -1
+
+    def test_seeded_runs_are_reproducible(self):
+        """Two sims with the same seed should produce identical trajectories"""
+        a, b = PongSim(seed=42), PongSim(seed=42)
+        a.reset()
+        b.reset()
+        for i in range(2000):
+            action = ("stop", "up", "down")[i % 3]
+            a.rl_step(action, "up")
+            b.rl_step(action, "up")
+
+        np.testing.assert_array_equal(a.observation(), b.observation())
+
+
+class TestCosmicNoise:
+    """Tests for the NumPy CosmicNoise port"""
+
+    def test_vectorized_matches_scalar(self):
+        """vectors_at() should agree with the scalar vector_at() path"""
+        from cosmic_noise import CosmicNoise
+
+        noise = CosmicNoise(seed=1700000000000)
+        rng = np.random.default_rng(0)
+        xs, ys, ts = rng.uniform(0, 800, 200), rng.uniform(0, 600, 200), rng.uniform(0, 50, 200)
+
+        fx, fy = noise.vectors_at(xs, ys, ts)
+        expected = np.array([noise.vector_at(x, y, t) for x, y, t in zip(xs, ys, ts)])
+
+        np.testing.assert_allclose(fx, expected[:, 0], atol=1e-12)
+        np.testing.assert_allclose(fy, expected[:, 1], atol=1e-12)
+        np.testing.assert_allclose(np.hypot(fx, fy), 1.0)
+
+    def test_field_matches_engine_grid(self):
+        """field() should be the normalized 60x80 grid, cached with bounded size"""
+        from cosmic_noise import CosmicNoise
+
+        noise = CosmicNoise(seed=42, cache_size=4)
+        grid = noise.field(0.0)
+
+        assert grid.shape == (60, 80)
+        assert grid.min() >= 0.0 and grid.max() <= 1.0
+        assert noise.field(0.0) is grid
+        assert grid[3, 7] == pytest.approx((noise._noise3d_point(70 * 0.005, 30 * 0.005, 0.0) + 1) / 2)
+
+        for step in range(1, 10):
+            noise.field(step * 0.01)
+        assert len(noise._fields) == 4
+
+    def test_same_seed_same_noise(self):
+        """The permutation table should be a deterministic function of the seed"""
+        from cosmic_noise import CosmicNoise
+
+        a, b, c = CosmicNoise(seed=7), CosmicNoise(seed=7), CosmicNoise(seed=8)
+
+        np.testing.assert_array_equal(a.perm, b.perm)
+        assert sorted(a.perm[:256]) == list(range(256))
+        assert not np.array_equal(a.perm, c.perm)
+
+
+class TestBatchPongSim:
+    """Tests for the vectorized BatchPongSim"""
+
+    def test_matches_scalar_sim(self):
+        """Each batch row should follow the scalar sim tick for tick"""
+        starts = [(400.0, 300.0, 5.0, 2.5), (400.0, 300.0, -5.0, -4.0), (300.0, 20.0, -3.0, -4.0)]
+        batch = BatchPongSim(len(starts), noise_seed=1234)
+        sims = []
+        for i, (x, y, vx, vy) in enumerate(starts):
+            sim = PongSim(noise_seed=1234)
+            sim.ball_x, sim.ball_y, sim.vel_x, sim.vel_y = x, y, vx, vy
+            batch.ball_x[i], batch.ball_y[i], batch.vel_x[i], batch.vel_y[i] = x, y, vx, vy
+            sims.append(sim)
+
+        right = np.array([1, 2, 0])
+        left = np.array([2, 0, 1])
+        for _ in range(60):
+            batch.rl_step(right, left)
+            for i, sim in enumerate(sims):
+                sim.rl_step(("stop", "up", "down")[right[i]], ("stop", "up", "down")[left[i]])
+
+        expected = np.stack([sim.observation() for sim in sims])
+        np.testing.assert_allclose(batch.observations(), expected, rtol=1e-5)
+        assert list(batch.serve) == [sim.serve for sim in sims]
+
+    def test_finished_games_stop_advancing(self):
+        """A game that finishes mid frame-skip should keep its final state"""
+        batch = BatchPongSim(2, settings={"maxScore": 1}, cosmic_noise=False)
+        batch.ball_x[0] = PADDLE_MARGIN + batch.radius + 1
+        batch.vel_x[0] = -5.0
+        batch.left_y[0] = 0.0
+
+        rewards, dones = batch.rl_step(np.array([0, 0]), np.array([0, 0]), ticks=4)
+
+        assert list(dones) == [True, False]
+        assert rewards[0] == 1.0 and rewards[1] == 0.0
+        assert batch.time[0] == pytest.approx(0.01)
+        assert batch.time[1] == pytest.approx(0.04)
+
+
+class TestPongVecEnv:
+    """Tests for the SB3 PongVecEnv"""
+
+    def test_auto_reset_returns_terminal_observation(self):
+        """Finished games should be reset with terminal_observation in info"""
+        from pong_vec_env import PongVecEnv
+
+        env = PongVecEnv(num_envs=8, settings={"maxScore": 1}, seed=0)
+        obs = env.reset()
+        assert obs.shape == (8, 6)
+
+        for _ in range(200):
+            obs, rewards, dones, infos = env.step(np.zeros(8, dtype=np.int64))
+            if dones.any():
+                break
+
+        i = int(np.flatnonzero(dones)[0])
+        assert "terminal_observation" in infos[i]
+        assert rewards[i] in (-1.0, 1.0)
+        assert env.sim.score_left[i] == 0 and env.sim.score_right[i] == 0
+
+
+class TestSharedMemVecEnv:
+    """Tests for the multi-process SharedMemVecEnv"""
+
+    def test_workers_fill_shared_arrays(self):
+        """Every env slot should be stepped by its worker and auto-reset"""
+        from shm_vec_env import SharedMemVecEnv
+
+        env = SharedMemVecEnv(num_envs=4, n_workers=2, seed=0, backend="local")
+        try:
+            obs = env.reset()
+            assert obs.shape == (4, 6)
+            assert np.all(obs[:, 0] == WIDTH / 2)
+
+            rng = np.random.default_rng(0)
+            for _ in range(2000):
+                obs, rewards, dones, infos = env.step(rng.integers(0, 3, size=4))
+                if dones.any():
+                    break
+
+            i = int(np.flatnonzero(dones)[0])
+            assert rewards[i] in (-1.0, 1.0)
+            assert infos[i]["terminal_observation"].shape == (6,)
+            assert obs[i][0] == WIDTH / 2
+        finally:
+            env.close()
+
+    def test_one_opponent_predict_per_step(self):
+        """Opponent actions for all games should come from one batched predict"""
+        from unittest.mock import Mock
+        from shm_vec_env import SharedMemVecEnv
+
+        opponent = Mock()
+        opponent.predict.side_effect = lambda obs, deterministic: (np.full(len(obs), 1), None)
+        env = SharedMemVecEnv(num_envs=4, n_workers=2, opponent_model=opponent, backend="local")
+        try:
+            obs = env.reset()
+            env.step(np.zeros(4, dtype=np.int64))
+
+            assert opponent.predict.call_count == 1
+            mirrored = opponent.predict.call_args.args[0]
+            assert mirrored.shape == (4, 6)
+            assert np.allclose(mirrored[:, 0], WIDTH - obs[:, 0])
+        finally:
+            env.close()
+
+
+class TestPongEnvLocalBackend:
+    """Tests for PongEnv(backend="local")"""
+
+    def test_step_returns_observation(self):
+        """The local backend should follow the Gymnasium step contract"""
+        from pong_env import PongEnv
+
+        env = PongEnv(backend="local")
+        obs, info = env.reset(seed=1)
+        obs, reward, terminated, truncated, info = env.step(1)
+
+        assert obs.shape == (6,)
+        assert obs.dtype == np.float32
+        assert not truncated
+        assert env.session_id is None
+
+    def test_unknown_backend_rejected(self):
+        """An unknown backend name should raise ValueError"""
+        from pong_env import PongEnv
+
+        with pytest.raises(ValueError):
+            PongEnv(backend="carrier-pigeon")
@@ -0,0 +1,112 @@
+"""
+Unit tests for the int8-quantized actor (quantized_policy.py, export_quantized.py)
+
+Run with: pytest test_quantized_policy.py -v
+"""
+import os
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from export_quantized import accuracy_report, export_quantized
+from model_registry import _base_path, load_quantized_policy
+from policy_table import BOUNDS
+from quantized_policy import QuantizedPolicy, quantize_weights
+
+
+def _observations(n):
+    rng = np.random.default_rng(1)
+    low, high = np.array(BOUNDS).T
+    return rng.uniform(low, high, size=(n, 6)).astype(np.float32)
+
+
+class TestQuantizeWeights:
+    """Tests for per-column symmetric weight quantization"""
+
+    def test_per_column_int8(self):
+        """Each column should use the full int8 range and dequantize closely"""
+        w = np.random.default_rng(0).normal(size=(8, 4)) * [1, 10, 100, 1000]
+        wq, scale = quantize_weights(w)
+
+        assert wq.dtype == np.int8
+        assert np.abs(wq).max(axis=0).tolist() == [127] * 4
+        np.testing.assert_allclose(wq * scale, w, atol=scale.max() / 2 + 1e-6)
+
+
+class TestQuantizedPolicy:
+    """Tests for QuantizedPolicy"""
+
+    def test_actions_close_to_float(self, policy):
+        """Quantized actions should match the float actor on almost all frames"""
+        obs = _observations(2000)
+        report = accuracy_report(policy, QuantizedPolicy.from_policy(policy), obs)
+
+        assert report["mismatches"] / len(obs) < 0.05
+        assert report["confident_mismatches"] <= report["mismatches"]
+        assert sum(count for count, _ in report["per_action"].values()) == len(obs)
+
+    def test_act_matches_predict(self, policy):
+        """act() should give the same actions as the batched path"""
+        quantized = QuantizedPolicy.from_policy(policy)
+        obs = _observations(300)
+        actions, _ = quantized.predict(obs)
+
+        assert [quantized.act(row) for row in obs] == actions.tolist()
+
+    def test_npz_round_trip(self, policy, tmp_path):
+        """The exported .int8.npz should reload to an identical actor"""
+        path = str(tmp_path / "model.int8.npz")
+        quantized = export_quantized(policy, path)
+        loaded = QuantizedPolicy.from_npz(path)
+
+        assert all(w.dtype == np.int8 for w in loaded.weights)
+        np.testing.assert_array_equal(loaded.logits(_observations(50)), quantized.logits(_observations(50)))
+
+    def test_smaller_than_float(self, policy):
+        """The int8 export should take well under half the float32 bytes"""
+        assert QuantizedPolicy.from_policy(policy).export_nbytes < policy.nbytes / 2
+
+    def test_act_is_the_float_forward_pass(self, policy):
+        """act() should run the dequantized actor, as fast as NumpyPolicy"""
+        quantized = QuantizedPolicy.from_policy(policy)
+        obs = _observations(1)[0]
+
+        assert quantized.act(obs) == int(quantized.logits(obs[None]).argmax())
+        assert all(w.dtype == np.float32 for w in quantized._float.weights)
+
+    def test_registry_base_path(self):
+        """The registry should map .int8.npz back to the model base path"""
+        assert _base_path("models/best_model.int8.npz") == "models/best_model"
+
+
+class TestRegistryCheck:
+    """Tests for the accuracy check of the registry's int8 auto-export"""
+
+    @staticmethod
+    def _model_files(policy, tmp_path):
+        """A .zip with a newer .npz export and held-out frames"""
+        base = tmp_path / "model"
+        (tmp_path / "model.zip").write_bytes(b"model")
+        os.utime(tmp_path / "model.zip", (1, 1))
+        policy.save_npz(f"{base}.npz")
+        np.save(f"{base}.heldout.npy", _observations(500))
+        return str(base)
+
+    def test_serves_accurate_actor(self, policy, tmp_path):
+        """An actor within MAX_MISMATCH should be written and served"""
+        base = self._model_files(policy, tmp_path)
+
+        served = load_quantized_policy(base)
+
+        assert isinstance(served, QuantizedPolicy)
+        assert (tmp_path / "model.int8.npz").exists()
+
+    def test_refuses_inaccurate_actor(self, policy, tmp_path):
+        """An actor over MAX_MISMATCH should raise and not be written"""
+        base = self._model_files(policy, tmp_path)
+
+        with patch("export_quantized.MAX_MISMATCH", -1.0):
+            with pytest.raises(ValueError, match="accuracy check"):
+                load_quantized_policy(base)
+        assert not list(tmp_path.glob("*.int8*"))
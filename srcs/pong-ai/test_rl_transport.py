@@ -0,0 +1,120 @@
+"""
+Unit tests for the RL transports (rl_transport.py)
+
+Run with: pytest test_rl_transport.py -v
+"""
+import json
+import threading
+from unittest.mock import patch
+
+import pytest
+from websockets.sync.server import serve
+
+from pong_env import PongEnv
+from pong_sim import PongSim
+from rl_transport import RL_WS_PATH, TransportError, WsTransport
+
+
+def _rl_socket(sessions, paths):
+    """Follows the game service rlWebSocket contract (GameController.ts)"""
+
+    def handler(websocket):
+        paths.append(websocket.request.path)
+        session_id = websocket.request.path.rsplit("/", 1)[-1]
+        for raw in websocket:
+            try:
+                msg = json.loads(raw)
+            except ValueError:
+                websocket.send(json.dumps({"status": "failure", "message": "Invalid JSON"}))
+                continue
+            msg_id = msg.get("id")
+            sim = sessions.get(session_id)
+            if sim is None:
+                reply = {"id": msg_id, "status": "failure", "message": f"Session {session_id} not found"}
+            elif msg.get("type") == "reset":
+                sim.reset()
+                reply = {"id": msg_id, "status": "success", "state": sim.get_state()}
+            elif msg.get("type") == "step":
+                if not msg.get("action"):
+                    reply = {"id": msg_id, "status": "failure", "message": "action is required"}
+                else:
+                    reward, done = sim.rl_step(msg["action"], msg.get("leftAction"))
+                    reply = {"id": msg_id, "status": "success", "state": sim.get_state(include_background=False),
+                             "reward": reward, "done": done}
+            else:
+                reply = {"id": msg_id, "status": "failure", "message": f"Unknown message type: {msg.get('type')}"}
+            # Unsolicited frame first: collect() must match replies on their id
+            websocket.send(json.dumps({"type": "notice"}))
+            websocket.send(json.dumps(reply))
+
+    return handler
+
+
+@pytest.fixture
+def rl_server():
+    sessions = {"session-1": PongSim()}
+    paths = []
+    with serve(_rl_socket(sessions, paths), "127.0.0.1", 0) as server:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        port = server.socket.getsockname()[1]
+        yield f"http://127.0.0.1:{port}", paths
+        server.shutdown()
+
+
+class TestWsTransport:
+    """Tests for WsTransport against the game service RL socket contract"""
+
+    def test_connects_to_game_service_route(self, rl_server):
+        """The socket should open on the route the game service registers"""
+        base_url, paths = rl_server
+        transport = WsTransport(base_url, "session-1")
+        transport.reset()
+        transport.close()
+
+        assert paths == [f"{RL_WS_PATH}/session-1"] == ["/ai/ws/session-1"]
+
+    def test_reset_and_step(self, rl_server):
+        """reset() and step() should return the replies to their own commands"""
+        transport = WsTransport(rl_server[0], "session-1")
+
+        reset = transport.reset()
+        step = transport.step({"action": "up"})
+        transport.close()
+
+        assert reset["status"] == "success" and reset["state"]["ball"]["x"] == 400
+        assert step["status"] == "success" and step["done"] is False
+        assert "state" in step and "reward" in step
+
+    def test_pipelined_commands_matched_by_id(self, rl_server):
+        """Several submitted commands should each collect their own reply"""
+        transport = WsTransport(rl_server[0], "session-1")
+
+        ids = [transport.submit({"type": "step", "action": "down"}) for _ in range(3)]
+        replies = [transport.collect(msg_id) for msg_id in ids]
+        transport.close()
+
+        assert [reply["id"] for reply in replies] == ids
+
+    def test_failure_raises_transport_error(self, rl_server):
+        """A failure reply should raise TransportError with the server message"""
+        transport = WsTransport(rl_server[0], "unknown-session")
+
+        with pytest.raises(TransportError, match="not found"):
+            transport.reset()
+        transport.close()
+
+
+class TestTransportFallback:
+    """Tests for PongEnv's fallback when the RL socket is unavailable"""
+
+    def test_fallback_to_http_warns(self):
+        """A failed socket should fall back to HTTP with a RuntimeWarning"""
+        env = PongEnv(backend="local")
+        env.base_url, env.session_id = "http://game", "test-session"
+
+        with patch("pong_env.WsTransport", side_effect=OSError("refused")):
+            with pytest.warns(RuntimeWarning, match="falling back to HTTP"):
+                transport = env._open_transport("ws")
+
+        assert type(transport).__name__ == "HttpTransport"
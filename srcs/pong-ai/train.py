@@ -6,8 +6,15 @@ Until a model exists the opponent acts randomly.
 
 Usage:
     GAME_SERVICE_URL=https://localhost:3003 python3 train.py
-
-The game service must be running with the rl/ endpoints active.
+    PONG_ENV_BACKEND=vector PONG_N_ENVS=256 python3 train.py
+    PONG_ENV_BACKEND=subproc PONG_N_WORKERS=8 PONG_N_ENVS=64 python3 train.py
+
+With the default "remote" backend the game service must be running with the
+rl/ endpoints active; "async" drives PONG_N_ENVS game-service sessions
+concurrently through AsyncRemoteVecEnv. "local" steps one in-process PongSim
+game, "vector" steps PONG_N_ENVS in-process games at once through PongVecEnv,
+and "subproc" spreads PONG_N_ENVS local SelfPlayEnv games over PONG_N_WORKERS
+processes through SharedMemVecEnv.
 The trained model is saved to models/best_model.zip.
 
 Note: the game service /rl/step endpoint must accept an optional
@@ -25,8 +32,14 @@ from stable_baselines3.common.callbacks import (
     BaseCallback,
 )
 from stable_baselines3.common.monitor import Monitor
+from stable_baselines3.common.vec_env import VecMonitor
 from self_play_env import SelfPlayEnv
 from pong_env import PongEnv
+from pong_vec_env import PongVecEnv
+from async_vec_env import AsyncRemoteVecEnv
+from shm_vec_env import SharedMemVecEnv
+from numpy_policy import NumpyPolicy
+from opponent_league import OpponentLeague
 
 # ---------------------------------------------------------------------------
 # Config
@@ -39,6 +52,23 @@ OPPONENT_UPDATE_FREQ  = 10_000   # copy model weights to opponent every N steps
 MODEL_SAVE_PATH       = "models/best_model"
 LOG_DIR               = "logs/"
 CHECKPOINT_DIR        = "models/checkpoints/"
+ENV_BACKEND           = os.getenv("PONG_ENV_BACKEND", "remote")  # remote | local | vector | async | subproc
+N_ENVS                = int(os.getenv("PONG_N_ENVS", {"async": "16", "subproc": "64"}.get(ENV_BACKEND, "256")))
+N_WORKERS             = int(os.getenv("PONG_N_WORKERS", str(os.cpu_count() or 1)))  # subproc backend
+LEAGUE_SIZE           = int(os.getenv("PONG_LEAGUE_SIZE", "0"))       # >0: opponent league (vectorized backends)
+LEAGUE_MEMORY_MB      = float(os.getenv("PONG_LEAGUE_MEMORY_MB", "16"))
+
+# Rollout shape. The vectorized backends gather N_ENVS games per step, so each
+# env only needs a short horizon and the update uses larger minibatches.
+if ENV_BACKEND == "vector":
+    N_STEPS    = 128
+    BATCH_SIZE = 4096
+elif ENV_BACKEND in ("async", "subproc"):
+    N_STEPS    = 256
+    BATCH_SIZE = 512
+else:
+    N_STEPS    = 2048
+    BATCH_SIZE = 64
 
 os.makedirs(LOG_DIR, exist_ok=True)
 os.makedirs(CHECKPOINT_DIR, exist_ok=True)
@@ -49,105 +79,160 @@ os.makedirs("models", exist_ok=True)
 # Opponent update callback
 # ---------------------------------------------------------------------------
 class UpdateOpponentCallback(BaseCallback):
-    """Copies the current model weights to the self-play opponent periodically."""
+    """Copies the current model weights to the self-play opponent periodically.
 
-    def __init__(self, env: SelfPlayEnv, update_freq: int = 10_000, verbose: int = 0):
+    The opponent is a NumpyPolicy snapshot of the actor, not the learner
+    itself: it stays frozen between updates and predicts without torch.
+    With a league, the snapshot joins the pool as "latest" and the newest
+    checkpoints are (re)loaded; the league itself is the env's opponent.
+    """
+
+    def __init__(self, env, update_freq: int = 10_000, league=None, verbose: int = 0):
         super().__init__(verbose)
         self._sp_env = env
         self._update_freq = update_freq
+        self._league = league
 
     def _on_step(self) -> bool:
         if self.n_calls % self._update_freq == 0:
-            self._sp_env.set_opponent(self.model)
+            snapshot = NumpyPolicy.from_sb3(self.model)
+            if self._league is not None:
+                self._league.add("latest", snapshot)
+                self._league.refresh()
+            else:
+                self._sp_env.set_opponent(snapshot)
             if self.verbose:
                 print(f"[SelfPlay] Opponent updated at step {self.n_calls}")
         return True
 
 
-# ---------------------------------------------------------------------------
-# Environments
-# ---------------------------------------------------------------------------
-print("[train] Creating training environment (self-play)...")
-train_sp_env = SelfPlayEnv()
-train_env = Monitor(train_sp_env, LOG_DIR)
-
-print("[train] Checking environment...")
-check_env(train_env, warn=True)
-
-print("[train] Creating eval environment...")
-eval_env = Monitor(PongEnv(), LOG_DIR)
-
-# ---------------------------------------------------------------------------
-# Callbacks
-# ---------------------------------------------------------------------------
-opponent_callback = UpdateOpponentCallback(
-    env=train_sp_env,
-    update_freq=OPPONENT_UPDATE_FREQ,
-    verbose=1,
-)
-
-eval_callback = EvalCallback(
-    eval_env,
-    best_model_save_path="models/",
-    log_path=LOG_DIR,
-    eval_freq=EVAL_FREQ,
-    n_eval_episodes=N_EVAL_EPISODES,
-    deterministic=True,
-    render=False,
-    verbose=1,
-)
-
-checkpoint_callback = CheckpointCallback(
-    save_freq=CHECKPOINT_FREQ,
-    save_path=CHECKPOINT_DIR,
-    name_prefix="pong_checkpoint",
-    verbose=1,
-)
-
-callbacks = CallbackList([opponent_callback, eval_callback, checkpoint_callback])
+def main():
+    # -----------------------------------------------------------------------
+    # Environments
+    # -----------------------------------------------------------------------
+    if ENV_BACKEND == "vector":
+        print(f"[train] Creating vectorized training environment ({N_ENVS} games, self-play)...")
+        train_sp_env = PongVecEnv(num_envs=N_ENVS)
+        train_env = VecMonitor(train_sp_env, LOG_DIR)
+        eval_backend = "local"
+    elif ENV_BACKEND == "async":
+        print(f"[train] Creating async training environment ({N_ENVS} game-service sessions, self-play)...")
+        train_sp_env = AsyncRemoteVecEnv(num_envs=N_ENVS)
+        train_env = VecMonitor(train_sp_env, LOG_DIR)
+        eval_backend = "remote"
+    elif ENV_BACKEND == "subproc":
+        print(f"[train] Creating multi-process training environment ({N_ENVS} games on {N_WORKERS} workers, self-play)...")
+        train_sp_env = SharedMemVecEnv(num_envs=N_ENVS, n_workers=N_WORKERS, backend="local")
+        train_env = VecMonitor(train_sp_env, LOG_DIR)
+        eval_backend = "local"
+    else:
+        print("[train] Creating training environment (self-play)...")
+        train_sp_env = SelfPlayEnv(backend=ENV_BACKEND)
+        train_env = Monitor(train_sp_env, LOG_DIR)
+
+        print("[train] Checking environment...")
+        check_env(train_env, warn=True)
+        eval_backend = ENV_BACKEND
+
+    print("[train] Creating eval environment...")
+    eval_env = Monitor(PongEnv(backend=eval_backend), LOG_DIR)
+
+    # Callback frequencies count vectorized steps, i.e. num_envs timesteps each
+    steps_per_call = getattr(train_env, "num_envs", 1)
+
+    # The league assigns an opponent per game, so it needs a batched env
+    league = None
+    if LEAGUE_SIZE > 0 and steps_per_call > 1:
+        league = OpponentLeague(
+            CHECKPOINT_DIR,
+            max_policies=LEAGUE_SIZE,
+            memory_budget=int(LEAGUE_MEMORY_MB * 1024 * 1024),
+        )
+        league.refresh()
+        train_sp_env.set_opponent(league)
+        print(f"[train] Opponent league: {len(league)} checkpoints loaded from {CHECKPOINT_DIR}")
+
+    # -----------------------------------------------------------------------
+    # Callbacks
+    # -----------------------------------------------------------------------
+    opponent_callback = UpdateOpponentCallback(
+        env=train_sp_env,
+        update_freq=max(OPPONENT_UPDATE_FREQ // steps_per_call, 1),
+        league=league,
+        verbose=1,
+    )
 
-# ---------------------------------------------------------------------------
-# Model
-# ---------------------------------------------------------------------------
-if os.path.exists(f"{MODEL_SAVE_PATH}.zip"):
-    print(f"[train] Resuming from {MODEL_SAVE_PATH}.zip")
-    model = PPO.load(
-        MODEL_SAVE_PATH,
-        env=train_env,
+    eval_callback = EvalCallback(
+        eval_env,
+        best_model_save_path="models/",
+        log_path=LOG_DIR,
+        eval_freq=max(EVAL_FREQ // steps_per_call, 1),
+        n_eval_episodes=N_EVAL_EPISODES,
+        deterministic=True,
+        render=False,
         verbose=1,
-        tensorboard_log=LOG_DIR,
     )
-else:
-    print("[train] Starting fresh PPO model")
-    model = PPO(
-        "MlpPolicy",
-        train_env,
+
+    checkpoint_callback = CheckpointCallback(
+        save_freq=max(CHECKPOINT_FREQ // steps_per_call, 1),
+        save_path=CHECKPOINT_DIR,
+        name_prefix="pong_checkpoint",
         verbose=1,
-        tensorboard_log=LOG_DIR,
-        learning_rate=3e-4,
-        n_steps=2048,
-        batch_size=64,
-        n_epochs=10,
-        gamma=0.99,
-        gae_lambda=0.95,
-        clip_range=0.2,
-        ent_coef=0.01,
-        device="cuda",
     )
 
-# ---------------------------------------------------------------------------
-# Training
-# ---------------------------------------------------------------------------
-print(f"[train] Training for {TOTAL_TIMESTEPS:,} timesteps...")
-model.learn(
-    total_timesteps=TOTAL_TIMESTEPS,
-    callback=callbacks,
-    reset_num_timesteps=False,
-    progress_bar=True,
-)
+    callbacks = CallbackList([opponent_callback, eval_callback, checkpoint_callback])
+
+    # -----------------------------------------------------------------------
+    # Model
+    # -----------------------------------------------------------------------
+    if os.path.exists(f"{MODEL_SAVE_PATH}.zip"):
+        print(f"[train] Resuming from {MODEL_SAVE_PATH}.zip")
+        model = PPO.load(
+            MODEL_SAVE_PATH,
+            env=train_env,
+            verbose=1,
+            tensorboard_log=LOG_DIR,
+            n_steps=N_STEPS,
+            batch_size=BATCH_SIZE,
+        )
+    else:
+        print("[train] Starting fresh PPO model")
+        model = PPO(
+            "MlpPolicy",
+            train_env,
+            verbose=1,
+            tensorboard_log=LOG_DIR,
+            learning_rate=3e-4,
+            n_steps=N_STEPS,
+            batch_size=BATCH_SIZE,
+            n_epochs=10,
+            gamma=0.99,
+            gae_lambda=0.95,
+            clip_range=0.2,
+            ent_coef=0.01,
+            device="cuda",
+        )
+
+    # -----------------------------------------------------------------------
+    # Training
+    # -----------------------------------------------------------------------
+    print(f"[train] Training for {TOTAL_TIMESTEPS:,} timesteps...")
+    model.learn(
+        total_timesteps=TOTAL_TIMESTEPS,
+        callback=callbacks,
+        reset_num_timesteps=False,
+        progress_bar=True,
+    )
+
+    model.save(MODEL_SAVE_PATH)
+    # Torch-free copy of the actor for PONG_AI_BACKEND=numpy serving
+    NumpyPolicy.from_sb3(model).save_npz(f"{MODEL_SAVE_PATH}.npz")
+    print(f"[train] Done. Model saved to {MODEL_SAVE_PATH}.zip (+ .npz export)")
+
+    train_env.close()
+    eval_env.close()
 
-model.save(MODEL_SAVE_PATH)
-print(f"[train] Done. Model saved to {MODEL_SAVE_PATH}.zip")
 
-train_env.close()
-eval_env.close()
+if __name__ == "__main__":
+    # Guarded: the subproc backend re-imports this module in its workers
+    main()